@@ -0,0 +1,224 @@
+import fcntl
+import hashlib
+import os
+import re
+import uuid
+from collections.abc import AsyncIterator
+from pathlib import Path
+
+from fastapi import HTTPException, status
+from fastapi.responses import FileResponse, Response, StreamingResponse
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import settings
+
+ARTIFACT_URI_PREFIX = "cas://sha256/"
+READ_BLOCK_SIZE = 1024 * 1024
+RANGE_PATTERN = re.compile(r"^bytes=(\d*)-(\d*)$")
+DIGEST_PATTERN = re.compile(r"^[0-9a-f]{64}$")
+
+
+def store_root() -> Path:
+    return Path(settings.artifact_store_dir)
+
+
+def blob_path(digest: str) -> Path:
+    """Path of a blob in the store. Raises ValueError unless `digest` is a hex SHA-256."""
+    if not DIGEST_PATTERN.match(digest):
+        raise ValueError("Invalid sha256 digest")
+    blobs = (store_root() / "blobs").resolve()
+    path = (blobs / digest[:2] / digest[2:4] / digest).resolve()
+    if not path.is_relative_to(blobs):
+        raise ValueError("Blob path escapes the artifact store")
+    return path
+
+
+def upload_path(upload_id: uuid.UUID) -> Path:
+    return store_root() / "uploads" / str(upload_id)
+
+
+def artifact_uri(digest: str) -> str:
+    return f"{ARTIFACT_URI_PREFIX}{digest}"
+
+
+def is_store_uri(uri: str | None) -> bool:
+    # Only the upload endpoints hand out these URIs. Clients must not set them,
+    # or they could point an artifact at content they never uploaded.
+    return bool(uri) and uri.startswith(ARTIFACT_URI_PREFIX)
+
+
+def stored_blob(uri: str) -> Path | None:
+    if not is_store_uri(uri):
+        return None
+    try:
+        return blob_path(uri[len(ARTIFACT_URI_PREFIX) :])
+    except ValueError:
+        return None
+
+
+def upload_offset(upload_id: uuid.UUID) -> int:
+    try:
+        return upload_path(upload_id).stat().st_size
+    except FileNotFoundError:
+        return 0
+
+
+def _open_upload(upload_id: uuid.UUID, offset: int):
+    path = upload_path(upload_id)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    handle = path.open("ab")
+    try:
+        fcntl.flock(handle.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except BlockingIOError as exc:
+        handle.close()
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Another chunk is being written to this upload",
+        ) from exc
+    current = os.fstat(handle.fileno()).st_size
+    if offset != current:
+        handle.close()
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Upload-Offset mismatch, server has {current} bytes",
+            headers={"Upload-Offset": str(current)},
+        )
+    return handle
+
+
+async def append_upload(
+    upload_id: uuid.UUID, offset: int, chunks: AsyncIterator[bytes], limit: int | None
+) -> int:
+    """Append a request body to the upload file at `offset` and return the new offset.
+
+    An exclusive lock turns concurrent writers into a 409 instead of
+    interleaved bytes. A stale offset (e.g. a client retrying a chunk that
+    already landed) is also a 409 that carries the current offset. File
+    operations run in the threadpool so slow disks do not block the event loop.
+    """
+    handle = await run_in_threadpool(_open_upload, upload_id, offset)
+    try:
+        current = offset
+        async for chunk in chunks:
+            current += len(chunk)
+            if limit is not None and current > limit:
+                await run_in_threadpool(handle.truncate, offset)
+                raise HTTPException(
+                    status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                    detail=f"Upload exceeds declared size of {limit} bytes",
+                )
+            await run_in_threadpool(handle.write, chunk)
+        await run_in_threadpool(handle.flush)
+        return current
+    finally:
+        await run_in_threadpool(handle.close)
+
+
+def sha256_path(path: Path) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as handle:
+        while block := handle.read(READ_BLOCK_SIZE):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def commit_blob(source: Path, digest: str) -> Path:
+    """Move a finished upload into the content-addressed store.
+
+    If the blob already exists, the upload is dropped, so each distinct
+    content is stored once.
+    """
+    target = blob_path(digest)
+    if target.exists():
+        source.unlink(missing_ok=True)
+        return target
+    target.parent.mkdir(parents=True, exist_ok=True)
+    os.replace(source, target)
+    return target
+
+
+def retire_blob(digest: str) -> Path | None:
+    """Move a blob aside before the transaction that drops its last reference commits.
+
+    Returns the retired path, or None if the blob is not in the store. Unlink
+    it after the commit, or put it back with `restore_blob` if the commit fails.
+    """
+    target = blob_path(digest)
+    retired = target.with_name(f"{digest}.retired")
+    try:
+        os.replace(target, retired)
+    except FileNotFoundError:
+        return None
+    return retired
+
+
+def restore_blob(retired: Path, digest: str) -> None:
+    os.replace(retired, blob_path(digest))
+
+
+def discard_upload(upload_id: uuid.UUID) -> None:
+    upload_path(upload_id).unlink(missing_ok=True)
+
+
+def _byte_range(header: str, size: int) -> tuple[int, int] | None:
+    # Single ranges only. Multi-range requests get the full body, which RFC 9110 allows.
+    match = RANGE_PATTERN.match(header.strip())
+    if not match:
+        return None
+    first, last = match.groups()
+    if not first and not last:
+        return None
+    if not first:
+        start, end = max(size - int(last), 0), size - 1
+    else:
+        start = int(first)
+        end = min(int(last), size - 1) if last else size - 1
+    if start >= size or start > end:
+        raise HTTPException(
+            status_code=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE,
+            detail="Requested range not satisfiable",
+            headers={"Content-Range": f"bytes */{size}"},
+        )
+    return start, end
+
+
+def _iter_file_range(path: Path, start: int, end: int):
+    with path.open("rb") as handle:
+        position = start
+        while position <= end:
+            block = os.pread(handle.fileno(), min(READ_BLOCK_SIZE, end - position + 1), position)
+            if not block:
+                break
+            position += len(block)
+            yield block
+
+
+def blob_response(
+    path: Path, filename: str, etag: str, range_header: str | None, if_range: str | None
+) -> Response:
+    """Serve a blob. Full reads use FileResponse, which the server can send with sendfile."""
+    size = path.stat().st_size
+    headers = {"Accept-Ranges": "bytes", "ETag": etag}
+    byte_range = None
+    if range_header and (not if_range or if_range == etag):
+        byte_range = _byte_range(range_header, size)
+    if byte_range is None:
+        return FileResponse(
+            path,
+            media_type="application/octet-stream",
+            filename=filename,
+            headers=headers,
+        )
+    start, end = byte_range
+    headers.update(
+        {
+            "Content-Range": f"bytes {start}-{end}/{size}",
+            "Content-Length": str(end - start + 1),
+        }
+    )
+    return StreamingResponse(
+        _iter_file_range(path, start, end),
+        status_code=status.HTTP_206_PARTIAL_CONTENT,
+        media_type="application/octet-stream",
+        headers=headers,
+    )
@@ -0,0 +1,425 @@
+import json
+import uuid
+from collections.abc import Callable
+from datetime import datetime, timezone
+from typing import get_args
+
+from sqlalchemy import BindParameter, Text, any_, bindparam, insert, select
+from sqlalchemy.dialects.postgresql import ARRAY, UUID
+from sqlalchemy.exc import StatementError
+from sqlalchemy.orm import Session
+
+from app.core.artifact_store import ARTIFACT_URI_PREFIX, is_store_uri
+from app.core.permissions import project_ids_with_role
+from app.models.models import (
+    Artifact,
+    BatchImportError,
+    BatchImportJob,
+    Dataset,
+    DatasetVersion,
+    Experiment,
+    MetricDefinition,
+    Run,
+    RunConfig,
+    RunMetricValue,
+)
+from app.schemas.enums import ArtifactType, MetricScope, RunStatus
+
+BATCH_IMPORT_CHUNK_SIZE = 1000
+RUN_STATUSES = set(get_args(RunStatus))
+ARTIFACT_TYPES = set(get_args(ArtifactType))
+METRIC_SCOPES = set(get_args(MetricScope))
+
+
+def parse_uuid(value: str | None) -> uuid.UUID | None:
+    if value in (None, ""):
+        return None
+    return uuid.UUID(str(value))
+
+
+def parse_int(value: str | None) -> int | None:
+    if value in (None, ""):
+        return None
+    return int(value)
+
+
+def parse_float(value: str | None) -> float | None:
+    if value in (None, ""):
+        return None
+    return float(value)
+
+
+def parse_datetime(value: str | None) -> datetime | None:
+    if value in (None, ""):
+        return None
+    return datetime.fromisoformat(value)
+
+
+def parse_json_object(value: str | dict | None) -> dict | None:
+    # CSV cells hold JSON text, JSON sources may already hold the object.
+    if value in (None, ""):
+        return None
+    if isinstance(value, str):
+        value = json.loads(value)
+    if not isinstance(value, dict):
+        raise ValueError("expected a JSON object")
+    return value
+
+
+def uuid_array(name: str, values) -> BindParameter:
+    """One array parameter for `column == any_(...)`, whatever the number of ids."""
+    return bindparam(name, list(values), type_=ARRAY(UUID(as_uuid=True)))
+
+
+class ImportRow:
+    def __init__(self, row_number: int, raw: dict) -> None:
+        self.row_number = row_number
+        self.raw = raw
+        self.values: dict = {}
+        self.config: dict | None = None
+        self.project_id: uuid.UUID | None = None
+        self.metric_key: str | None = None
+        self.error: str | None = None
+
+
+def _parse_metric(item: ImportRow, user_id: uuid.UUID) -> None:
+    row = item.raw
+    run_id = parse_uuid(row.get("run_id"))
+    metric_id = parse_uuid(row.get("metric_id"))
+    scope = row.get("scope")
+    value = parse_float(row.get("value"))
+    if not run_id or not scope or value is None:
+        raise ValueError("run_id, scope, and value are required")
+    if scope not in METRIC_SCOPES:
+        raise ValueError(f"scope must be one of {sorted(METRIC_SCOPES)}")
+    if not metric_id:
+        item.metric_key = row.get("metric_key")
+        if not item.metric_key:
+            raise ValueError("metric_id or metric_key is required")
+        if not isinstance(item.metric_key, str):
+            raise ValueError("metric_key must be a string")
+    item.values = {
+        "run_id": run_id,
+        "metric_id": metric_id,
+        "scope": scope,
+        "step": parse_int(row.get("step")),
+        "value": value,
+        # Every row of a multi-row insert needs the same keys, so the
+        # column default is filled in here rather than left to the server.
+        "recorded_at": parse_datetime(row.get("recorded_at")) or datetime.now(timezone.utc),
+    }
+
+
+def _parse_dataset(item: ImportRow, user_id: uuid.UUID) -> None:
+    row = item.raw
+    project_id = parse_uuid(row.get("project_id"))
+    name = row.get("name")
+    task_type = row.get("task_type")
+    if not project_id or not name or not task_type:
+        raise ValueError("project_id, name, task_type are required")
+    item.project_id = project_id
+    item.values = {
+        "project_id": project_id,
+        "name": name,
+        "task_type": task_type,
+        "description": row.get("description"),
+    }
+
+
+def _parse_experiment(item: ImportRow, user_id: uuid.UUID) -> None:
+    row = item.raw
+    project_id = parse_uuid(row.get("project_id"))
+    name = row.get("name")
+    if not project_id or not name:
+        raise ValueError("project_id and name are required")
+    item.project_id = project_id
+    item.values = {
+        "experiment_id": parse_uuid(row.get("experiment_id")) or uuid.uuid4(),
+        "project_id": project_id,
+        "name": name,
+        "objective": row.get("objective") or None,
+        "created_by": user_id,
+    }
+
+
+def _parse_run(item: ImportRow, user_id: uuid.UUID) -> None:
+    row = item.raw
+    experiment_id = parse_uuid(row.get("experiment_id"))
+    dataset_version_id = parse_uuid(row.get("dataset_version_id"))
+    status = row.get("status")
+    if not experiment_id or not dataset_version_id or not status:
+        raise ValueError("experiment_id, dataset_version_id and status are required")
+    if status not in RUN_STATUSES:
+        raise ValueError(f"status must be one of {sorted(RUN_STATUSES)}")
+    created_by = parse_uuid(row.get("created_by"))
+    if created_by and created_by != user_id:
+        raise ValueError("created_by must match the authenticated user")
+    run_id = parse_uuid(row.get("run_id")) or uuid.uuid4()
+    item.values = {
+        "run_id": run_id,
+        "experiment_id": experiment_id,
+        "dataset_version_id": dataset_version_id,
+        "run_name": row.get("run_name") or None,
+        "status": status,
+        "started_at": parse_datetime(row.get("started_at")),
+        "finished_at": parse_datetime(row.get("finished_at")),
+        "created_by": user_id,
+        "git_commit": row.get("git_commit") or None,
+        "notes": row.get("notes") or None,
+    }
+    params_json = parse_json_object(row.get("params_json"))
+    if params_json is not None:
+        item.config = {
+            "run_id": run_id,
+            "params_json": params_json,
+            "env_json": parse_json_object(row.get("env_json")),
+            "command_line": row.get("command_line") or None,
+            "seed": parse_int(row.get("seed")),
+        }
+
+
+def _parse_run_config(item: ImportRow, user_id: uuid.UUID) -> None:
+    row = item.raw
+    run_id = parse_uuid(row.get("run_id"))
+    params_json = parse_json_object(row.get("params_json"))
+    if not run_id or params_json is None:
+        raise ValueError("run_id and params_json are required")
+    item.values = {
+        "run_id": run_id,
+        "params_json": params_json,
+        "env_json": parse_json_object(row.get("env_json")),
+        "command_line": row.get("command_line") or None,
+        "seed": parse_int(row.get("seed")),
+    }
+
+
+def _parse_artifact(item: ImportRow, user_id: uuid.UUID) -> None:
+    row = item.raw
+    project_id = parse_uuid(row.get("project_id"))
+    artifact_type = row.get("artifact_type")
+    uri = row.get("uri")
+    if not project_id or not artifact_type or not uri:
+        raise ValueError("project_id, artifact_type and uri are required")
+    if artifact_type not in ARTIFACT_TYPES:
+        raise ValueError(f"artifact_type must be one of {sorted(ARTIFACT_TYPES)}")
+    if is_store_uri(uri):
+        raise ValueError(f"{ARTIFACT_URI_PREFIX} URIs are assigned by the upload endpoints")
+    item.project_id = project_id
+    item.values = {
+        "artifact_id": parse_uuid(row.get("artifact_id")) or uuid.uuid4(),
+        "project_id": project_id,
+        "artifact_type": artifact_type,
+        "uri": uri,
+        "checksum": row.get("checksum") or None,
+        "size_bytes": parse_int(row.get("size_bytes")),
+    }
+
+
+def _resolve_runs(db: Session, items: list[ImportRow]) -> None:
+    experiment_projects = dict(
+        db.execute(
+            select(Experiment.experiment_id, Experiment.project_id).where(
+                Experiment.experiment_id
+                == any_(uuid_array("experiment_ids", {i.values["experiment_id"] for i in items}))
+            )
+        ).all()
+    )
+    version_projects = dict(
+        db.execute(
+            select(DatasetVersion.dataset_version_id, Dataset.project_id)
+            .join(Dataset, Dataset.dataset_id == DatasetVersion.dataset_id)
+            .where(
+                DatasetVersion.dataset_version_id
+                == any_(
+                    uuid_array("version_ids", {i.values["dataset_version_id"] for i in items})
+                )
+            )
+        ).all()
+    )
+    for item in items:
+        project_id = experiment_projects.get(item.values["experiment_id"])
+        version_project_id = version_projects.get(item.values["dataset_version_id"])
+        if project_id is None:
+            item.error = "Experiment not found"
+        elif version_project_id is None:
+            item.error = "Dataset version not found"
+        elif version_project_id != project_id:
+            item.error = "Dataset version belongs to a different project"
+        else:
+            item.project_id = project_id
+
+
+def _run_projects(db: Session, items: list[ImportRow]) -> dict[uuid.UUID, uuid.UUID]:
+    return dict(
+        db.execute(
+            select(Run.run_id, Experiment.project_id)
+            .join(Experiment, Experiment.experiment_id == Run.experiment_id)
+            .where(Run.run_id == any_(uuid_array("run_ids", {i.values["run_id"] for i in items})))
+        ).all()
+    )
+
+
+def _resolve_run_configs(db: Session, items: list[ImportRow]) -> None:
+    run_projects = _run_projects(db, items)
+    for item in items:
+        item.project_id = run_projects.get(item.values["run_id"])
+        if item.project_id is None:
+            item.error = "Run not found"
+
+
+def _resolve_metrics(db: Session, items: list[ImportRow]) -> None:
+    # Inserts take a per-run lock (sql/metric_stream.sql). The same run order
+    # in every import keeps two concurrent imports from deadlocking.
+    items.sort(key=lambda item: item.values["run_id"])
+    run_projects = _run_projects(db, items)
+    metric_keys = {item.metric_key for item in items if item.metric_key}
+    metric_ids = {}
+    if metric_keys:
+        metric_ids = dict(
+            db.execute(
+                select(MetricDefinition.key, MetricDefinition.metric_id).where(
+                    MetricDefinition.key
+                    == any_(bindparam("metric_keys", list(metric_keys), type_=ARRAY(Text)))
+                )
+            ).all()
+        )
+    for item in items:
+        item.project_id = run_projects.get(item.values["run_id"])
+        if item.project_id is None:
+            item.error = "Run not found"
+        elif item.metric_key:
+            item.values["metric_id"] = metric_ids.get(item.metric_key)
+            if item.values["metric_id"] is None:
+                item.error = f"Unknown metric_key: {item.metric_key}"
+
+
+def _check_access(
+    db: Session,
+    user_id: uuid.UUID,
+    items: list[ImportRow],
+    access_cache: dict[uuid.UUID, bool],
+) -> None:
+    # One query per chunk for the projects this job has not met yet.
+    unseen = {item.project_id for item in items} - access_cache.keys()
+    if unseen:
+        allowed = project_ids_with_role(db, user_id, unseen, "editor")
+        access_cache.update({project_id: project_id in allowed for project_id in unseen})
+    for item in items:
+        if not access_cache[item.project_id]:
+            item.error = "Project access denied"
+
+
+def _db_error(exc: StatementError) -> str:
+    return str(exc.orig).splitlines()[0] if exc.orig else str(exc)
+
+
+class RowImport:
+    def __init__(
+        self,
+        parse: Callable[[ImportRow, uuid.UUID], None],
+        model: type,
+        resolve: Callable[[Session, list[ImportRow]], None] | None = None,
+    ) -> None:
+        self.parse = parse
+        self.model = model
+        self.resolve = resolve
+
+
+ROW_IMPORTS = {
+    "metrics": RowImport(_parse_metric, RunMetricValue, _resolve_metrics),
+    "datasets": RowImport(_parse_dataset, Dataset),
+    "experiments": RowImport(_parse_experiment, Experiment),
+    "runs": RowImport(_parse_run, Run, _resolve_runs),
+    "run_configs": RowImport(_parse_run_config, RunConfig, _resolve_run_configs),
+    "artifacts": RowImport(_parse_artifact, Artifact),
+}
+
+
+def _insert_rows(db: Session, spec: RowImport, items: list[ImportRow]) -> int:
+    """Multi-row INSERT for the chunk. On a constraint error, retry row by row to blame rows."""
+    configs = [item.config for item in items if item.config]
+    try:
+        with db.begin_nested():
+            db.execute(insert(spec.model), [item.values for item in items])
+            if configs:
+                db.execute(insert(RunConfig), configs)
+        return len(items)
+    except StatementError:
+        pass
+
+    inserted = 0
+    for item in items:
+        try:
+            with db.begin_nested():
+                db.execute(insert(spec.model), item.values)
+                if item.config:
+                    db.execute(insert(RunConfig), item.config)
+            inserted += 1
+        except StatementError as exc:
+            item.error = _db_error(exc)
+    return inserted
+
+
+def import_rows(
+    db: Session,
+    job: BatchImportJob,
+    job_type: str,
+    rows: list[dict],
+    user_id: uuid.UUID,
+    chunk_size: int = BATCH_IMPORT_CHUNK_SIZE,
+) -> tuple[int, int]:
+    """Run a batch import job in chunks and return (inserted, errors).
+
+    Each chunk is parsed first. It then resolves its foreign keys and metric
+    keys with one `= ANY` query per referenced table, and checks editor access
+    for the projects the job has not seen yet in one query. Only after that is
+    it inserted with multi-row statements, so lookups cost O(chunks), not
+    O(distinct keys). Rejected rows are written to batch_import_errors. Every
+    chunk commits on its own.
+    """
+    spec = ROW_IMPORTS[job_type]
+    access_cache: dict[uuid.UUID, bool] = {}
+    inserted = 0
+    errors = 0
+    for start in range(0, len(rows), chunk_size):
+        chunk = [
+            ImportRow(row_number, raw)
+            for row_number, raw in enumerate(rows[start : start + chunk_size], start=start + 1)
+        ]
+        for item in chunk:
+            try:
+                if not isinstance(item.raw, dict):
+                    raise ValueError("row must be an object")
+                spec.parse(item, user_id)
+            except (ValueError, TypeError) as exc:
+                item.error = str(exc)
+
+        pending = [item for item in chunk if item.error is None]
+        if pending and spec.resolve:
+            spec.resolve(db, pending)
+            pending = [item for item in pending if item.error is None]
+        if pending:
+            _check_access(db, user_id, pending, access_cache)
+            pending = [item for item in pending if item.error is None]
+        if pending:
+            inserted += _insert_rows(db, spec, pending)
+
+        failed = [item for item in chunk if item.error is not None]
+        if failed:
+            db.execute(
+                insert(BatchImportError),
+                [
+                    {
+                        "job_id": job.job_id,
+                        "row_number": item.row_number,
+                        "raw_row": item.raw if isinstance(item.raw, dict) else None,
+                        "error_message": item.error,
+                    }
+                    for item in failed
+                ],
+            )
+            errors += len(failed)
+        # Committed with the chunk, so a later failure still reports progress.
+        job.stats_json = {"inserted": inserted, "errors": errors}
+        db.commit()
+    return inserted, errors
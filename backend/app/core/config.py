@@ -5,11 +5,30 @@ class Settings(BaseSettings):
     model_config = SettingsConfigDict(env_file=".env", env_prefix="")
 
     database_url: str = "postgresql+psycopg://postgres:postgres@db:5432/mlops"
+    migration_database_url: str | None = None
+    row_level_security: bool = False
     api_prefix: str = "/api"
     app_name: str = "ml-experiments"
     jwt_secret: str = "change-me"
     jwt_algorithm: str = "HS256"
     jwt_expires_minutes: int = 60
+    metric_compaction_enabled: bool = False
+    metric_chunk_size: int = 1000
+    report_cache_backend: str = "memory"
+    report_cache_url: str | None = None
+    report_cache_size: int = 512
+    report_cache_ttl_seconds: int = 3600
+    artifact_store_dir: str = "artifact_store"
+    dataset_profile_root: str = "datasets"
+    metric_stream_backend: str = "postgres"
+    metric_stream_heartbeat_seconds: int = 15
+    slow_query_capture: bool = False
+    slow_query_threshold_ms: float = 250.0
+    slow_query_sample_rate: float = 1.0
+    slow_query_explain_analyze: bool = True
+    slow_query_explain_interval_seconds: int = 300
+    slow_query_auto_explain: bool = False
+    operator_emails: str = ""
 
 
 settings = Settings()
@@ -0,0 +1,130 @@
+import uuid
+
+from sqlalchemy import (
+    BigInteger,
+    DateTime,
+    Float,
+    Integer,
+    Select,
+    Subquery,
+    cast,
+    column,
+    func,
+    null,
+    select,
+    text,
+    true,
+    union_all,
+)
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.models.models import MetricDefinition, RunMetricChunk, RunMetricValue
+
+
+def compact_run(db: Session, run_id: uuid.UUID, chunk_size: int | None = None) -> int:
+    points = db.scalar(
+        text("SELECT fn_compact_run_metrics(:run_id, :chunk_size)"),
+        {"run_id": run_id, "chunk_size": chunk_size or settings.metric_chunk_size},
+    )
+    db.commit()
+    return points or 0
+
+
+def compact_run_in_background(run_id: uuid.UUID) -> None:
+    with SessionLocal() as db:
+        db.info["rls_bypass"] = True
+        compact_run(db, run_id)
+
+
+def _chunk_points():
+    return (
+        func.unnest(
+            RunMetricChunk.steps,
+            RunMetricChunk.values,
+            RunMetricChunk.recorded_at,
+            RunMetricChunk.ingest_seqs,
+        )
+        .table_valued(
+            column("step", Integer),
+            column("value", Float),
+            column("recorded_at", DateTime(timezone=True)),
+            column("ingest_seq", BigInteger),
+        )
+        .render_derived(name="points")
+        .lateral()
+    )
+
+
+def metric_points(
+    run_id: uuid.UUID | None = None,
+    metric_key: str | None = None,
+    scope: str | None = None,
+    from_step: int | None = None,
+    to_step: int | None = None,
+    since: int | None = None,
+) -> Subquery:
+    """Metric points from live rows and compacted chunks, in RunMetricValueRead shape.
+
+    Compacted points have no row of their own, so their run_metric_value_id is
+    NULL. Their ingest_seq comes from the chunk's ingest_seqs, or is the
+    chunk's newest for chunks compacted before migration 0017. Step and `since`
+    filters prune whole chunks via step_start/step_end and max_ingest_seq
+    before the points are unnested and filtered one by one.
+    """
+    live = select(
+        RunMetricValue.run_metric_value_id,
+        RunMetricValue.run_id,
+        RunMetricValue.metric_id,
+        RunMetricValue.scope,
+        RunMetricValue.step,
+        RunMetricValue.value,
+        RunMetricValue.recorded_at,
+        RunMetricValue.ingest_seq,
+    )
+    points = _chunk_points()
+    chunk_seq = func.coalesce(points.c.ingest_seq, RunMetricChunk.max_ingest_seq)
+    chunked = (
+        select(
+            cast(null(), UUID(as_uuid=True)).label("run_metric_value_id"),
+            RunMetricChunk.run_id,
+            RunMetricChunk.metric_id,
+            RunMetricChunk.scope,
+            points.c.step,
+            points.c.value,
+            points.c.recorded_at,
+            chunk_seq.label("ingest_seq"),
+        )
+        .select_from(RunMetricChunk)
+        .join(points, true())
+    )
+    if run_id:
+        live = live.where(RunMetricValue.run_id == run_id)
+        chunked = chunked.where(RunMetricChunk.run_id == run_id)
+    if metric_key:
+        metric_ids = select(MetricDefinition.metric_id).where(MetricDefinition.key == metric_key)
+        live = live.where(RunMetricValue.metric_id.in_(metric_ids))
+        chunked = chunked.where(RunMetricChunk.metric_id.in_(metric_ids))
+    if scope:
+        live = live.where(RunMetricValue.scope == scope)
+        chunked = chunked.where(RunMetricChunk.scope == scope)
+    if from_step is not None:
+        live = live.where(RunMetricValue.step >= from_step)
+        chunked = chunked.where(RunMetricChunk.step_end >= from_step, points.c.step >= from_step)
+    if to_step is not None:
+        live = live.where(RunMetricValue.step <= to_step)
+        chunked = chunked.where(RunMetricChunk.step_start <= to_step, points.c.step <= to_step)
+    if since is not None:
+        live = live.where(RunMetricValue.ingest_seq > since)
+        chunked = chunked.where(RunMetricChunk.max_ingest_seq > since, chunk_seq > since)
+
+    return union_all(live, chunked).subquery("metric_points")
+
+
+def ordered_metric_points(**filters) -> Select:
+    points = metric_points(**filters)
+    return select(points).order_by(
+        points.c.metric_id, points.c.scope, points.c.step.nulls_last()
+    )
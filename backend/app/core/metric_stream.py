@@ -0,0 +1,234 @@
+import asyncio
+import logging
+import uuid
+from collections.abc import AsyncIterator
+
+import orjson
+import psycopg
+from sqlalchemy import func, select
+from sqlalchemy.engine import make_url
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import settings
+from app.core.metric_chunks import metric_points
+from app.core.serialization import ORJSON_OPTIONS
+from app.db.session import SessionLocal
+from app.models.models import RunMetricChunk, RunMetricValue
+
+logger = logging.getLogger(__name__)
+
+NOTIFY_CHANNEL = "run_metric_values"
+FETCH_LIMIT = 5000
+SUBSCRIBER_QUEUE_SIZE = 100
+RECONNECT_SECONDS = 5.0
+RETRY_MS = 3000
+
+
+def fetch_points_since(run_id: uuid.UUID, since: int, limit: int = FETCH_LIMIT) -> list[dict]:
+    """Points of the run with ingest_seq > since, live rows and compacted chunks alike."""
+    points = metric_points(run_id=run_id, since=since)
+    # Callers checked the run's project already; the hub reads for many subscribers.
+    with SessionLocal() as db:
+        db.info["rls_bypass"] = True
+        rows = [
+            dict(row)
+            for row in db.execute(
+                select(points).order_by(points.c.ingest_seq, points.c.step).limit(limit)
+            ).mappings()
+        ]
+    if len(rows) == limit:
+        # Chunks compacted before migration 0017 give all their points the
+        # chunk's newest seq. Stop before a seq the page may have split, so
+        # the next page (ingest_seq > cursor) does not skip the rest of it.
+        last = rows[-1]["ingest_seq"]
+        whole = [row for row in rows if row["ingest_seq"] != last]
+        if whole:
+            return whole
+    return rows
+
+
+def latest_seq(run_id: uuid.UUID) -> int:
+    # Compaction moves rows into chunks, so the cursor covers both; otherwise
+    # it would move backwards once a completed run is compacted.
+    live = (
+        select(func.max(RunMetricValue.ingest_seq))
+        .where(RunMetricValue.run_id == run_id)
+        .scalar_subquery()
+    )
+    chunked = (
+        select(func.max(RunMetricChunk.max_ingest_seq))
+        .where(RunMetricChunk.run_id == run_id)
+        .scalar_subquery()
+    )
+    with SessionLocal() as db:
+        db.info["rls_bypass"] = True
+        return db.scalar(
+            select(func.greatest(func.coalesce(live, 0), func.coalesce(chunked, 0)))
+        )
+
+
+def _listen_conninfo() -> str:
+    url = make_url(settings.database_url)
+    return url.set(drivername="postgresql").render_as_string(hide_password=False)
+
+
+class Subscription:
+    def __init__(self) -> None:
+        self.queue: asyncio.Queue[list[dict] | None] = asyncio.Queue(SUBSCRIBER_QUEUE_SIZE)
+
+    def offer(self, points: list[dict]) -> None:
+        try:
+            self.queue.put_nowait(points)
+        except asyncio.QueueFull:
+            # A stalled client must not hold points for everyone. It is
+            # disconnected and resumes from the database with Last-Event-ID.
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(None)
+
+
+class MetricStreamHub:
+    """Fans new metric points out to the stream subscribers of this process.
+
+    A notification for a run (Postgres LISTEN, or `publish` on the memory
+    backend) causes one query from the hub's cursor for that run. The rows go
+    to every subscriber, so the database cost does not grow with the number
+    of viewers.
+    """
+
+    def __init__(self) -> None:
+        self._subscribers: dict[uuid.UUID, set[Subscription]] = {}
+        self._cursors: dict[uuid.UUID, int] = {}
+        self._dirty: set[uuid.UUID] = set()
+        self._draining: set[uuid.UUID] = set()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._listener: asyncio.Task | None = None
+
+    def _ensure_started(self) -> None:
+        if self._loop is not None:
+            return
+        if settings.metric_stream_backend not in ("postgres", "memory"):
+            raise RuntimeError(f"Unknown metric stream backend: {settings.metric_stream_backend}")
+        self._loop = asyncio.get_running_loop()
+        if settings.metric_stream_backend == "postgres":
+            self._listener = self._loop.create_task(self._listen())
+
+    async def subscribe(self, run_id: uuid.UUID) -> Subscription:
+        self._ensure_started()
+        subscription = Subscription()
+        self._subscribers.setdefault(run_id, set()).add(subscription)
+        if run_id not in self._cursors:
+            # Keep the lowest cursor if several first subscribers race. Every
+            # subscriber reads its catch-up after this point, so none misses a row.
+            cursor = await run_in_threadpool(latest_seq, run_id)
+            self._cursors[run_id] = min(cursor, self._cursors.get(run_id, cursor))
+            if run_id in self._dirty:
+                self._wake(run_id)
+        return subscription
+
+    def unsubscribe(self, run_id: uuid.UUID, subscription: Subscription) -> None:
+        subscribers = self._subscribers.get(run_id)
+        if subscribers is None:
+            return
+        subscribers.discard(subscription)
+        if not subscribers:
+            del self._subscribers[run_id]
+            self._cursors.pop(run_id, None)
+            self._dirty.discard(run_id)
+
+    def publish(self, run_id: uuid.UUID) -> None:
+        """Announce new points from a worker thread. Only used by the memory backend."""
+        if self._loop is not None and settings.metric_stream_backend == "memory":
+            self._loop.call_soon_threadsafe(self._wake, run_id)
+
+    def _wake(self, run_id: uuid.UUID) -> None:
+        if run_id not in self._subscribers:
+            return
+        self._dirty.add(run_id)
+        if run_id not in self._draining and run_id in self._cursors:
+            self._draining.add(run_id)
+            self._loop.create_task(self._drain(run_id))
+
+    async def _drain(self, run_id: uuid.UUID) -> None:
+        try:
+            while run_id in self._dirty and run_id in self._cursors:
+                self._dirty.discard(run_id)
+                points = await run_in_threadpool(
+                    fetch_points_since, run_id, self._cursors[run_id]
+                )
+                if not points or run_id not in self._cursors:
+                    continue
+                self._cursors[run_id] = points[-1]["ingest_seq"]
+                if len(points) == FETCH_LIMIT:
+                    self._dirty.add(run_id)
+                for subscription in list(self._subscribers.get(run_id, ())):
+                    subscription.offer(points)
+        except Exception:
+            logger.exception("Fetching new metric points for run %s failed", run_id)
+        finally:
+            self._draining.discard(run_id)
+
+    async def _listen(self) -> None:
+        while True:
+            try:
+                async with await psycopg.AsyncConnection.connect(
+                    _listen_conninfo(), autocommit=True
+                ) as conn:
+                    await conn.execute(f"LISTEN {NOTIFY_CHANNEL}")
+                    # Catch up on anything committed while we were not listening.
+                    for run_id in list(self._subscribers):
+                        self._wake(run_id)
+                    async for notify in conn.notifies():
+                        self._wake(uuid.UUID(notify.payload))
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                logger.warning("Metric stream listener disconnected: %s", exc)
+                await asyncio.sleep(RECONNECT_SECONDS)
+
+
+metric_hub = MetricStreamHub()
+
+
+def _event(points: list[dict]) -> bytes:
+    seq = points[-1]["ingest_seq"]
+    data = orjson.dumps(points, option=ORJSON_OPTIONS)
+    return b"id: %d\nevent: metrics\ndata: %s\n\n" % (seq, data)
+
+
+async def metric_events(run_id: uuid.UUID, since: int | None) -> AsyncIterator[bytes]:
+    """Server-Sent Events for one subscriber: catch-up from `since`, then live points.
+
+    Each event carries a JSON list in RunMetricValueRead shape. Its id is the
+    last ingest_seq, which a reconnecting client sends back as Last-Event-ID.
+    """
+    subscription = await metric_hub.subscribe(run_id)
+    try:
+        yield b"retry: %d\n\n" % RETRY_MS
+        if since is None:
+            since = await run_in_threadpool(latest_seq, run_id)
+        else:
+            while True:
+                points = await run_in_threadpool(fetch_points_since, run_id, since)
+                if points:
+                    since = points[-1]["ingest_seq"]
+                    yield _event(points)
+                if len(points) < FETCH_LIMIT:
+                    break
+        while True:
+            try:
+                points = await asyncio.wait_for(
+                    subscription.queue.get(), settings.metric_stream_heartbeat_seconds
+                )
+            except asyncio.TimeoutError:
+                yield b": keep-alive\n\n"
+                continue
+            if points is None:
+                return
+            # The hub may resend points this subscriber already read in its catch-up.
+            points = [point for point in points if point["ingest_seq"] > since]
+            if points:
+                since = points[-1]["ingest_seq"]
+                yield _event(points)
+    finally:
+        metric_hub.unsubscribe(run_id, subscription)
@@ -0,0 +1,145 @@
+import math
+
+import numpy as np
+
+DEFAULT_BINS = 5
+MIN_LEVEL_RUNS = 2
+
+
+def flatten_params(params: dict, prefix: str = "") -> dict:
+    flat = {}
+    for key, value in params.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict):
+            flat.update(flatten_params(value, f"{name}."))
+        else:
+            flat[name] = value
+    return flat
+
+
+def _is_number(value) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _finite(value: float) -> float | None:
+    value = float(value)
+    return value if math.isfinite(value) else None
+
+
+def _group_stats(codes: np.ndarray, y: np.ndarray, groups: int):
+    counts = np.bincount(codes, minlength=groups)
+    sums = np.bincount(codes, weights=y, minlength=groups)
+    means = np.divide(sums, counts, out=np.full(groups, np.nan), where=counts > 0)
+    return counts, means
+
+
+def _variance_explained(
+    codes: np.ndarray, counts: np.ndarray, means: np.ndarray, y: np.ndarray
+) -> float:
+    # Share of the metric variance explained by this parameter's marginal: the
+    # first-order term of a functional ANOVA decomposition over the observed
+    # runs. Raw eta^2 (between SS / total SS) is 1.0 for any parameter that is
+    # unique per run, so levels with fewer than MIN_LEVEL_RUNS runs are left
+    # out and the remainder is scored with omega^2, which charges the between
+    # SS for its degrees of freedom and clamps at zero.
+    kept = counts >= MIN_LEVEL_RUNS
+    levels = int(np.count_nonzero(kept))
+    runs = int(counts[kept].sum())
+    if levels < 2 or runs <= levels:
+        return 0.0
+    kept_means = means[kept]
+    grand_mean = float(np.sum(counts[kept] * kept_means) / runs)
+    between = float(np.sum(counts[kept] * (kept_means - grand_mean) ** 2))
+    in_kept = kept[codes]
+    within = float(np.sum((y[in_kept] - means[codes[in_kept]]) ** 2))
+    total = between + within
+    if total <= 0.0:
+        return 0.0
+    mean_within = within / (runs - levels)
+    return max(0.0, (between - (levels - 1) * mean_within) / (total + mean_within))
+
+
+def _numeric_summary(x: np.ndarray, y: np.ndarray, bins: int) -> dict:
+    unique = np.unique(x)
+    if unique.size <= bins:
+        edges = np.append(unique, unique[-1])
+        codes = np.searchsorted(unique, x)
+    else:
+        edges = np.unique(np.quantile(x, np.linspace(0.0, 1.0, bins + 1)))
+        codes = np.clip(np.searchsorted(edges, x, side="right") - 1, 0, edges.size - 2)
+    groups = max(edges.size - 1, 1)
+    counts, means = _group_stats(codes, y, groups)
+
+    correlation = None
+    if unique.size > 1 and np.std(y) > 0:
+        correlation = _finite(np.corrcoef(x, y)[0, 1])
+
+    if unique.size <= bins:
+        marginals = [
+            {"low": float(low), "high": float(low), "count": int(count), "mean": _finite(mean)}
+            for low, count, mean in zip(unique, counts, means)
+        ]
+    else:
+        marginals = [
+            {
+                "low": float(edges[i]),
+                "high": float(edges[i + 1]),
+                "count": int(counts[i]),
+                "mean": _finite(means[i]) if counts[i] else None,
+            }
+            for i in range(groups)
+        ]
+    return {
+        "kind": "numeric",
+        "correlation": correlation,
+        "variance_explained": _variance_explained(codes, counts, means, y),
+        "marginals": marginals,
+    }
+
+
+def _categorical_summary(values: list, y: np.ndarray) -> dict:
+    labels = np.array([str(value) for value in values])
+    categories, codes = np.unique(labels, return_inverse=True)
+    counts, means = _group_stats(codes, y, categories.size)
+    return {
+        "kind": "categorical",
+        "correlation": None,
+        "variance_explained": _variance_explained(codes, counts, means, y),
+        "marginals": [
+            {"value": str(category), "count": int(count), "mean": _finite(mean)}
+            for category, count, mean in zip(categories, counts, means)
+        ],
+    }
+
+
+def param_importance(rows: list[tuple[dict, float]], bins: int = DEFAULT_BINS) -> list[dict]:
+    """Per-parameter statistics for (params_json, final metric) pairs.
+
+    Each parameter is evaluated on the runs that set it. `importance` is the
+    parameter's variance_explained normalized across all parameters.
+    """
+    flat_rows = [(flatten_params(params or {}), value) for params, value in rows]
+    keys = sorted({key for params, _ in flat_rows for key in params})
+    results = []
+    for key in keys:
+        present = [
+            (params[key], value)
+            for params, value in flat_rows
+            if key in params and params[key] is not None
+        ]
+        if len(present) < 2:
+            continue
+        values = [item[0] for item in present]
+        y = np.fromiter((item[1] for item in present), dtype=np.float64, count=len(present))
+        if all(_is_number(value) for value in values):
+            x = np.fromiter(values, dtype=np.float64, count=len(values))
+            summary = _numeric_summary(x, y, bins)
+        else:
+            summary = _categorical_summary(values, y)
+        results.append({"key": key, "runs": len(present), **summary})
+
+    total = sum(item["variance_explained"] for item in results)
+    for item in results:
+        item["importance"] = item["variance_explained"] / total if total else 0.0
+    results.sort(key=lambda item: item["importance"], reverse=True)
+    return results
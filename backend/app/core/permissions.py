@@ -1,10 +1,11 @@
 import uuid
 
 from fastapi import HTTPException, status
-from sqlalchemy import select
+from sqlalchemy import ColumnElement, Select, select, true
 from sqlalchemy.orm import Session
 
-from app.models.models import MLProject, OrgMember, ProjectMember
+from app.core.config import settings
+from app.models.models import MLProject, OrgMember, UserProjectAccess
 
 ORG_ROLE_RANK = {
     "viewer": 0,
@@ -57,27 +58,47 @@ def require_project_role(
             detail="Project not found",
         )
 
-    member = db.scalar(
-        select(ProjectMember).where(
-            ProjectMember.project_id == project_id,
-            ProjectMember.user_id == user_id,
-            ProjectMember.is_active.is_(True),
-        )
-    )
-    if member and _has_role(member.role, required_role, PROJECT_ROLE_RANK):
+    # Under RLS the lookup above only finds projects the caller can see, which
+    # is exactly the viewer check.
+    if settings.row_level_security and required_role == "viewer":
         return project
 
-    org_member = db.scalar(
-        select(OrgMember).where(
-            OrgMember.org_id == project.org_id,
-            OrgMember.user_id == user_id,
-            OrgMember.is_active.is_(True),
-        )
-    )
-    if org_member and _has_role(org_member.role, "admin", ORG_ROLE_RANK):
+    # user_project_access already folds org owner/admin into an effective
+    # 'admin' role, so one primary-key lookup replaces the two membership queries.
+    access = db.get(UserProjectAccess, (user_id, project_id))
+    if access and _has_role(access.role, required_role, PROJECT_ROLE_RANK):
         return project
 
     raise HTTPException(
         status_code=status.HTTP_403_FORBIDDEN,
         detail="Project access denied",
     )
+
+
+def project_ids_with_role(
+    db: Session, user_id: uuid.UUID, project_ids, required_role: str
+) -> set[uuid.UUID]:
+    """The subset of `project_ids` where the user holds `required_role`, in one query."""
+    rows = db.execute(
+        select(UserProjectAccess.project_id, UserProjectAccess.role).where(
+            UserProjectAccess.user_id == user_id,
+            UserProjectAccess.project_id.in_(list(project_ids)),
+        )
+    )
+    return {
+        project_id
+        for project_id, role in rows
+        if _has_role(role, required_role, PROJECT_ROLE_RANK)
+    }
+
+
+def visible_project_ids(user_id: uuid.UUID) -> Select:
+    """Projects the user can read, for `<project_id column>.in_(...)` filters in list endpoints."""
+    return select(UserProjectAccess.project_id).where(UserProjectAccess.user_id == user_id)
+
+
+def project_visible(project_column: ColumnElement, user_id: uuid.UUID) -> ColumnElement[bool]:
+    """List filter on a project_id column. RLS mode leaves it to the table policies."""
+    if settings.row_level_security:
+        return true()
+    return project_column.in_(visible_project_ids(user_id))
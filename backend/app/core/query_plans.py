@@ -0,0 +1,245 @@
+import hashlib
+import logging
+import queue
+import random
+import re
+import threading
+import time
+from contextvars import ContextVar
+from datetime import datetime, timezone
+
+from sqlalchemy import bindparam, event, text
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.engine import Engine
+from sqlalchemy.types import DateTime
+
+from app.core.cache import LRUCache
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+EXPLAINABLE = ("select", "with", "insert", "update", "delete")
+SENSITIVE_PARAM = re.compile(r"password|secret|token", re.IGNORECASE)
+# `IN (%(id_1)s, %(id_2)s, ...)` and multi-row VALUES differ only in length.
+PARAM_LIST = re.compile(r"\(\s*%\(\w+\)s(?:\s*,\s*%\(\w+\)s)+\s*\)")
+VALUES_LIST = re.compile(r"(VALUES\s*\([^()]*\))(?:\s*,\s*\([^()]*\))+", re.IGNORECASE)
+WHITESPACE = re.compile(r"\s+")
+MAX_PARAM_ITEMS = 20
+MAX_PARAM_CHARS = 200
+EXPLAINED_CACHE_SIZE = 10_000
+RECORD_QUEUE_SIZE = 1_000
+RECORD_BATCH_SIZE = 100
+
+_capturing: ContextVar[bool] = ContextVar("query_plan_capturing", default=False)
+_last_explained = LRUCache(maxsize=EXPLAINED_CACHE_SIZE)
+_records: queue.Queue[dict] = queue.Queue(RECORD_QUEUE_SIZE)
+
+RECORD_SQL = text(
+    """
+    INSERT INTO query_plan_fingerprints AS q (
+        statement_hash, statement, calls, total_ms, max_ms, last_ms,
+        plan_hash, plan, params, plan_changed_at
+    )
+    VALUES (
+        :statement_hash, :statement, 1, :elapsed_ms, :elapsed_ms, :elapsed_ms,
+        :plan_hash, :plan, :params, :plan_changed_at
+    )
+    ON CONFLICT (statement_hash) DO UPDATE SET
+        calls = q.calls + 1,
+        total_ms = q.total_ms + EXCLUDED.total_ms,
+        max_ms = GREATEST(q.max_ms, EXCLUDED.max_ms),
+        last_ms = EXCLUDED.last_ms,
+        last_seen_at = now(),
+        plan_changed_at = CASE
+            WHEN EXCLUDED.plan_hash IS NOT NULL AND EXCLUDED.plan_hash IS DISTINCT FROM q.plan_hash
+            THEN EXCLUDED.plan_changed_at
+            ELSE q.plan_changed_at
+        END,
+        plan_hash = COALESCE(EXCLUDED.plan_hash, q.plan_hash),
+        plan = COALESCE(EXCLUDED.plan, q.plan),
+        params = COALESCE(EXCLUDED.params, q.params)
+    """
+).bindparams(
+    bindparam("plan", type_=JSONB),
+    bindparam("params", type_=JSONB),
+    bindparam("plan_changed_at", type_=DateTime(timezone=True)),
+)
+
+
+def plan_nodes(node: dict) -> list[str]:
+    """Flatten an EXPLAIN JSON plan into `Node Type:target` labels, depth first."""
+    label = node["Node Type"]
+    target = node.get("Index Name") or node.get("Relation Name") or node.get("Function Name")
+    nodes = [f"{label}:{target}" if target else label]
+    for child in node.get("Plans", []):
+        nodes.extend(plan_nodes(child))
+    return nodes
+
+
+def plan_hash(nodes: list[str]) -> str:
+    """Plan-shape fingerprint: ignores costs and row counts, changes with node types and indexes."""
+    return hashlib.sha1("|".join(nodes).encode()).hexdigest()[:12]
+
+
+def normalize_statement(statement: str) -> str:
+    statement = WHITESPACE.sub(" ", statement).strip()
+    statement = PARAM_LIST.sub("(...)", statement)
+    return VALUES_LIST.sub(r"\1, ...", statement)
+
+
+def statement_hash(statement: str) -> str:
+    return hashlib.sha1(statement.encode()).hexdigest()[:16]
+
+
+def _sample_value(value):
+    if value is None or isinstance(value, (bool, int, float)):
+        return value
+    if isinstance(value, (list, tuple)):
+        items = [_sample_value(item) for item in value[:MAX_PARAM_ITEMS]]
+        if len(value) > MAX_PARAM_ITEMS:
+            items.append(f"... {len(value)} items")
+        return items
+    if isinstance(value, dict):
+        return {str(key): _sample_value(item) for key, item in value.items()}
+    return str(value)[:MAX_PARAM_CHARS]
+
+
+def sample_params(parameters) -> dict | list | None:
+    """JSON-safe copy of the bind params. Password/secret/token values are redacted."""
+    if not parameters:
+        return None
+    if isinstance(parameters, dict):
+        return {
+            key: "<redacted>" if SENSITIVE_PARAM.search(key) else _sample_value(value)
+            for key, value in parameters.items()
+        }
+    return _sample_value(parameters)
+
+
+def _explain(cursor, statement: str, parameters) -> dict:
+    # Same connection, so the same transaction snapshot and app.user_id. The
+    # rolled-back savepoint undoes whatever a write statement did under ANALYZE.
+    options = "FORMAT JSON"
+    if settings.slow_query_explain_analyze:
+        options = "ANALYZE, BUFFERS, FORMAT JSON"
+    raw = cursor.connection
+    with raw.transaction(force_rollback=True), raw.cursor() as explain_cursor:
+        explain_cursor.execute(f"EXPLAIN ({options}) {statement}", parameters)
+        document = explain_cursor.fetchone()[0]
+    return document[0] if isinstance(document, list) else document
+
+
+def _should_explain(key: str) -> bool:
+    now = time.monotonic()
+    last = _last_explained.get(key)
+    if last is not None and now - last < settings.slow_query_explain_interval_seconds:
+        return False
+    _last_explained.set(key, now)
+    return True
+
+
+def _record_writer(engine: Engine) -> None:
+    # One thread per process holds at most one pool connection. A saturated pool
+    # delays the records, never the slow request that produced them.
+    _capturing.set(True)
+    while True:
+        records = [_records.get()]
+        while len(records) < RECORD_BATCH_SIZE:
+            try:
+                records.append(_records.get_nowait())
+            except queue.Empty:
+                break
+        try:
+            with engine.begin() as store:
+                for record in records:
+                    store.execute(RECORD_SQL, record)
+        except Exception as exc:
+            logger.warning("Writing %d slow query records failed: %s", len(records), exc)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    if not _capturing.get():
+        conn.info["query_started"] = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    started = conn.info.pop("query_started", None)
+    if started is None or _capturing.get():
+        return
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    if elapsed_ms < settings.slow_query_threshold_ms:
+        return
+    if random.random() >= settings.slow_query_sample_rate:
+        return
+    if not statement.lstrip().lower().startswith(EXPLAINABLE):
+        return
+
+    token = _capturing.set(True)
+    try:
+        normalized = normalize_statement(statement)
+        key = statement_hash(normalized)
+        params = parameters[0] if executemany and parameters else parameters
+        if not parameters and getattr(context, "no_parameters", False):
+            params = None
+        document = None
+        if _should_explain(key):
+            try:
+                document = _explain(cursor, statement, params)
+            except Exception as exc:
+                logger.warning("EXPLAIN failed for statement %s: %s", key, exc)
+        nodes = plan_nodes(document["Plan"]) if document else None
+        _records.put_nowait(
+            {
+                "statement_hash": key,
+                "statement": normalized,
+                "elapsed_ms": elapsed_ms,
+                "plan_hash": plan_hash(nodes) if nodes else None,
+                "plan": document,
+                "params": sample_params(params) if document else None,
+                "plan_changed_at": datetime.now(timezone.utc) if document else None,
+            }
+        )
+    except queue.Full:
+        logger.warning("Slow query record dropped, the writer is behind")
+    except Exception as exc:
+        # Capture must never fail the request that happened to be slow.
+        logger.warning("Slow query capture failed: %s", exc)
+    finally:
+        _capturing.reset(token)
+
+
+def _load_auto_explain(dbapi_connection, connection_record) -> None:
+    # auto_explain sees the statements inside plpgsql functions (leaderboard,
+    # compaction, triggers), which the cursor hooks only see as one call.
+    threshold = int(settings.slow_query_threshold_ms)
+    analyze = "on" if settings.slow_query_explain_analyze else "off"
+    try:
+        with dbapi_connection.cursor() as cursor:
+            cursor.execute("LOAD 'auto_explain'")
+            cursor.execute(f"SET auto_explain.log_min_duration = {threshold}")
+            cursor.execute(f"SET auto_explain.log_analyze = {analyze}")
+            cursor.execute(f"SET auto_explain.log_buffers = {analyze}")
+            cursor.execute("SET auto_explain.log_nested_statements = on")
+            cursor.execute("SET auto_explain.log_format = json")
+        dbapi_connection.commit()
+    except Exception as exc:
+        dbapi_connection.rollback()
+        logger.warning("auto_explain not enabled: %s", exc)
+
+
+def install_query_capture(engine: Engine) -> None:
+    """Record slow statements of `engine` in query_plan_fingerprints.
+
+    Statements slower than SLOW_QUERY_THRESHOLD_MS are re-run under EXPLAIN
+    at most once per SLOW_QUERY_EXPLAIN_INTERVAL_SECONDS per statement. Their
+    timing is counted every time. A background thread writes the rows on its
+    own connection, so they survive the caller rolling back and the request
+    never waits for a second pool connection.
+    """
+    threading.Thread(
+        target=_record_writer, args=(engine,), name="query-plan-writer", daemon=True
+    ).start()
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    if settings.slow_query_auto_explain:
+        event.listen(engine, "connect", _load_auto_explain)
@@ -0,0 +1,106 @@
+import hashlib
+import uuid
+from collections.abc import Callable
+from functools import lru_cache
+from typing import Any, Protocol
+from urllib.parse import urlencode
+
+import orjson
+from fastapi import Request, Response
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.core.cache import LRUCache
+from app.core.config import settings
+from app.core.serialization import ORJSON_OPTIONS
+from app.models.models import ProjectDataVersion
+
+
+class ReportCacheBackend(Protocol):
+    def get(self, key: str) -> bytes | None: ...
+
+    def set(self, key: str, value: bytes) -> None: ...
+
+
+class MemoryReportCache:
+    def __init__(self, maxsize: int) -> None:
+        self._cache = LRUCache(maxsize=maxsize)
+
+    def get(self, key: str) -> bytes | None:
+        return self._cache.get(key)
+
+    def set(self, key: str, value: bytes) -> None:
+        self._cache.set(key, value)
+
+
+class RedisReportCache:
+    """Shared cache for several API workers; needs the optional `redis` package."""
+
+    def __init__(self, url: str, ttl_seconds: int) -> None:
+        import redis
+
+        self._client = redis.Redis.from_url(url)
+        self._ttl_seconds = ttl_seconds
+
+    def get(self, key: str) -> bytes | None:
+        return self._client.get(f"report:{key}")
+
+    def set(self, key: str, value: bytes) -> None:
+        self._client.set(f"report:{key}", value, ex=self._ttl_seconds)
+
+
+@lru_cache
+def get_report_cache() -> ReportCacheBackend:
+    if settings.report_cache_backend == "redis":
+        if not settings.report_cache_url:
+            raise RuntimeError("REPORT_CACHE_URL is required for the redis report cache")
+        return RedisReportCache(settings.report_cache_url, settings.report_cache_ttl_seconds)
+    if settings.report_cache_backend != "memory":
+        raise RuntimeError(f"Unknown report cache backend: {settings.report_cache_backend}")
+    return MemoryReportCache(settings.report_cache_size)
+
+
+def project_data_version(db: Session, project_id: uuid.UUID) -> int:
+    version = db.scalar(
+        select(func.sum(ProjectDataVersion.version)).where(
+            ProjectDataVersion.project_id == project_id
+        )
+    )
+    return int(version or 0)
+
+
+def report_etag(request: Request, version: int) -> str:
+    # urlencode escapes & and =, so a value cannot pass for another parameter.
+    params = urlencode(sorted(request.query_params.multi_items()))
+    digest = hashlib.sha256(f"{request.url.path}?{params}#{version}".encode("utf-8"))
+    return f'"{digest.hexdigest()[:32]}"'
+
+
+def _etag_matches(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    candidates = {item.strip().removeprefix("W/") for item in header.split(",")}
+    return "*" in candidates or etag in candidates
+
+
+def cached_report(
+    request: Request, db: Session, project_id: uuid.UUID, build: Callable[[], Any]
+) -> Response:
+    """Serve a report from the cache, keyed by (endpoint, params, project data version).
+
+    Callers check permissions first. The ETag is derived from the key alone, so a
+    matching If-None-Match returns 304 before `build` or the cache is consulted.
+    """
+    etag = report_etag(request, project_data_version(db, project_id))
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if _etag_matches(request, etag):
+        return Response(status_code=304, headers=headers)
+
+    cache = get_report_cache()
+    body = cache.get(etag)
+    if body is None:
+        body = orjson.dumps(jsonable_encoder(build()), option=ORJSON_OPTIONS)
+        cache.set(etag, body)
+    return Response(content=body, media_type="application/json", headers=headers)
@@ -62,6 +62,8 @@ def _decode_access_token(token: str) -> dict:
 
 
 def _set_audit_user(db: Session, user_id: uuid.UUID) -> None:
+    # Kept in session.info so later transactions of this request get it too.
+    db.info["user_id"] = user_id
     db.execute(
         text("SELECT set_config('app.user_id', :user_id, true)"),
         {"user_id": str(user_id)},
@@ -95,3 +97,16 @@ def get_current_user(
     _set_audit_user(db, user.user_id)
     request.state.user_id = user.user_id
     return user
+
+
+def require_operator(current_user: User = Depends(get_current_user)) -> User:
+    """Allow only the users listed in OPERATOR_EMAILS (server-wide diagnostics)."""
+    operators = {
+        email.strip().lower() for email in settings.operator_emails.split(",") if email.strip()
+    }
+    if current_user.email.lower() not in operators:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Operator access required",
+        )
+    return current_user
@@ -0,0 +1,28 @@
+from collections.abc import Iterable
+from typing import Any
+
+import orjson
+from fastapi.responses import Response
+from pydantic import BaseModel
+from sqlalchemy import Column, Table
+
+# OPT_UTC_Z renders UTC datetimes with a "Z" suffix, matching Pydantic output.
+ORJSON_OPTIONS = orjson.OPT_UTC_Z
+
+
+class FastJSONResponse(Response):
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=ORJSON_OPTIONS)
+
+
+def model_columns(model: type[BaseModel], table: Table) -> list[Column]:
+    # Fields without a column on `table` (opt-in extras) are left to the caller.
+    return [table.c[name] for name in model.model_fields if name in table.c]
+
+
+def rows_response(rows: Iterable) -> FastJSONResponse:
+    # Rows must come from a select over model_columns(); the response then has
+    # the read model's JSON shape without building ORM or Pydantic objects.
+    return FastJSONResponse([dict(row) for row in rows])
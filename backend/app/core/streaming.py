@@ -0,0 +1,151 @@
+import csv
+import importlib.util
+import io
+import json
+import uuid
+from collections.abc import Iterable, Iterator
+from datetime import date, datetime
+
+from fastapi import Request
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+from sqlalchemy import Select
+
+from app.db.session import apply_user_context, engine
+
+STREAM_BATCH_SIZE = 5000
+
+MEDIA_TYPES = {
+    "csv": "text/csv",
+    "ndjson": "application/x-ndjson",
+    "parquet": "application/vnd.apache.parquet",
+}
+
+
+def stream_rows(
+    stmt: Select, user_id: uuid.UUID | None = None, batch_size: int = STREAM_BATCH_SIZE
+) -> Iterator[list[dict]]:
+    # The request-scoped session is closed before a StreamingResponse body is
+    # sent, so the generator owns its connection. It sets the caller's
+    # app.user_id itself, or row-level security would hide every row. yield_per
+    # switches psycopg to a server-side cursor; only one partition is held in
+    # memory at a time.
+    with engine.connect() as conn, conn.begin():
+        if user_id is not None:
+            apply_user_context(conn, user_id)
+        result = conn.execute(stmt.execution_options(yield_per=batch_size))
+        for partition in result.mappings().partitions():
+            yield [dict(row) for row in partition]
+
+
+def _json_default(value):
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def iter_ndjson(batches: Iterable[list[dict]]) -> Iterator[bytes]:
+    for batch in batches:
+        yield "".join(
+            json.dumps(row, default=_json_default, separators=(",", ":")) + "\n"
+            for row in batch
+        ).encode("utf-8")
+
+
+def iter_model_ndjson(
+    batches: Iterable[list[dict]], model: type[BaseModel]
+) -> Iterator[bytes]:
+    # Rows go through the endpoint's read model so the stream has exactly the
+    # JSON shape of the regular list response, one object per line.
+    for batch in batches:
+        yield b"".join(
+            model.model_validate(row).model_dump_json().encode("utf-8") + b"\n"
+            for row in batch
+        )
+
+
+def wants_ndjson(request: Request) -> bool:
+    return MEDIA_TYPES["ndjson"] in request.headers.get("accept", "")
+
+
+def ndjson_response(
+    query: Select, model: type[BaseModel], user_id: uuid.UUID | None
+) -> StreamingResponse:
+    return StreamingResponse(
+        iter_model_ndjson(stream_rows(query, user_id), model),
+        media_type=MEDIA_TYPES["ndjson"],
+    )
+
+
+def iter_csv(batches: Iterable[list[dict]], columns: list[str]) -> Iterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    for batch in batches:
+        for row in batch:
+            writer.writerow(
+                [
+                    value.isoformat() if isinstance(value, datetime) else value
+                    for value in (row[column] for column in columns)
+                ]
+            )
+        yield buffer.getvalue().encode("utf-8")
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode("utf-8")
+
+
+class _ParquetSink(io.RawIOBase):
+    # ParquetWriter needs a file with a monotonically growing tell(); the
+    # written bytes are drained after every row group instead of being kept.
+    def __init__(self) -> None:
+        super().__init__()
+        self._chunks: list[bytes] = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        chunk = bytes(data)
+        self._chunks.append(chunk)
+        self._position += len(chunk)
+        return len(chunk)
+
+    def tell(self) -> int:
+        return self._position
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def iter_parquet(batches: Iterable[list[dict]], schema) -> Iterator[bytes]:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    sink = _ParquetSink()
+    with pq.ParquetWriter(pa.PythonFile(sink, mode="w"), schema) as writer:
+        for batch in batches:
+            rows = [
+                {
+                    key: str(value) if isinstance(value, uuid.UUID) else value
+                    for key, value in row.items()
+                }
+                for row in batch
+            ]
+            writer.write_table(pa.Table.from_pylist(rows, schema=schema))
+            yield sink.drain()
+    yield sink.drain()
+
+
+def parquet_available() -> bool:
+    # find_spec of a submodule raises if the parent package is missing.
+    return (
+        importlib.util.find_spec("pyarrow") is not None
+        and importlib.util.find_spec("pyarrow.parquet") is not None
+    )
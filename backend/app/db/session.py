@@ -1,7 +1,36 @@
-from sqlalchemy import create_engine
+import uuid
+
+from sqlalchemy import Connection, create_engine, event, text
 from sqlalchemy.orm import sessionmaker
 
 from app.core.config import settings
+from app.core.query_plans import install_query_capture
 
 engine = create_engine(settings.database_url, pool_pre_ping=True)
+if settings.slow_query_capture:
+    install_query_capture(engine)
 SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False)
+
+
+def apply_user_context(
+    connection: Connection, user_id: uuid.UUID | None, bypass: bool = False
+) -> None:
+    """Set app.user_id / app.rls_bypass for the connection's current transaction."""
+    connection.execute(
+        text(
+            "SELECT set_config('app.user_id', :user_id, true), "
+            "set_config('app.rls_bypass', :bypass, true)"
+        ),
+        {"user_id": str(user_id) if user_id else "", "bypass": "on" if bypass else "off"},
+    )
+
+
+@event.listens_for(SessionLocal, "after_begin")
+def _apply_session_context(session, transaction, connection) -> None:
+    # set_config(..., true) only lasts for one transaction. Re-apply the caller
+    # after every commit so audit triggers and RLS policies keep seeing it.
+    user_id = session.info.get("user_id")
+    bypass = session.info.get("rls_bypass", False)
+    if user_id is None and not bypass:
+        return
+    apply_user_context(connection, user_id, bypass)
@@ -11,12 +11,15 @@ from app.routers import (
     dataset_versions,
     datasets,
     experiments,
+    exports,
+    lineage,
     metric_definitions,
     org_members,
     organizations,
     project_members,
     project_metric_summary,
     projects,
+    query_plans,
     reports,
     run_artifacts,
     run_configs,
@@ -44,8 +47,11 @@ app.include_router(metric_definitions.router, prefix=api_prefix)
 app.include_router(artifacts.router, prefix=api_prefix)
 app.include_router(run_artifacts.router, prefix=api_prefix)
 app.include_router(reports.router, prefix=api_prefix)
+app.include_router(exports.router, prefix=api_prefix)
+app.include_router(lineage.router, prefix=api_prefix)
 app.include_router(batch_import.router, prefix=api_prefix)
 app.include_router(batch_import_jobs.router, prefix=api_prefix)
 app.include_router(batch_import_errors.router, prefix=api_prefix)
 app.include_router(audit_log.router, prefix=api_prefix)
 app.include_router(project_metric_summary.router, prefix=api_prefix)
+app.include_router(query_plans.router, prefix=api_prefix)
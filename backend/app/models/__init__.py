@@ -1,41 +1,55 @@
 from app.models.models import (
     Artifact,
+    ArtifactUpload,
     AuditLog,
     BatchImportError,
     BatchImportJob,
     Dataset,
     DatasetVersion,
     Experiment,
+    ExperimentMetricSummary,
     MetricDefinition,
     MLProject,
     OrgMember,
     Organization,
+    ProjectDataVersion,
     ProjectMember,
     ProjectMetricSummary,
+    QueryPlanFingerprint,
     Run,
     RunArtifact,
     RunConfig,
+    RunFinalMetrics,
+    RunMetricChunk,
     RunMetricValue,
     User,
+    UserProjectAccess,
 )
 
 __all__ = [
     "Artifact",
+    "ArtifactUpload",
     "AuditLog",
     "BatchImportError",
     "BatchImportJob",
     "Dataset",
     "DatasetVersion",
     "Experiment",
+    "ExperimentMetricSummary",
     "MetricDefinition",
     "MLProject",
     "OrgMember",
     "Organization",
+    "ProjectDataVersion",
     "ProjectMember",
     "ProjectMetricSummary",
+    "QueryPlanFingerprint",
     "Run",
     "RunArtifact",
     "RunConfig",
+    "RunFinalMetrics",
+    "RunMetricChunk",
     "RunMetricValue",
     "User",
+    "UserProjectAccess",
 ]
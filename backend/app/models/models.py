@@ -6,16 +6,18 @@ from sqlalchemy import (
     Boolean,
     CheckConstraint,
     DateTime,
+    FetchedValue,
     Float,
     ForeignKey,
     Index,
     Integer,
+    SmallInteger,
     Text,
     UniqueConstraint,
     func,
     text,
 )
-from sqlalchemy.dialects.postgresql import JSONB, UUID
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB, UUID
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.db.base import Base
@@ -354,11 +356,64 @@ class RunMetricValue(Base):
     recorded_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), nullable=False, server_default=func.now()
     )
+    # Set by trg_run_metric_values_ingest_seq (sql/metric_stream.sql).
+    ingest_seq: Mapped[int | None] = mapped_column(BigInteger, server_default=FetchedValue())
 
     __table_args__ = (
         CheckConstraint("scope IN ('train','val','test')", name="ck_rmv_scope"),
         CheckConstraint("step IS NULL OR step >= 0", name="ck_rmv_step"),
         Index("ix_rmv_run_metric_scope_step", "run_id", "metric_id", "scope", "step"),
+        Index("ix_rmv_run_ingest_seq", "run_id", "ingest_seq"),
+    )
+
+
+class RunMetricChunk(Base):
+    __tablename__ = "run_metric_chunks"
+
+    chunk_id: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=True)
+    run_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("runs.run_id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    metric_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("metric_definitions.metric_id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    scope: Mapped[str] = mapped_column(Text, nullable=False)
+    step_start: Mapped[int] = mapped_column(Integer, nullable=False)
+    step_end: Mapped[int] = mapped_column(Integer, nullable=False)
+    point_count: Mapped[int] = mapped_column(Integer, nullable=False)
+    steps: Mapped[list[int]] = mapped_column(ARRAY(Integer), nullable=False)
+    values: Mapped[list[float]] = mapped_column(ARRAY(Float), nullable=False)
+    recorded_at: Mapped[list[datetime]] = mapped_column(
+        ARRAY(DateTime(timezone=True)), nullable=False
+    )
+    ingest_seqs: Mapped[list[int] | None] = mapped_column(ARRAY(BigInteger))
+    max_ingest_seq: Mapped[int | None] = mapped_column(BigInteger)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, server_default=func.now()
+    )
+
+    __table_args__ = (
+        CheckConstraint("scope IN ('train','val','test')", name="ck_rmc_scope"),
+        CheckConstraint("step_start <= step_end", name="ck_rmc_step_range"),
+        Index("ix_rmc_run_metric_scope_step", "run_id", "metric_id", "scope", "step_start"),
+    )
+
+
+class RunFinalMetrics(Base):
+    __tablename__ = "run_final_metrics"
+
+    run_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("runs.run_id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    metrics: Mapped[dict] = mapped_column(JSONB, nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, server_default=func.now()
     )
 
 
@@ -391,6 +446,38 @@ class Artifact(Base):
         ),
         CheckConstraint("size_bytes IS NULL OR size_bytes >= 0", name="ck_artifacts_size"),
         Index("ix_artifacts_project_type_created", "project_id", "artifact_type", "created_at"),
+        Index("ix_artifacts_project_checksum", "project_id", "checksum"),
+    )
+
+
+class ArtifactUpload(Base):
+    __tablename__ = "artifact_uploads"
+
+    upload_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        primary_key=True,
+        default=uuid.uuid4,
+        server_default=text("gen_random_uuid()"),
+    )
+    project_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("ml_projects.project_id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    artifact_type: Mapped[str] = mapped_column(Text, nullable=False)
+    size_bytes: Mapped[int | None] = mapped_column(BigInteger)
+    checksum: Mapped[str | None] = mapped_column(Text)
+    created_by: Mapped[uuid.UUID | None] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("users.user_id")
+    )
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, server_default=func.now()
+    )
+
+    __table_args__ = (
+        CheckConstraint(
+            "size_bytes IS NULL OR size_bytes >= 0", name="ck_artifact_uploads_size"
+        ),
     )
 
 
@@ -465,7 +552,8 @@ class BatchImportJob(Base):
 
     __table_args__ = (
         CheckConstraint(
-            "job_type IN ('users','datasets','runs','metrics','artifacts')",
+            "job_type IN ('users','datasets','experiments','runs','run_configs','metrics',"
+            "'artifacts','dataset_profile')",
             name="ck_jobs_type",
         ),
         CheckConstraint(
@@ -473,7 +561,7 @@ class BatchImportJob(Base):
             name="ck_jobs_status",
         ),
         CheckConstraint(
-            "source_format IN ('csv','json')",
+            "source_format IN ('csv','json','parquet')",
             name="ck_jobs_format",
         ),
     )
@@ -522,3 +610,99 @@ class ProjectMetricSummary(Base):
     __table_args__ = (
         CheckConstraint("scope IN ('train','val','test')", name="ck_pms_scope"),
     )
+
+
+class ExperimentMetricSummary(Base):
+    __tablename__ = "experiment_metric_summary"
+
+    experiment_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("experiments.experiment_id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    metric_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("metric_definitions.metric_id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    scope: Mapped[str] = mapped_column(Text, primary_key=True)
+    project_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("ml_projects.project_id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    best_value: Mapped[float | None] = mapped_column(Float)
+    best_run_id: Mapped[uuid.UUID | None] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("runs.run_id", ondelete="SET NULL")
+    )
+    best_recorded_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
+    sample_size: Mapped[int] = mapped_column(Integer, nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, server_default=func.now()
+    )
+
+    __table_args__ = (
+        CheckConstraint("scope IN ('train','val','test')", name="ck_ems_scope"),
+        Index("ix_ems_project_metric_scope", "project_id", "metric_id", "scope"),
+    )
+
+
+class ProjectDataVersion(Base):
+    __tablename__ = "project_data_versions"
+
+    project_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("ml_projects.project_id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    # One row per writer shard; the project's version is the sum (sql/project_data_versions.sql).
+    shard: Mapped[int] = mapped_column(SmallInteger, primary_key=True, server_default=text("0"))
+    version: Mapped[int] = mapped_column(BigInteger, nullable=False, server_default=text("1"))
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, server_default=func.now()
+    )
+
+
+class UserProjectAccess(Base):
+    __tablename__ = "user_project_access"
+
+    user_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("users.user_id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    project_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("ml_projects.project_id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    role: Mapped[str] = mapped_column(Text, nullable=False)
+
+    __table_args__ = (
+        CheckConstraint("role IN ('admin','editor','viewer')", name="ck_upa_role"),
+        Index("ix_upa_project_id", "project_id"),
+    )
+
+
+class QueryPlanFingerprint(Base):
+    __tablename__ = "query_plan_fingerprints"
+
+    statement_hash: Mapped[str] = mapped_column(Text, primary_key=True)
+    statement: Mapped[str] = mapped_column(Text, nullable=False)
+    calls: Mapped[int] = mapped_column(BigInteger, nullable=False, server_default=text("0"))
+    total_ms: Mapped[float] = mapped_column(Float, nullable=False, server_default=text("0"))
+    max_ms: Mapped[float] = mapped_column(Float, nullable=False, server_default=text("0"))
+    last_ms: Mapped[float | None] = mapped_column(Float)
+    plan_hash: Mapped[str | None] = mapped_column(Text)
+    plan: Mapped[dict | None] = mapped_column(JSONB)
+    params: Mapped[dict | list | None] = mapped_column(JSONB)
+    first_seen_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, server_default=func.now()
+    )
+    last_seen_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, server_default=func.now()
+    )
+    plan_changed_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
+    baseline_plan_hash: Mapped[str | None] = mapped_column(Text)
+    baseline_mean_ms: Mapped[float | None] = mapped_column(Float)
+    baseline_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
@@ -8,12 +8,15 @@ from app.routers import (
     dataset_versions,
     datasets,
     experiments,
+    exports,
+    lineage,
     metric_definitions,
     org_members,
     organizations,
     project_members,
     project_metric_summary,
     projects,
+    query_plans,
     reports,
     run_artifacts,
     run_configs,
@@ -32,12 +35,15 @@ __all__ = [
     "dataset_versions",
     "datasets",
     "experiments",
+    "exports",
+    "lineage",
     "metric_definitions",
     "org_members",
     "organizations",
     "project_members",
     "project_metric_summary",
     "projects",
+    "query_plans",
     "reports",
     "run_artifacts",
     "run_configs",
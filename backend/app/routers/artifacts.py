@@ -1,18 +1,50 @@
 import uuid
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy import or_, select
+from fastapi import APIRouter, Depends, Header, HTTPException, Request, Response, status
+from sqlalchemy import func, select
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 
-from app.core.permissions import require_project_role
+from app.core.artifact_store import (
+    ARTIFACT_URI_PREFIX,
+    append_upload,
+    artifact_uri,
+    blob_path,
+    blob_response,
+    commit_blob,
+    discard_upload,
+    is_store_uri,
+    restore_blob,
+    retire_blob,
+    sha256_path,
+    stored_blob,
+    upload_offset,
+    upload_path,
+)
+from app.core.permissions import project_visible, require_project_role
 from app.core.security import get_current_user
 from app.db.deps import get_db
-from app.models.models import Artifact, MLProject, OrgMember, ProjectMember, User
-from app.schemas.artifacts import ArtifactCreate, ArtifactRead, ArtifactUpdate
+from app.db.session import SessionLocal
+from app.models.models import Artifact, ArtifactUpload, User
+from app.schemas.artifacts import (
+    ArtifactCreate,
+    ArtifactRead,
+    ArtifactUpdate,
+    ArtifactUploadCreate,
+    ArtifactUploadRead,
+)
 
 router = APIRouter(prefix="/artifacts", tags=["artifacts"])
 
 
+def _reject_store_uri(uri: str | None) -> None:
+    if is_store_uri(uri):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"{ARTIFACT_URI_PREFIX} URIs are assigned by the upload endpoints",
+        )
+
+
 @router.post("", response_model=ArtifactRead, status_code=status.HTTP_201_CREATED)
 def create_artifact(
     artifact_in: ArtifactCreate,
@@ -20,6 +52,7 @@ def create_artifact(
     current_user: User = Depends(get_current_user),
 ) -> Artifact:
     require_project_role(db, current_user.user_id, artifact_in.project_id, "editor")
+    _reject_store_uri(artifact_in.uri)
     artifact = Artifact(**artifact_in.model_dump())
     db.add(artifact)
     db.commit()
@@ -34,30 +67,226 @@ def list_artifacts(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ) -> list[Artifact]:
-    member_projects = select(ProjectMember.project_id).where(
-        ProjectMember.user_id == current_user.user_id,
-        ProjectMember.is_active.is_(True),
-    )
-    org_admin_orgs = select(OrgMember.org_id).where(
-        OrgMember.user_id == current_user.user_id,
-        OrgMember.is_active.is_(True),
-        OrgMember.role.in_(["owner", "admin"]),
-    )
     artifacts = db.scalars(
         select(Artifact)
-        .join(MLProject, MLProject.project_id == Artifact.project_id)
-        .where(
-            or_(
-                Artifact.project_id.in_(member_projects),
-                MLProject.org_id.in_(org_admin_orgs),
-            )
-        )
+        .where(project_visible(Artifact.project_id, current_user.user_id))
         .limit(limit)
         .offset(offset)
     ).all()
     return artifacts
 
 
+def _lock_blob(db: Session, digest: str) -> None:
+    # Serializes /complete, which may reuse a stored blob, with the deletes
+    # that remove a blob once nothing references it.
+    db.execute(select(func.pg_advisory_xact_lock(func.hashtext(artifact_uri(digest)))))
+
+
+def _unreferenced_blob(db: Session, artifact: Artifact) -> str | None:
+    """Digest of the artifact's stored blob if no other artifact references it.
+
+    Holds the blob lock until the caller's transaction ends.
+    """
+    if not stored_blob(artifact.uri):
+        return None
+    digest = artifact.uri.removeprefix(ARTIFACT_URI_PREFIX)
+    _lock_blob(db, digest)
+    # RLS hides other projects' artifacts from the caller's session.
+    with SessionLocal() as other:
+        other.info["rls_bypass"] = True
+        shared = other.scalar(
+            select(Artifact.artifact_id)
+            .where(Artifact.uri == artifact.uri, Artifact.artifact_id != artifact.artifact_id)
+            .limit(1)
+        )
+    return None if shared else digest
+
+
+def _commit_dropping_blob(db: Session, digest: str | None) -> None:
+    retired = retire_blob(digest) if digest else None
+    try:
+        db.commit()
+    except Exception:
+        if retired:
+            restore_blob(retired, digest)
+        raise
+    if retired:
+        retired.unlink(missing_ok=True)
+
+
+def _project_has_blob(db: Session, project_id: uuid.UUID, digest: str | None) -> bool:
+    # Skipping the bytes is only allowed for content the project already holds.
+    # Otherwise knowing another tenant's checksum would be enough to read it.
+    if not digest:
+        return False
+    artifact_id = db.scalar(
+        select(Artifact.artifact_id)
+        .where(Artifact.project_id == project_id, Artifact.uri == artifact_uri(digest))
+        .limit(1)
+    )
+    return artifact_id is not None and blob_path(digest).exists()
+
+
+def _upload_read(db: Session, upload: ArtifactUpload) -> ArtifactUploadRead:
+    digest = upload.checksum.removeprefix("sha256:") if upload.checksum else None
+    return ArtifactUploadRead(
+        upload_id=upload.upload_id,
+        project_id=upload.project_id,
+        artifact_type=upload.artifact_type,
+        size_bytes=upload.size_bytes,
+        checksum=upload.checksum,
+        offset=upload_offset(upload.upload_id),
+        blob_exists=_project_has_blob(db, upload.project_id, digest),
+        created_at=upload.created_at,
+    )
+
+
+def _get_upload(
+    db: Session, upload_id: uuid.UUID, user_id: uuid.UUID, for_update: bool = False
+) -> ArtifactUpload:
+    # Completing or aborting locks the row, so a second /complete waits and
+    # then finds the upload gone instead of racing for the file.
+    upload = db.get(ArtifactUpload, upload_id, with_for_update=for_update)
+    if not upload:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Upload not found")
+    require_project_role(db, user_id, upload.project_id, "editor")
+    return upload
+
+
+@router.post(
+    "/uploads", response_model=ArtifactUploadRead, status_code=status.HTTP_201_CREATED
+)
+def create_artifact_upload(
+    upload_in: ArtifactUploadCreate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+) -> ArtifactUploadRead:
+    """Start a resumable upload into the content-addressed store.
+
+    Send the bytes with `PATCH /artifacts/uploads/{id}` and an `Upload-Offset`
+    header. Resume from the `offset` reported by `GET /artifacts/uploads/{id}`,
+    then call `/complete`. If `blob_exists` is true the content is already
+    stored and `/complete` can be called right away.
+    """
+    require_project_role(db, current_user.user_id, upload_in.project_id, "editor")
+    upload = ArtifactUpload(**upload_in.model_dump(), created_by=current_user.user_id)
+    db.add(upload)
+    db.commit()
+    db.refresh(upload)
+    return _upload_read(db, upload)
+
+
+@router.get("/uploads/{upload_id}", response_model=ArtifactUploadRead)
+def get_artifact_upload(
+    upload_id: uuid.UUID,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+) -> ArtifactUploadRead:
+    return _upload_read(db, _get_upload(db, upload_id, current_user.user_id))
+
+
+@router.patch("/uploads/{upload_id}")
+async def upload_artifact_chunk(
+    upload_id: uuid.UUID,
+    request: Request,
+    upload_offset_header: int = Header(..., alias="Upload-Offset", ge=0),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+) -> Response:
+    """Append the raw request body at `Upload-Offset`; it is streamed to disk as it arrives."""
+    upload = await run_in_threadpool(_get_upload, db, upload_id, current_user.user_id)
+    offset = await append_upload(
+        upload_id, upload_offset_header, request.stream(), upload.size_bytes
+    )
+    return Response(
+        status_code=status.HTTP_204_NO_CONTENT, headers={"Upload-Offset": str(offset)}
+    )
+
+
+@router.post("/uploads/{upload_id}/complete", response_model=ArtifactRead)
+def complete_artifact_upload(
+    upload_id: uuid.UUID,
+    response: Response,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+) -> Artifact:
+    """Hash the upload, store it once per SHA-256 and register the artifact.
+
+    Returns 201 with a new artifact. If the project already has an artifact
+    with the same content, that artifact is returned with 200.
+    """
+    upload = _get_upload(db, upload_id, current_user.user_id, for_update=True)
+    path = upload_path(upload_id)
+    declared = upload.checksum.removeprefix("sha256:") if upload.checksum else None
+
+    if declared and not path.exists():
+        _lock_blob(db, declared)
+    if (
+        declared
+        and not path.exists()
+        and _project_has_blob(db, upload.project_id, declared)
+    ):
+        digest = declared
+    else:
+        if not path.exists():
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST, detail="No data uploaded"
+            )
+        size = path.stat().st_size
+        if upload.size_bytes is not None and size != upload.size_bytes:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Upload incomplete: {size} of {upload.size_bytes} bytes",
+            )
+        digest = sha256_path(path)
+        if declared and digest != declared:
+            discard_upload(upload_id)
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Checksum mismatch, upload discarded",
+            )
+        _lock_blob(db, digest)
+        commit_blob(path, digest)
+
+    checksum = f"sha256:{digest}"
+    artifact = db.scalar(
+        select(Artifact).where(
+            Artifact.project_id == upload.project_id,
+            Artifact.checksum == checksum,
+            Artifact.uri == artifact_uri(digest),
+        )
+    )
+    if artifact:
+        response.status_code = status.HTTP_200_OK
+    else:
+        artifact = Artifact(
+            project_id=upload.project_id,
+            artifact_type=upload.artifact_type,
+            uri=artifact_uri(digest),
+            checksum=checksum,
+            size_bytes=blob_path(digest).stat().st_size,
+        )
+        db.add(artifact)
+        response.status_code = status.HTTP_201_CREATED
+    db.delete(upload)
+    db.commit()
+    db.refresh(artifact)
+    return artifact
+
+
+@router.delete("/uploads/{upload_id}", status_code=status.HTTP_204_NO_CONTENT)
+def abort_artifact_upload(
+    upload_id: uuid.UUID,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+) -> None:
+    upload = _get_upload(db, upload_id, current_user.user_id, for_update=True)
+    discard_upload(upload_id)
+    db.delete(upload)
+    db.commit()
+    return None
+
+
 @router.get("/{artifact_id}", response_model=ArtifactRead)
 def get_artifact(
     artifact_id: uuid.UUID,
@@ -71,6 +300,34 @@ def get_artifact(
     return artifact
 
 
+@router.get("/{artifact_id}/content")
+def download_artifact(
+    artifact_id: uuid.UUID,
+    range_header: str | None = Header(None, alias="Range"),
+    if_range: str | None = Header(None, alias="If-Range"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+) -> Response:
+    """Download stored content; supports single `Range` requests (206)."""
+    artifact = db.get(Artifact, artifact_id)
+    if not artifact:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Artifact not found")
+    require_project_role(db, current_user.user_id, artifact.project_id, "viewer")
+    path = stored_blob(artifact.uri)
+    if not path or not path.exists():
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Artifact content is not in the {ARTIFACT_URI_PREFIX} store",
+        )
+    return blob_response(
+        path,
+        filename=f"{artifact.artifact_id}",
+        etag=f'"{artifact.checksum}"',
+        range_header=range_header,
+        if_range=if_range,
+    )
+
+
 @router.put("/{artifact_id}", response_model=ArtifactRead)
 def update_artifact(
     artifact_id: uuid.UUID,
@@ -82,9 +339,14 @@ def update_artifact(
     if not artifact:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Artifact not found")
     require_project_role(db, current_user.user_id, artifact.project_id, "editor")
-    for key, value in artifact_in.model_dump(exclude_unset=True).items():
+    changes = artifact_in.model_dump(exclude_unset=True)
+    digest = None
+    if "uri" in changes and changes["uri"] != artifact.uri:
+        _reject_store_uri(changes["uri"])
+        digest = _unreferenced_blob(db, artifact)
+    for key, value in changes.items():
         setattr(artifact, key, value)
-    db.commit()
+    _commit_dropping_blob(db, digest)
     db.refresh(artifact)
     return artifact
 
@@ -99,6 +361,7 @@ def delete_artifact(
     if not artifact:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Artifact not found")
     require_project_role(db, current_user.user_id, artifact.project_id, "editor")
+    digest = _unreferenced_blob(db, artifact)
     db.delete(artifact)
-    db.commit()
+    _commit_dropping_blob(db, digest)
     return None
@@ -1,8 +1,9 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from sqlalchemy import select
 from sqlalchemy.orm import Session
 
 from app.core.security import get_current_user
+from app.core.streaming import ndjson_response, wants_ndjson
 from app.db.deps import get_db
 from app.models.models import AuditLog
 from app.schemas.audit import AuditLogCreate, AuditLogRead, AuditLogUpdate
@@ -27,11 +28,21 @@ def create_audit_log(
 
 @router.get("", response_model=list[AuditLogRead])
 def list_audit_logs(
-    limit: int = 100, offset: int = 0, db: Session = Depends(get_db)
+    request: Request,
+    limit: int = 100,
+    offset: int = 0,
+    db: Session = Depends(get_db),
 ) -> list[AuditLog]:
-    logs = db.scalars(
+    query = (
         select(AuditLog).order_by(AuditLog.changed_at.desc()).limit(limit).offset(offset)
-    ).all()
+    )
+    if wants_ndjson(request):
+        return ndjson_response(
+            query.with_only_columns(*AuditLog.__table__.columns),
+            AuditLogRead,
+            request.state.user_id,
+        )
+    logs = db.scalars(query).all()
     return logs
 
 
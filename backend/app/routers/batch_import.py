@@ -4,21 +4,29 @@ import json
 import uuid
 from datetime import datetime
 
-from fastapi import APIRouter, Depends, File, Form, HTTPException, UploadFile, status
-from sqlalchemy import insert, select
+from fastapi import (
+    APIRouter,
+    BackgroundTasks,
+    Depends,
+    File,
+    Form,
+    HTTPException,
+    UploadFile,
+    status,
+)
 from sqlalchemy.orm import Session
 
+from app.core.batch_import import ROW_IMPORTS, import_rows
+from app.core.dataset_profile import local_dataset_path, profile_format, run_profile_job
 from app.core.permissions import require_project_role
 from app.core.security import get_current_user
+from app.core.streaming import parquet_available
 from app.db.deps import get_db
 from app.models.models import (
     BatchImportError,
     BatchImportJob,
     Dataset,
-    Experiment,
-    MetricDefinition,
-    Run,
-    RunMetricValue,
+    DatasetVersion,
     User,
 )
 from app.schemas.batch_import import BatchImportJobRead
@@ -26,30 +34,6 @@ from app.schemas.batch_import import BatchImportJobRead
 router = APIRouter(prefix="", tags=["batch-import"])
 
 
-def _parse_uuid(value: str | None) -> uuid.UUID | None:
-    if value in (None, ""):
-        return None
-    return uuid.UUID(str(value))
-
-
-def _parse_int(value: str | None) -> int | None:
-    if value in (None, ""):
-        return None
-    return int(value)
-
-
-def _parse_float(value: str | None) -> float | None:
-    if value in (None, ""):
-        return None
-    return float(value)
-
-
-def _parse_datetime(value: str | None) -> datetime | None:
-    if value in (None, ""):
-        return None
-    return datetime.fromisoformat(value)
-
-
 def _load_rows(source_format: str, content: io.TextIOBase) -> list[dict]:
     if source_format == "csv":
         reader = csv.DictReader(content)
@@ -77,7 +61,7 @@ def batch_import(
             detail="file or source_uri is required",
         )
 
-    allowed_job_types = {"metrics", "datasets"}
+    allowed_job_types = set(ROW_IMPORTS)
     if job_type not in allowed_job_types:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -133,108 +117,79 @@ def batch_import(
         db.commit()
         return job
 
-    metric_cache: dict[str, uuid.UUID] = {}
-    project_access_cache: dict[uuid.UUID, bool] = {}
-    run_project_cache: dict[uuid.UUID, uuid.UUID] = {}
-
-    for row_number, row in enumerate(rows, start=1):
-        try:
-            if job_type == "metrics":
-                run_id = _parse_uuid(row.get("run_id"))
-                metric_id = _parse_uuid(row.get("metric_id"))
-                metric_key = row.get("metric_key")
-                scope = row.get("scope")
-                step = _parse_int(row.get("step"))
-                value = _parse_float(row.get("value"))
-                recorded_at = _parse_datetime(row.get("recorded_at"))
-
-                if not run_id or not scope or value is None:
-                    raise ValueError("run_id, scope, and value are required")
-
-                if run_id not in run_project_cache:
-                    project_id = db.scalar(
-                        select(Experiment.project_id)
-                        .join(Run, Run.experiment_id == Experiment.experiment_id)
-                        .where(Run.run_id == run_id)
-                    )
-                    if not project_id:
-                        raise ValueError("Run not found")
-                    run_project_cache[run_id] = project_id
-                project_id = run_project_cache[run_id]
-                if project_id not in project_access_cache:
-                    require_project_role(
-                        db, current_user.user_id, project_id, "editor"
-                    )
-                    project_access_cache[project_id] = True
-
-                if not metric_id:
-                    if not metric_key:
-                        raise ValueError("metric_id or metric_key is required")
-                    if metric_key not in metric_cache:
-                        metric = db.scalar(
-                            select(MetricDefinition).where(
-                                MetricDefinition.key == metric_key
-                            )
-                        )
-                        if not metric:
-                            raise ValueError(f"Unknown metric_key: {metric_key}")
-                        metric_cache[metric_key] = metric.metric_id
-                    metric_id = metric_cache[metric_key]
-
-                data = {
-                    "run_id": run_id,
-                    "metric_id": metric_id,
-                    "scope": scope,
-                    "step": step,
-                    "value": value,
-                }
-                if recorded_at:
-                    data["recorded_at"] = recorded_at
-
-                db.execute(insert(RunMetricValue), data)
-
-            elif job_type == "datasets":
-                project_id = _parse_uuid(row.get("project_id"))
-                name = row.get("name")
-                task_type = row.get("task_type")
-                description = row.get("description")
-                if not project_id or not name or not task_type:
-                    raise ValueError("project_id, name, task_type are required")
-
-                if project_id not in project_access_cache:
-                    require_project_role(
-                        db, current_user.user_id, project_id, "editor"
-                    )
-                    project_access_cache[project_id] = True
-
-                data = {
-                    "project_id": project_id,
-                    "name": name,
-                    "task_type": task_type,
-                    "description": description,
-                }
-                db.execute(insert(Dataset), data)
-            else:
-                raise ValueError(f"Unsupported job_type: {job_type}")
-
-            db.commit()
-            inserted += 1
-        except Exception as exc:
-            db.rollback()
-            errors += 1
-            db.add(
-                BatchImportError(
-                    job_id=job.job_id,
-                    row_number=row_number,
-                    raw_row=row,
-                    error_message=str(exc),
-                )
+    try:
+        inserted, errors = import_rows(db, job, job_type, rows, current_user.user_id)
+    except Exception as exc:
+        # Earlier chunks are committed; the job must not stay "running".
+        db.rollback()
+        job.status = "failed"
+        job.finished_at = datetime.utcnow()
+        job.stats_json = job.stats_json or {"inserted": inserted, "errors": errors}
+        db.add(
+            BatchImportError(
+                job_id=job.job_id,
+                row_number=None,
+                raw_row=None,
+                error_message=str(exc),
             )
-            db.commit()
-
+        )
+        db.commit()
+        db.refresh(job)
+        return job
     job.status = "finished"
     job.finished_at = datetime.utcnow()
     job.stats_json = {"inserted": inserted, "errors": errors}
     db.commit()
     db.refresh(job)
     return job
+
+
+@router.post(
+    "/batch-import/dataset-profile",
+    response_model=BatchImportJobRead,
+    status_code=status.HTTP_202_ACCEPTED,
+)
+def profile_dataset_version(
+    background_tasks: BackgroundTasks,
+    dataset_version_id: uuid.UUID = Form(..., example="d5f6a1b2-3c4d-4e5f-9a0b-1c2d3e4f5a6b"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+) -> BatchImportJob:
+    """Queue a `dataset_profile` job for the version's local CSV/Parquet file.
+
+    The job streams the file and writes row_count plus per-column types, null
+    rates, min/max and approximate distinct counts to schema_json["profile"].
+    """
+    version = db.get(DatasetVersion, dataset_version_id)
+    if not version:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Dataset version not found"
+        )
+    dataset = db.get(Dataset, version.dataset_id)
+    if not dataset:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Dataset not found"
+        )
+    require_project_role(db, current_user.user_id, dataset.project_id, "editor")
+    if not parquet_available():
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Dataset profiling requires pyarrow on the server",
+        )
+    try:
+        source_format = profile_format(local_dataset_path(version.storage_uri))
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+
+    job = BatchImportJob(
+        job_type="dataset_profile",
+        status="created",
+        source_format=source_format,
+        source_uri=version.storage_uri,
+        created_by=current_user.user_id,
+    )
+    db.add(job)
+    db.commit()
+    db.refresh(job)
+    background_tasks.add_task(run_profile_job, job.job_id, version.dataset_version_id)
+    return job
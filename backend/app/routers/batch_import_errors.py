@@ -1,10 +1,11 @@
 import uuid
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from sqlalchemy import select
 from sqlalchemy.orm import Session
 
 from app.core.security import get_current_user
+from app.core.streaming import ndjson_response, wants_ndjson
 from app.db.deps import get_db
 from app.models.models import BatchImportError, BatchImportJob, User
 from app.schemas.batch_import_errors import (
@@ -38,6 +39,7 @@ def create_batch_import_error(
 
 @router.get("", response_model=list[BatchImportErrorRead])
 def list_batch_import_errors(
+    request: Request,
     job_id: uuid.UUID | None = None,
     limit: int = 100,
     offset: int = 0,
@@ -57,9 +59,14 @@ def list_batch_import_errors(
         if job.created_by != current_user.user_id:
             raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Access denied")
         query = query.where(BatchImportError.job_id == job_id)
-    errors = db.scalars(
-        query.order_by(BatchImportError.created_at.desc()).limit(limit).offset(offset)
-    ).all()
+    query = query.order_by(BatchImportError.created_at.desc()).limit(limit).offset(offset)
+    if wants_ndjson(request):
+        return ndjson_response(
+            query.with_only_columns(*BatchImportError.__table__.columns),
+            BatchImportErrorRead,
+            current_user.user_id,
+        )
+    errors = db.scalars(query).all()
     return errors
 
 
@@ -1,13 +1,15 @@
 import uuid
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy import or_, select
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
-from app.core.permissions import require_project_role
+from app.core.permissions import project_visible, require_project_role
 from app.core.security import get_current_user
 from app.db.deps import get_db
-from app.models.models import Dataset, DatasetVersion, MLProject, OrgMember, ProjectMember, User
+from app.models.models import Dataset, DatasetVersion, User
 from app.schemas.datasets import (
     DatasetVersionCreate,
     DatasetVersionRead,
@@ -36,6 +38,88 @@ def create_dataset_version(
     return version
 
 
+@router.post("/register", response_model=DatasetVersionRead)
+def register_dataset_version(
+    version_in: DatasetVersionCreate,
+    response: Response,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+) -> DatasetVersion:
+    """Return the version of `dataset_id` with this content_hash, creating it if missing.
+
+    Responds 200 for an existing version and 201 for a new one. Registering the
+    same content again is a single lookup on uq_dv_dataset_hash.
+    """
+    dataset = db.get(Dataset, version_in.dataset_id)
+    if not dataset:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Dataset not found"
+        )
+    require_project_role(db, current_user.user_id, dataset.project_id, "editor")
+    lookup = select(DatasetVersion).where(
+        DatasetVersion.dataset_id == version_in.dataset_id,
+        DatasetVersion.content_hash == version_in.content_hash,
+    )
+    existing = db.scalar(lookup)
+    if existing:
+        return existing
+
+    label_conflict = HTTPException(
+        status_code=status.HTTP_409_CONFLICT,
+        detail="Version label already registered with different content",
+    )
+    label_taken = db.scalar(
+        select(DatasetVersion.dataset_version_id).where(
+            DatasetVersion.dataset_id == version_in.dataset_id,
+            DatasetVersion.version_label == version_in.version_label,
+        )
+    )
+    if label_taken:
+        raise label_conflict
+    # A concurrent register of the same content wins the race quietly; the
+    # lookup below then returns its row. One with the same label but other
+    # content trips the label constraint instead.
+    try:
+        created = db.scalar(
+            insert(DatasetVersion)
+            .values(**version_in.model_dump())
+            .on_conflict_do_nothing(index_elements=["dataset_id", "content_hash"])
+            .returning(DatasetVersion.dataset_version_id)
+        )
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        existing = db.scalar(lookup)
+        if existing:
+            return existing
+        raise label_conflict
+    if created:
+        response.status_code = status.HTTP_201_CREATED
+    return db.scalar(lookup)
+
+
+@router.get("/by-hash/{content_hash}", response_model=list[DatasetVersionRead])
+def get_dataset_versions_by_hash(
+    content_hash: str,
+    dataset_id: uuid.UUID | None = None,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+) -> list[DatasetVersion]:
+    """Visible dataset versions with this content_hash, via ix_dataset_versions_content_hash."""
+    query = (
+        select(DatasetVersion)
+        .join(Dataset, Dataset.dataset_id == DatasetVersion.dataset_id)
+        .where(
+            DatasetVersion.content_hash == content_hash,
+            project_visible(Dataset.project_id, current_user.user_id),
+        )
+        .order_by(DatasetVersion.created_at)
+    )
+    if dataset_id:
+        query = query.where(DatasetVersion.dataset_id == dataset_id)
+    return db.scalars(query).all()
+
+
 @router.get("", response_model=list[DatasetVersionRead])
 def list_dataset_versions(
     limit: int = 100,
@@ -43,25 +127,10 @@ def list_dataset_versions(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ) -> list[DatasetVersion]:
-    member_projects = select(ProjectMember.project_id).where(
-        ProjectMember.user_id == current_user.user_id,
-        ProjectMember.is_active.is_(True),
-    )
-    org_admin_orgs = select(OrgMember.org_id).where(
-        OrgMember.user_id == current_user.user_id,
-        OrgMember.is_active.is_(True),
-        OrgMember.role.in_(["owner", "admin"]),
-    )
     versions = db.scalars(
         select(DatasetVersion)
         .join(Dataset, Dataset.dataset_id == DatasetVersion.dataset_id)
-        .join(MLProject, MLProject.project_id == Dataset.project_id)
-        .where(
-            or_(
-                Dataset.project_id.in_(member_projects),
-                MLProject.org_id.in_(org_admin_orgs),
-            )
-        )
+        .where(project_visible(Dataset.project_id, current_user.user_id))
         .limit(limit)
         .offset(offset)
     ).all()
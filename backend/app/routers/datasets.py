@@ -1,13 +1,13 @@
 import uuid
 
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy import or_, select
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 
-from app.core.permissions import require_project_role
+from app.core.permissions import project_visible, require_project_role
 from app.core.security import get_current_user
 from app.db.deps import get_db
-from app.models.models import Dataset, MLProject, OrgMember, ProjectMember, User
+from app.models.models import Dataset, User
 from app.schemas.datasets import DatasetCreate, DatasetRead, DatasetUpdate
 
 router = APIRouter(prefix="/datasets", tags=["datasets"])
@@ -34,24 +34,9 @@ def list_datasets(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ) -> list[Dataset]:
-    member_projects = select(ProjectMember.project_id).where(
-        ProjectMember.user_id == current_user.user_id,
-        ProjectMember.is_active.is_(True),
-    )
-    org_admin_orgs = select(OrgMember.org_id).where(
-        OrgMember.user_id == current_user.user_id,
-        OrgMember.is_active.is_(True),
-        OrgMember.role.in_(["owner", "admin"]),
-    )
     datasets = db.scalars(
         select(Dataset)
-        .join(MLProject, MLProject.project_id == Dataset.project_id)
-        .where(
-            or_(
-                Dataset.project_id.in_(member_projects),
-                MLProject.org_id.in_(org_admin_orgs),
-            )
-        )
+        .where(project_visible(Dataset.project_id, current_user.user_id))
         .limit(limit)
         .offset(offset)
     ).all()
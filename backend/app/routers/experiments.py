@@ -1,13 +1,13 @@
 import uuid
 
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy import or_, select
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 
-from app.core.permissions import require_project_role
+from app.core.permissions import project_visible, require_project_role
 from app.core.security import get_current_user
 from app.db.deps import get_db
-from app.models.models import Experiment, MLProject, OrgMember, ProjectMember, User
+from app.models.models import Experiment, User
 from app.schemas.experiments import ExperimentCreate, ExperimentRead, ExperimentUpdate
 
 router = APIRouter(prefix="/experiments", tags=["experiments"])
@@ -37,24 +37,9 @@ def list_experiments(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ) -> list[Experiment]:
-    member_projects = select(ProjectMember.project_id).where(
-        ProjectMember.user_id == current_user.user_id,
-        ProjectMember.is_active.is_(True),
-    )
-    org_admin_orgs = select(OrgMember.org_id).where(
-        OrgMember.user_id == current_user.user_id,
-        OrgMember.is_active.is_(True),
-        OrgMember.role.in_(["owner", "admin"]),
-    )
     experiments = db.scalars(
         select(Experiment)
-        .join(MLProject, MLProject.project_id == Experiment.project_id)
-        .where(
-            or_(
-                Experiment.project_id.in_(member_projects),
-                MLProject.org_id.in_(org_admin_orgs),
-            )
-        )
+        .where(project_visible(Experiment.project_id, current_user.user_id))
         .limit(limit)
         .offset(offset)
     ).all()
@@ -0,0 +1,144 @@
+import uuid
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy import Select, select
+from sqlalchemy.orm import Session
+
+from app.core.metric_chunks import metric_points
+from app.core.permissions import require_project_role
+from app.core.security import get_current_user
+from app.core.streaming import (
+    MEDIA_TYPES,
+    iter_csv,
+    iter_ndjson,
+    iter_parquet,
+    parquet_available,
+    stream_rows,
+)
+from app.db.deps import get_db
+from app.models.models import Experiment, MetricDefinition, Run, User
+from app.schemas.enums import ExportFormat, MetricScope
+
+router = APIRouter(prefix="/exports", tags=["exports"])
+
+METRIC_EXPORT_COLUMNS = ["run_id", "metric_key", "scope", "step", "value", "recorded_at"]
+
+
+def _metric_export_query(
+    metric_key: str | None, scope: MetricScope | None, run_id: uuid.UUID | None = None
+):
+    points = metric_points(run_id=run_id, metric_key=metric_key, scope=scope)
+    query = select(
+        points.c.run_id,
+        MetricDefinition.key.label("metric_key"),
+        points.c.scope,
+        points.c.step,
+        points.c.value,
+        points.c.recorded_at,
+    ).join(MetricDefinition, MetricDefinition.metric_id == points.c.metric_id)
+    return query, points
+
+
+def _metric_parquet_schema():
+    import pyarrow as pa
+
+    return pa.schema(
+        [
+            ("run_id", pa.string()),
+            ("metric_key", pa.string()),
+            ("scope", pa.string()),
+            ("step", pa.int32()),
+            ("value", pa.float64()),
+            ("recorded_at", pa.timestamp("us", tz="UTC")),
+        ]
+    )
+
+
+def _export_response(
+    query: Select, export_format: ExportFormat, filename: str, user_id: uuid.UUID
+) -> StreamingResponse:
+    if export_format == "parquet":
+        if not parquet_available():
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Parquet export requires pyarrow on the server",
+            )
+        body = iter_parquet(stream_rows(query, user_id), _metric_parquet_schema())
+    elif export_format == "ndjson":
+        body = iter_ndjson(stream_rows(query, user_id))
+    else:
+        body = iter_csv(stream_rows(query, user_id), METRIC_EXPORT_COLUMNS)
+    return StreamingResponse(
+        body,
+        media_type=MEDIA_TYPES[export_format],
+        headers={
+            "Content-Disposition": f'attachment; filename="{filename}.{export_format}"'
+        },
+    )
+
+
+@router.get("/runs/{run_id}/metrics")
+def export_run_metrics(
+    run_id: uuid.UUID,
+    format: ExportFormat = Query("csv", example="csv"),
+    metric_key: str | None = Query(None, example="accuracy"),
+    scope: MetricScope | None = Query(None, example="val"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+) -> StreamingResponse:
+    run = db.get(Run, run_id)
+    if not run:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Run not found")
+    experiment = db.get(Experiment, run.experiment_id)
+    if not experiment:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Experiment not found"
+        )
+    require_project_role(db, current_user.user_id, experiment.project_id, "viewer")
+    query, points = _metric_export_query(metric_key, scope, run_id=run_id)
+    query = query.order_by(points.c.metric_id, points.c.scope, points.c.step)
+    return _export_response(query, format, f"run-{run_id}-metrics", current_user.user_id)
+
+
+@router.get("/experiments/{experiment_id}/metrics")
+def export_experiment_metrics(
+    experiment_id: uuid.UUID,
+    format: ExportFormat = Query("csv", example="csv"),
+    metric_key: str | None = Query(None, example="accuracy"),
+    scope: MetricScope | None = Query(None, example="val"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+) -> StreamingResponse:
+    experiment = db.get(Experiment, experiment_id)
+    if not experiment:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Experiment not found"
+        )
+    require_project_role(db, current_user.user_id, experiment.project_id, "viewer")
+    query, points = _metric_export_query(metric_key, scope)
+    query = query.join(Run, Run.run_id == points.c.run_id).where(
+        Run.experiment_id == experiment_id
+    )
+    return _export_response(
+        query, format, f"experiment-{experiment_id}-metrics", current_user.user_id
+    )
+
+
+@router.get("/projects/{project_id}/metrics")
+def export_project_metrics(
+    project_id: uuid.UUID,
+    format: ExportFormat = Query("csv", example="csv"),
+    metric_key: str | None = Query(None, example="accuracy"),
+    scope: MetricScope | None = Query(None, example="val"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+) -> StreamingResponse:
+    require_project_role(db, current_user.user_id, project_id, "viewer")
+    query, points = _metric_export_query(metric_key, scope)
+    query = (
+        query.join(Run, Run.run_id == points.c.run_id)
+        .join(Experiment, Experiment.experiment_id == Run.experiment_id)
+        .where(Experiment.project_id == project_id)
+    )
+    return _export_response(query, format, f"project-{project_id}-metrics", current_user.user_id)
@@ -0,0 +1,192 @@
+import uuid
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy import bindparam, text
+from sqlalchemy.dialects.postgresql import ARRAY, UUID
+from sqlalchemy.orm import Session
+
+from app.core.permissions import require_project_role, visible_project_ids
+from app.core.security import get_current_user
+from app.db.deps import get_db
+from app.models.models import (
+    Artifact,
+    Dataset,
+    DatasetVersion,
+    Experiment,
+    Run,
+    User,
+)
+
+router = APIRouter(prefix="/lineage", tags=["lineage"])
+
+# One recursive walk for every root type. The LATERAL block holds one branch per
+# edge kind, and each branch is served by its own index:
+#   dataset_version -> run       ix_runs_dataset_version_id
+#   run -> artifact              ix_run_artifacts_run_id
+#   artifact -> run              ix_run_artifacts_artifact_id
+# Branches only enter projects the caller can see. UNION keeps one row per edge
+# and depth, so shared datasets and artifacts cost O(edges * depth) rows rather
+# than one row per path. :max_depth bounds the walk, and :row_limit caps what a
+# single request can pull; the CTE stops early once the limit is reached.
+LINEAGE_MAX_ROWS = 10_000
+LINEAGE_SQL = text(
+    """
+    WITH RECURSIVE lineage(node_type, node_id, parent_id, depth) AS (
+        SELECT
+            CAST(:root_type AS text),
+            CAST(:root_id AS uuid),
+            CAST(NULL AS uuid),
+            0
+        UNION
+        SELECT nxt.node_type, nxt.node_id, g.node_id, g.depth + 1
+        FROM lineage g
+        CROSS JOIN LATERAL (
+            SELECT 'run'::text AS node_type, r.run_id AS node_id
+            FROM runs r
+            JOIN experiments e ON e.experiment_id = r.experiment_id
+            WHERE g.node_type = 'dataset_version'
+              AND r.dataset_version_id = g.node_id
+              AND e.project_id = ANY(:project_ids)
+            UNION ALL
+            SELECT 'artifact'::text, ra.artifact_id
+            FROM run_artifacts ra
+            JOIN artifacts a ON a.artifact_id = ra.artifact_id
+            WHERE g.node_type = 'run'
+              AND ra.run_id = g.node_id
+              AND a.project_id = ANY(:project_ids)
+            UNION ALL
+            SELECT 'run'::text, ra.run_id
+            FROM run_artifacts ra
+            JOIN runs r ON r.run_id = ra.run_id
+            JOIN experiments e ON e.experiment_id = r.experiment_id
+            WHERE g.node_type = 'artifact'
+              AND ra.artifact_id = g.node_id
+              AND e.project_id = ANY(:project_ids)
+        ) nxt
+        WHERE g.depth < :max_depth
+          AND nxt.node_id <> CAST(:root_id AS uuid)
+    )
+    SELECT
+        l.node_type,
+        l.node_id,
+        l.parent_id,
+        l.depth,
+        r.run_name,
+        r.status,
+        a.artifact_type,
+        a.uri
+    FROM (SELECT * FROM lineage LIMIT :row_limit) l
+    LEFT JOIN runs r ON l.node_type = 'run' AND r.run_id = l.node_id
+    LEFT JOIN artifacts a ON l.node_type = 'artifact' AND a.artifact_id = l.node_id
+    """
+).bindparams(bindparam("project_ids", type_=ARRAY(UUID(as_uuid=True))))
+
+
+def _visible_project_ids(db: Session, user_id: uuid.UUID) -> list[uuid.UUID]:
+    return list(db.scalars(visible_project_ids(user_id)))
+
+
+def _lineage_graph(
+    db: Session, user_id: uuid.UUID, root_type: str, root_id: uuid.UUID, max_depth: int
+) -> dict:
+    rows = db.execute(
+        LINEAGE_SQL,
+        {
+            "root_type": root_type,
+            "root_id": root_id,
+            "max_depth": max_depth,
+            "project_ids": _visible_project_ids(db, user_id),
+            "row_limit": LINEAGE_MAX_ROWS + 1,
+        },
+    ).mappings().all()
+    truncated = len(rows) > LINEAGE_MAX_ROWS
+    rows = rows[:LINEAGE_MAX_ROWS]
+
+    nodes: dict[uuid.UUID, dict] = {}
+    for row in rows:
+        node = nodes.get(row["node_id"])
+        if node is None or row["depth"] < node["depth"]:
+            node = {"id": row["node_id"], "type": row["node_type"], "depth": row["depth"]}
+            if row["node_type"] == "run":
+                node.update(run_name=row["run_name"], status=row["status"])
+            elif row["node_type"] == "artifact":
+                node.update(artifact_type=row["artifact_type"], uri=row["uri"])
+            nodes[row["node_id"]] = node
+
+    # The walk also steps back to nodes it has seen. Only edges that reach a node
+    # at its shortest depth are kept, so adjacency points away from the root.
+    adjacency: dict[uuid.UUID, set[uuid.UUID]] = {}
+    for row in rows:
+        parent = nodes.get(row["parent_id"])
+        if (
+            parent is not None
+            and row["depth"] == nodes[row["node_id"]]["depth"]
+            and parent["depth"] == row["depth"] - 1
+        ):
+            adjacency.setdefault(row["parent_id"], set()).add(row["node_id"])
+
+    return {
+        "root": {"type": root_type, "id": root_id},
+        "max_depth": max_depth,
+        "truncated": truncated,
+        "nodes": sorted(nodes.values(), key=lambda item: (item["depth"], item["type"])),
+        "adjacency": {
+            str(parent): sorted(str(child) for child in children)
+            for parent, children in adjacency.items()
+        },
+    }
+
+
+@router.get("/dataset-versions/{dataset_version_id}")
+def dataset_version_lineage(
+    dataset_version_id: uuid.UUID,
+    max_depth: int = Query(4, ge=1, le=10, example=4),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+) -> dict:
+    """Runs trained on the version, their artifacts, the runs that use those artifacts, and so on."""
+    version = db.get(DatasetVersion, dataset_version_id)
+    if not version:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Dataset version not found"
+        )
+    dataset = db.get(Dataset, version.dataset_id)
+    if not dataset:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Dataset not found")
+    require_project_role(db, current_user.user_id, dataset.project_id, "viewer")
+    return _lineage_graph(
+        db, current_user.user_id, "dataset_version", dataset_version_id, max_depth
+    )
+
+
+@router.get("/runs/{run_id}")
+def run_lineage(
+    run_id: uuid.UUID,
+    max_depth: int = Query(4, ge=1, le=10, example=4),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+) -> dict:
+    run = db.get(Run, run_id)
+    if not run:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Run not found")
+    experiment = db.get(Experiment, run.experiment_id)
+    if not experiment:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Experiment not found"
+        )
+    require_project_role(db, current_user.user_id, experiment.project_id, "viewer")
+    return _lineage_graph(db, current_user.user_id, "run", run_id, max_depth)
+
+
+@router.get("/artifacts/{artifact_id}")
+def artifact_lineage(
+    artifact_id: uuid.UUID,
+    max_depth: int = Query(4, ge=1, le=10, example=4),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+) -> dict:
+    artifact = db.get(Artifact, artifact_id)
+    if not artifact:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Artifact not found")
+    require_project_role(db, current_user.user_id, artifact.project_id, "viewer")
+    return _lineage_graph(db, current_user.user_id, "artifact", artifact_id, max_depth)
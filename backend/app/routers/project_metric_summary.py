@@ -1,13 +1,13 @@
 import uuid
 
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy import or_, select
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 
-from app.core.permissions import require_project_role
+from app.core.permissions import require_project_role, visible_project_ids
 from app.core.security import get_current_user
 from app.db.deps import get_db
-from app.models.models import MLProject, OrgMember, ProjectMember, ProjectMetricSummary, User
+from app.models.models import ProjectMetricSummary, User
 from app.schemas.project_metric_summary import (
     ProjectMetricSummaryCreate,
     ProjectMetricSummaryRead,
@@ -41,24 +41,10 @@ def list_project_metric_summary(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ) -> list[ProjectMetricSummary]:
-    member_projects = select(ProjectMember.project_id).where(
-        ProjectMember.user_id == current_user.user_id,
-        ProjectMember.is_active.is_(True),
-    )
-    org_admin_orgs = select(OrgMember.org_id).where(
-        OrgMember.user_id == current_user.user_id,
-        OrgMember.is_active.is_(True),
-        OrgMember.role.in_(["owner", "admin"]),
-    )
+    # project_metric_summary has no RLS policy, so it is always filtered here.
     query = (
         select(ProjectMetricSummary)
-        .join(MLProject, MLProject.project_id == ProjectMetricSummary.project_id)
-        .where(
-            or_(
-                ProjectMetricSummary.project_id.in_(member_projects),
-                MLProject.org_id.in_(org_admin_orgs),
-            )
-        )
+        .where(ProjectMetricSummary.project_id.in_(visible_project_ids(current_user.user_id)))
     )
     if project_id:
         require_project_role(db, current_user.user_id, project_id, "viewer")
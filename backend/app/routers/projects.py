@@ -1,13 +1,13 @@
 import uuid
 
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy import or_, select
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 
-from app.core.permissions import require_org_role, require_project_role
+from app.core.permissions import project_visible, require_org_role, require_project_role
 from app.core.security import get_current_user
 from app.db.deps import get_db
-from app.models.models import MLProject, OrgMember, ProjectMember, User
+from app.models.models import MLProject, ProjectMember, User
 from app.schemas.projects import ProjectCreate, ProjectRead, ProjectUpdate
 
 router = APIRouter(prefix="/projects", tags=["projects"])
@@ -43,23 +43,9 @@ def list_projects(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ) -> list[MLProject]:
-    member_projects = select(ProjectMember.project_id).where(
-        ProjectMember.user_id == current_user.user_id,
-        ProjectMember.is_active.is_(True),
-    )
-    org_admin_orgs = select(OrgMember.org_id).where(
-        OrgMember.user_id == current_user.user_id,
-        OrgMember.is_active.is_(True),
-        OrgMember.role.in_(["owner", "admin"]),
-    )
     projects = db.scalars(
         select(MLProject)
-        .where(
-            or_(
-                MLProject.project_id.in_(member_projects),
-                MLProject.org_id.in_(org_admin_orgs),
-            )
-        )
+        .where(project_visible(MLProject.project_id, current_user.user_id))
         .limit(limit)
         .offset(offset)
     ).all()
@@ -0,0 +1,113 @@
+from datetime import datetime, timezone
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy import and_, func, or_, select, update
+from sqlalchemy.orm import Session
+
+from app.core.security import require_operator
+from app.db.deps import get_db
+from app.models.models import QueryPlanFingerprint
+from app.schemas.query_plans import (
+    QueryPlanBaseline,
+    QueryPlanChange,
+    QueryPlanDetail,
+    QueryPlanRead,
+)
+
+router = APIRouter(
+    prefix="/query-plans",
+    tags=["query-plans"],
+    dependencies=[Depends(require_operator)],
+)
+
+# Rows are written by app.core.query_plans when SLOW_QUERY_CAPTURE is on. Counters
+# cover slow executions since the last baseline. Statements and sampled params
+# span all tenants, so only OPERATOR_EMAILS users may read or reset them.
+
+
+@router.get("", response_model=list[QueryPlanRead])
+def list_query_plans(
+    limit: int = 100, offset: int = 0, db: Session = Depends(get_db)
+) -> list[QueryPlanFingerprint]:
+    query = (
+        select(QueryPlanFingerprint)
+        .order_by(QueryPlanFingerprint.total_ms.desc())
+        .limit(limit)
+        .offset(offset)
+    )
+    return db.scalars(query).all()
+
+
+@router.get("/changes", response_model=list[QueryPlanChange])
+def list_query_plan_changes(
+    slowdown: float = Query(0.5, ge=0, example=0.5),
+    min_calls: int = Query(1, ge=1, example=1),
+    db: Session = Depends(get_db),
+) -> list[QueryPlanChange]:
+    """Statements that are new, changed plan shape, or are `slowdown` slower than baseline."""
+    mean_ms = QueryPlanFingerprint.total_ms / func.nullif(QueryPlanFingerprint.calls, 0)
+    query = (
+        select(QueryPlanFingerprint)
+        .where(
+            QueryPlanFingerprint.calls >= min_calls,
+            or_(
+                QueryPlanFingerprint.baseline_at.is_(None),
+                QueryPlanFingerprint.plan_hash.is_distinct_from(
+                    QueryPlanFingerprint.baseline_plan_hash
+                ),
+                and_(
+                    QueryPlanFingerprint.baseline_mean_ms > 0,
+                    mean_ms > QueryPlanFingerprint.baseline_mean_ms * (1 + slowdown),
+                ),
+            ),
+        )
+        .order_by(QueryPlanFingerprint.total_ms.desc())
+    )
+    changes = []
+    for row in db.scalars(query):
+        summary = QueryPlanRead.model_validate(row)
+        reasons = []
+        change = None
+        if row.baseline_at is None:
+            reasons.append("new")
+        else:
+            if row.plan_hash != row.baseline_plan_hash:
+                reasons.append("plan_changed")
+            if row.baseline_mean_ms:
+                change = summary.mean_ms / row.baseline_mean_ms - 1
+                if change > slowdown:
+                    reasons.append("slower")
+        changes.append(
+            QueryPlanChange(**summary.model_dump(), reasons=reasons, slowdown=change)
+        )
+    return changes
+
+
+@router.post("/baseline", response_model=QueryPlanBaseline)
+def create_query_plan_baseline(db: Session = Depends(get_db)) -> QueryPlanBaseline:
+    """Make the current plans and mean timings the baseline, and restart the counters."""
+    baseline_at = datetime.now(timezone.utc)
+    result = db.execute(
+        update(QueryPlanFingerprint)
+        .where(QueryPlanFingerprint.calls > 0)
+        .values(
+            baseline_plan_hash=QueryPlanFingerprint.plan_hash,
+            baseline_mean_ms=QueryPlanFingerprint.total_ms / QueryPlanFingerprint.calls,
+            baseline_at=baseline_at,
+            calls=0,
+            total_ms=0,
+            max_ms=0,
+        )
+    )
+    db.commit()
+    return QueryPlanBaseline(statements=result.rowcount, baseline_at=baseline_at)
+
+
+@router.get("/{statement_hash}", response_model=QueryPlanDetail)
+def get_query_plan(statement_hash: str, db: Session = Depends(get_db)) -> QueryPlanFingerprint:
+    fingerprint = db.get(QueryPlanFingerprint, statement_hash)
+    if not fingerprint:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Query plan not found"
+        )
+    return fingerprint
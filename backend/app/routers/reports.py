@@ -1,84 +1,280 @@
 import uuid
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlalchemy import text
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from sqlalchemy import func, null, select, text
 from sqlalchemy.orm import Session
 
+from app.core.metric_chunks import metric_points
+from app.core.param_importance import DEFAULT_BINS, param_importance
 from app.core.permissions import require_project_role
+from app.core.report_cache import cached_report
 from app.core.security import get_current_user
 from app.db.deps import get_db
-from app.models.models import Experiment, User
+from app.models.models import (
+    Experiment,
+    ExperimentMetricSummary,
+    MetricDefinition,
+    Run,
+    RunConfig,
+    User,
+)
 
 router = APIRouter(prefix="/reports", tags=["reports"])
 
 
 @router.get("/experiments/{experiment_id}/leaderboard")
 def experiment_leaderboard(
+    request: Request,
     experiment_id: uuid.UUID,
     metric_key: str = Query(..., example="accuracy"),
     scope: str = Query(..., example="val"),
     limit: int = Query(10, ge=1, le=100, example=10),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
-) -> list[dict]:
+) -> Response:
     experiment = db.get(Experiment, experiment_id)
     if not experiment:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Experiment not found")
     require_project_role(db, current_user.user_id, experiment.project_id, "viewer")
-    rows = db.execute(
-        text(
-            "SELECT * FROM fn_experiment_leaderboard(:experiment_id, :metric_key, :scope, :limit)"
-        ),
-        {
-            "experiment_id": experiment_id,
-            "metric_key": metric_key,
-            "scope": scope,
-            "limit": limit,
-        },
-    ).all()
-    return [dict(row._mapping) for row in rows]
+
+    def build() -> list[dict]:
+        rows = db.execute(
+            text(
+                "SELECT * FROM fn_experiment_leaderboard(:experiment_id, :metric_key, :scope, :limit)"
+            ),
+            {
+                "experiment_id": experiment_id,
+                "metric_key": metric_key,
+                "scope": scope,
+                "limit": limit,
+            },
+        ).all()
+        return [dict(row._mapping) for row in rows]
+
+    return cached_report(request, db, experiment.project_id, build)
 
 
 @router.get("/experiments/{experiment_id}/best-run")
 def experiment_best_run(
+    request: Request,
     experiment_id: uuid.UUID,
     metric_key: str = Query(..., example="accuracy"),
     scope: str = Query(..., example="val"),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
-) -> dict:
+) -> Response:
     experiment = db.get(Experiment, experiment_id)
     if not experiment:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Experiment not found")
     require_project_role(db, current_user.user_id, experiment.project_id, "viewer")
-    result = db.execute(
-        text(
-            "SELECT fn_best_run_id(:experiment_id, :metric_key, :scope) AS run_id"
-        ),
-        {
-            "experiment_id": experiment_id,
-            "metric_key": metric_key,
-            "scope": scope,
-        },
-    ).scalar()
-    if result is None:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="No runs found")
-    return {"run_id": result}
+
+    def build() -> dict:
+        result = db.scalar(
+            select(ExperimentMetricSummary.best_run_id)
+            .join(MetricDefinition, MetricDefinition.metric_id == ExperimentMetricSummary.metric_id)
+            .where(
+                ExperimentMetricSummary.experiment_id == experiment_id,
+                MetricDefinition.key == metric_key,
+                ExperimentMetricSummary.scope == scope,
+            )
+        )
+        if result is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="No runs found")
+        return {"run_id": result}
+
+    return cached_report(request, db, experiment.project_id, build)
+
+
+@router.get("/projects/{project_id}/best-runs")
+def project_best_runs(
+    request: Request,
+    project_id: uuid.UUID,
+    metric_key: str = Query(..., example="accuracy"),
+    scope: str | None = Query(None, example="val"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+) -> Response:
+    """Best run of every experiment in the project, read from experiment_metric_summary."""
+    require_project_role(db, current_user.user_id, project_id, "viewer")
+
+    def build() -> list[dict]:
+        query = (
+            select(
+                ExperimentMetricSummary.experiment_id,
+                Experiment.name.label("experiment_name"),
+                ExperimentMetricSummary.scope,
+                ExperimentMetricSummary.best_run_id.label("run_id"),
+                Run.run_name,
+                ExperimentMetricSummary.best_value.label("metric_value"),
+                ExperimentMetricSummary.sample_size,
+                ExperimentMetricSummary.updated_at,
+            )
+            .join(MetricDefinition, MetricDefinition.metric_id == ExperimentMetricSummary.metric_id)
+            .join(Experiment, Experiment.experiment_id == ExperimentMetricSummary.experiment_id)
+            .outerjoin(Run, Run.run_id == ExperimentMetricSummary.best_run_id)
+            .where(
+                ExperimentMetricSummary.project_id == project_id,
+                MetricDefinition.key == metric_key,
+            )
+            .order_by(Experiment.name, ExperimentMetricSummary.scope)
+        )
+        if scope:
+            query = query.where(ExperimentMetricSummary.scope == scope)
+        return [dict(row) for row in db.execute(query).mappings()]
+
+    return cached_report(request, db, project_id, build)
 
 
 @router.get("/projects/{project_id}/dashboard")
 def project_dashboard(
+    request: Request,
     project_id: uuid.UUID,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
-) -> dict:
+) -> Response:
     require_project_role(db, current_user.user_id, project_id, "viewer")
-    row = db.execute(
-        text("SELECT * FROM v_project_quality_dashboard WHERE project_id = :project_id"),
-        {"project_id": project_id},
-    ).mappings().first()
-    if not row:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND, detail="Project not found"
+
+    def build() -> dict:
+        row = db.execute(
+            text("SELECT * FROM v_project_quality_dashboard WHERE project_id = :project_id"),
+            {"project_id": project_id},
+        ).mappings().first()
+        if not row:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="Project not found"
+            )
+        return dict(row)
+
+    return cached_report(request, db, project_id, build)
+
+
+@router.get("/experiments/{experiment_id}/param-importance")
+def experiment_param_importance(
+    request: Request,
+    experiment_id: uuid.UUID,
+    metric_key: str = Query(..., example="accuracy"),
+    scope: str = Query("val", example="val"),
+    bins: int = Query(DEFAULT_BINS, ge=2, le=50, example=DEFAULT_BINS),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+) -> Response:
+    experiment = db.get(Experiment, experiment_id)
+    if not experiment:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Experiment not found")
+    require_project_role(db, current_user.user_id, experiment.project_id, "viewer")
+
+    def build() -> dict:
+        metric = db.scalar(select(MetricDefinition).where(MetricDefinition.key == metric_key))
+        if not metric:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Metric not found")
+        rows = db.execute(
+            text(
+                "SELECT DISTINCT ON (r.run_id) rc.params_json, rmv.value "
+                "FROM runs r "
+                "JOIN run_configs rc ON rc.run_id = r.run_id "
+                "JOIN run_metric_values rmv ON rmv.run_id = r.run_id "
+                "WHERE r.experiment_id = :experiment_id "
+                "AND rmv.metric_id = :metric_id AND rmv.scope = :scope "
+                "AND rmv.step IS NULL "
+                "ORDER BY r.run_id, rmv.recorded_at DESC"
+            ),
+            {"experiment_id": experiment_id, "metric_id": metric.metric_id, "scope": scope},
+        ).all()
+        return {
+            "experiment_id": experiment_id,
+            "metric_key": metric_key,
+            "scope": scope,
+            "goal": metric.goal,
+            "runs": len(rows),
+            "params": param_importance([(row[0], row[1]) for row in rows], bins=bins),
+        }
+
+    return cached_report(request, db, experiment.project_id, build)
+
+
+@router.get("/experiments/{experiment_id}/aggregate-curve")
+def experiment_aggregate_curve(
+    request: Request,
+    experiment_id: uuid.UUID,
+    metric_key: str = Query(..., example="loss"),
+    scope: str = Query("val", example="val"),
+    group_by: str | None = Query(None, example="optimizer"),
+    bucket_size: int | None = Query(None, ge=1, example=100),
+    from_step: int | None = Query(None, ge=0, example=0),
+    to_step: int | None = Query(None, ge=0, example=10000),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+) -> Response:
+    """Per-step mean, std, min, max and run count across the experiment's runs (e.g. seeds).
+
+    Each run first contributes its mean per step, or per `bucket_size` steps.
+    Runs with many steps therefore count once per bucket. `group_by` splits the
+    curves by a `params_json` key.
+    """
+    experiment = db.get(Experiment, experiment_id)
+    if not experiment:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Experiment not found")
+    require_project_role(db, current_user.user_id, experiment.project_id, "viewer")
+
+    def build() -> dict:
+        metric = db.scalar(select(MetricDefinition).where(MetricDefinition.key == metric_key))
+        if not metric:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Metric not found")
+        points = metric_points(
+            metric_key=metric_key, scope=scope, from_step=from_step, to_step=to_step
         )
-    return dict(row)
+        step = points.c.step
+        if bucket_size:
+            step = (step // bucket_size) * bucket_size
+        group = RunConfig.params_json[group_by].astext if group_by else null()
+        per_run = (
+            select(
+                group.label("group_value"),
+                points.c.run_id,
+                step.label("step"),
+                func.avg(points.c.value).label("value"),
+            )
+            .join(Run, Run.run_id == points.c.run_id)
+            .where(Run.experiment_id == experiment_id, points.c.step.is_not(None))
+            .group_by(group, points.c.run_id, step)
+        )
+        if group_by:
+            per_run = per_run.outerjoin(RunConfig, RunConfig.run_id == Run.run_id)
+        per_run = per_run.subquery("per_run")
+        rows = db.execute(
+            select(
+                per_run.c.group_value,
+                per_run.c.step,
+                func.avg(per_run.c.value).label("mean"),
+                func.stddev_samp(per_run.c.value).label("std"),
+                func.min(per_run.c.value).label("min"),
+                func.max(per_run.c.value).label("max"),
+                func.count().label("count"),
+            )
+            .group_by(per_run.c.group_value, per_run.c.step)
+            .order_by(per_run.c.group_value.nulls_last(), per_run.c.step)
+        ).all()
+
+        groups: dict[str | None, list[dict]] = {}
+        for row in rows:
+            groups.setdefault(row.group_value, []).append(
+                {
+                    "step": row.step,
+                    "mean": row.mean,
+                    "std": row.std,
+                    "min": row.min,
+                    "max": row.max,
+                    "count": row.count,
+                }
+            )
+        return {
+            "experiment_id": experiment_id,
+            "metric_key": metric_key,
+            "scope": scope,
+            "goal": metric.goal,
+            "group_by": group_by,
+            "bucket_size": bucket_size,
+            "groups": [{"value": value, "points": curve} for value, curve in groups.items()],
+        }
+
+    return cached_report(request, db, experiment.project_id, build)
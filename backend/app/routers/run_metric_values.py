@@ -1,17 +1,15 @@
 import uuid
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy import or_, select
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 
-from app.core.permissions import require_project_role
+from app.core.permissions import project_visible, require_project_role
 from app.core.security import get_current_user
+from app.core.streaming import ndjson_response, wants_ndjson
 from app.db.deps import get_db
 from app.models.models import (
     Experiment,
-    MLProject,
-    OrgMember,
-    ProjectMember,
     Run,
     RunMetricValue,
     User,
@@ -50,6 +48,7 @@ def create_run_metric_value(
 
 @router.get("", response_model=list[RunMetricValueRead])
 def list_run_metric_values(
+    request: Request,
     run_id: uuid.UUID | None = None,
     metric_id: uuid.UUID | None = None,
     scope: str | None = None,
@@ -58,26 +57,11 @@ def list_run_metric_values(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ) -> list[RunMetricValue]:
-    member_projects = select(ProjectMember.project_id).where(
-        ProjectMember.user_id == current_user.user_id,
-        ProjectMember.is_active.is_(True),
-    )
-    org_admin_orgs = select(OrgMember.org_id).where(
-        OrgMember.user_id == current_user.user_id,
-        OrgMember.is_active.is_(True),
-        OrgMember.role.in_(["owner", "admin"]),
-    )
     query = (
         select(RunMetricValue)
         .join(Run, Run.run_id == RunMetricValue.run_id)
         .join(Experiment, Experiment.experiment_id == Run.experiment_id)
-        .join(MLProject, MLProject.project_id == Experiment.project_id)
-        .where(
-            or_(
-                Experiment.project_id.in_(member_projects),
-                MLProject.org_id.in_(org_admin_orgs),
-            )
-        )
+        .where(project_visible(Experiment.project_id, current_user.user_id))
     )
     if run_id:
         query = query.where(RunMetricValue.run_id == run_id)
@@ -85,8 +69,15 @@ def list_run_metric_values(
         query = query.where(RunMetricValue.metric_id == metric_id)
     if scope:
         query = query.where(RunMetricValue.scope == scope)
+    query = query.limit(limit).offset(offset)
 
-    values = db.scalars(query.limit(limit).offset(offset)).all()
+    if wants_ndjson(request):
+        return ndjson_response(
+            query.with_only_columns(*RunMetricValue.__table__.columns),
+            RunMetricValueRead,
+            current_user.user_id,
+        )
+    values = db.scalars(query).all()
     return values
 
 
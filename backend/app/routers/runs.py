@@ -1,33 +1,131 @@
+import json
 import uuid
 from datetime import datetime
 
-from fastapi import APIRouter, Body, Depends, HTTPException, Query, status
-from sqlalchemy import insert, or_, select
+from fastapi import (
+    APIRouter,
+    BackgroundTasks,
+    Body,
+    Depends,
+    Header,
+    HTTPException,
+    Query,
+    Request,
+    status,
+)
+from fastapi.responses import StreamingResponse
+from sqlalchemy import bindparam, func, insert, not_, select
 from sqlalchemy.orm import Session
 
-from app.core.permissions import require_project_role
+from app.core.config import settings
+from app.core.metric_chunks import compact_run_in_background, ordered_metric_points
+from app.core.metric_stream import metric_events, metric_hub
+from app.core.permissions import project_visible, require_project_role
 from app.core.security import get_current_user
+from app.core.serialization import FastJSONResponse, model_columns, rows_response
 from app.db.deps import get_db
 from app.models.models import (
     Dataset,
     DatasetVersion,
     Experiment,
     MetricDefinition,
-    MLProject,
-    OrgMember,
-    ProjectMember,
     Run,
     RunConfig,
+    RunFinalMetrics,
     RunMetricValue,
     User,
 )
 from app.schemas.metrics import RunCompleteRequest, RunMetricValueCreate, RunMetricValueRead
+from app.schemas.enums import RunStatus
 from app.schemas.runs import RunCreate, RunRead, RunUpdate
 
 router = APIRouter(prefix="/runs", tags=["runs"])
 
+PARAM_PREFIX = "param."
+PARAM_RANGE_OPERATORS = {
+    "lt": "__lt__",
+    "lte": "__le__",
+    "gt": "__gt__",
+    "gte": "__ge__",
+}
+RUN_INCLUDES = {"final_metrics"}
+METRICS_CURSOR_HEADER = "X-Metrics-Cursor"
+
+
+def _parse_param_value(raw: str):
+    try:
+        return json.loads(raw)
+    except ValueError:
+        return raw
+
+
+def _parse_include(include: str | None) -> set[str]:
+    requested = {item.strip() for item in (include or "").split(",") if item.strip()}
+    unknown = requested - RUN_INCLUDES
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unsupported include: {', '.join(sorted(unknown))}",
+        )
+    return requested
+
+
+def _param_filters(query_params) -> list:
+    """Translate `param.<path>[.<op>]=<value>` query args into SQL filters.
+
+    eq/ne use JSONB containment, which the GIN jsonb_path_ops index serves.
+    lt/lte/gt/gte compare fn_jsonb_number() of the value, the same expression
+    as the numeric indexes in sql/run_config_params.sql.
+    """
+    filters = []
+    for name, raw in query_params.multi_items():
+        if not name.startswith(PARAM_PREFIX):
+            continue
+        path = name[len(PARAM_PREFIX) :].split(".")
+        operator = "eq"
+        if len(path) > 1 and (path[-1] in PARAM_RANGE_OPERATORS or path[-1] in {"eq", "ne"}):
+            operator = path.pop()
+        if not all(path):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Invalid param filter: {name}",
+            )
+
+        if operator in {"eq", "ne"}:
+            document = _parse_param_value(raw)
+            for key in reversed(path):
+                document = {key: document}
+            clause = RunConfig.params_json.contains(document)
+            filters.append(clause if operator == "eq" else not_(clause))
+            continue
+
+        try:
+            bound = float(raw)
+        except ValueError as exc:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"{name} requires a numeric value",
+            ) from exc
+        # Keys are rendered inline so the expression matches the index.
+        if len(path) == 1:
+            target = RunConfig.params_json.op("->")(
+                bindparam(None, path[0], literal_execute=True)
+            )
+        else:
+            target = RunConfig.params_json.op("#>")(
+                bindparam(None, "{" + ",".join(path) + "}", literal_execute=True)
+            )
+        number = func.fn_jsonb_number(target)
+        filters.append(getattr(number, PARAM_RANGE_OPERATORS[operator])(bound))
+    return filters
 
-@router.post("", response_model=RunRead, status_code=status.HTTP_201_CREATED)
+
+@router.post(
+    "",
+    response_model=RunRead,
+    response_model_exclude_unset=True,
+    status_code=status.HTTP_201_CREATED,
+)
 def create_run(
     run_in: RunCreate,
     db: Session = Depends(get_db),
@@ -70,44 +168,62 @@ def create_run(
     return run
 
 
-@router.get("", response_model=list[RunRead])
+@router.get("", response_model=list[RunRead], response_model_exclude_unset=True)
 def list_runs(
+    request: Request,
+    experiment_id: uuid.UUID | None = None,
+    project_id: uuid.UUID | None = None,
+    status_filter: RunStatus | None = Query(None, alias="status"),
+    include: str | None = Query(None, example="final_metrics"),
     limit: int = 100,
     offset: int = 0,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
-) -> list[Run]:
-    member_projects = select(ProjectMember.project_id).where(
-        ProjectMember.user_id == current_user.user_id,
-        ProjectMember.is_active.is_(True),
-    )
-    org_admin_orgs = select(OrgMember.org_id).where(
-        OrgMember.user_id == current_user.user_id,
-        OrgMember.is_active.is_(True),
-        OrgMember.role.in_(["owner", "admin"]),
-    )
-    runs = db.scalars(
-        select(Run)
+) -> FastJSONResponse:
+    """List runs visible to the user.
+
+    Hyperparameter filters are read from `param.*` query args, e.g.
+    `?param.lr.lt=0.001&param.optimizer=adam`. Supported suffixes are
+    `.eq` (default), `.ne`, `.lt`, `.lte`, `.gt` and `.gte`. Nested keys
+    use dots: `param.optimizer.name=adam`.
+
+    `include=final_metrics` adds each run's final metrics as a
+    `{metric_key: value}` object, read from the run_final_metrics table.
+    Like every run endpoint, the key is omitted unless it is requested, and
+    is null for runs without final metrics.
+    """
+    includes = _parse_include(include)
+    param_filters = _param_filters(request.query_params)
+    query = (
+        select(*model_columns(RunRead, Run.__table__))
         .join(Experiment, Experiment.experiment_id == Run.experiment_id)
-        .join(MLProject, MLProject.project_id == Experiment.project_id)
-        .where(
-            or_(
-                Experiment.project_id.in_(member_projects),
-                MLProject.org_id.in_(org_admin_orgs),
-            )
+        .where(project_visible(Experiment.project_id, current_user.user_id))
+    )
+    if experiment_id:
+        query = query.where(Run.experiment_id == experiment_id)
+    if project_id:
+        query = query.where(Experiment.project_id == project_id)
+    if status_filter:
+        query = query.where(Run.status == status_filter)
+    if param_filters:
+        query = query.join(RunConfig, RunConfig.run_id == Run.run_id).where(*param_filters)
+    if "final_metrics" in includes:
+        query = query.outerjoin(RunFinalMetrics, RunFinalMetrics.run_id == Run.run_id).add_columns(
+            RunFinalMetrics.metrics.label("final_metrics")
         )
-        .limit(limit)
-        .offset(offset)
-    ).all()
-    return runs
 
+    rows = db.execute(query.limit(limit).offset(offset)).mappings()
+    return rows_response(rows)
 
-@router.get("/{run_id}", response_model=RunRead)
+
+@router.get("/{run_id}", response_model=RunRead, response_model_exclude_unset=True)
 def get_run(
     run_id: uuid.UUID,
+    include: str | None = Query(None, example="final_metrics"),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
-) -> Run:
+) -> Run | dict:
+    includes = _parse_include(include)
     run = db.get(Run, run_id)
     if not run:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Run not found")
@@ -117,10 +233,18 @@ def get_run(
             status_code=status.HTTP_404_NOT_FOUND, detail="Experiment not found"
         )
     require_project_role(db, current_user.user_id, experiment.project_id, "viewer")
+    if "final_metrics" in includes:
+        final_metrics = db.scalar(
+            select(RunFinalMetrics.metrics).where(RunFinalMetrics.run_id == run_id)
+        )
+        return {
+            **RunRead.model_validate(run).model_dump(exclude_unset=True),
+            "final_metrics": final_metrics,
+        }
     return run
 
 
-@router.put("/{run_id}", response_model=RunRead)
+@router.put("/{run_id}", response_model=RunRead, response_model_exclude_unset=True)
 def update_run(
     run_id: uuid.UUID,
     run_in: RunUpdate,
@@ -185,7 +309,7 @@ def add_run_metrics(
     ),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
-) -> list[RunMetricValue]:
+) -> FastJSONResponse:
     run = db.get(Run, run_id)
     if not run:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Run not found")
@@ -232,11 +356,10 @@ def add_run_metrics(
     if values:
         db.execute(insert(RunMetricValue), values)
         db.commit()
+        metric_hub.publish(run_id)
 
-    result = db.scalars(
-        select(RunMetricValue).where(RunMetricValue.run_id == run_id)
-    ).all()
-    return result
+    rows = db.execute(ordered_metric_points(run_id=run_id)).mappings()
+    return rows_response(rows)
 
 
 @router.get("/{run_id}/metrics", response_model=list[RunMetricValueRead])
@@ -246,9 +369,15 @@ def get_run_metrics(
     scope: str | None = Query(None, example="val"),
     from_step: int | None = Query(None, ge=0, example=0),
     to_step: int | None = Query(None, ge=0, example=50),
+    since: int | None = Query(None, ge=0, example=0),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
-) -> list[RunMetricValue]:
+) -> FastJSONResponse:
+    """Metric points of the run, ordered by metric, scope and step.
+
+    The X-Metrics-Cursor header holds the newest ingest_seq returned. Pass it
+    back as `since` to get only the points ingested after this response.
+    """
     run = db.get(Run, run_id)
     if not run:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Run not found")
@@ -259,23 +388,58 @@ def get_run_metrics(
         )
     require_project_role(db, current_user.user_id, experiment.project_id, "viewer")
 
-    query = select(RunMetricValue).where(RunMetricValue.run_id == run_id)
-    if metric_key:
-        query = query.join(MetricDefinition).where(MetricDefinition.key == metric_key)
-    if scope:
-        query = query.where(RunMetricValue.scope == scope)
-    if from_step is not None:
-        query = query.where(RunMetricValue.step >= from_step)
-    if to_step is not None:
-        query = query.where(RunMetricValue.step <= to_step)
+    query = ordered_metric_points(
+        run_id=run_id,
+        metric_key=metric_key,
+        scope=scope,
+        from_step=from_step,
+        to_step=to_step,
+        since=since,
+    )
+    rows = [dict(row) for row in db.execute(query).mappings()]
+    cursor = max(
+        (row["ingest_seq"] for row in rows if row["ingest_seq"] is not None),
+        default=since or 0,
+    )
+    return FastJSONResponse(rows, headers={METRICS_CURSOR_HEADER: str(cursor)})
+
+
+@router.get("/{run_id}/metrics/stream")
+def stream_run_metrics(
+    run_id: uuid.UUID,
+    since: int | None = Query(None, ge=0, example=0),
+    last_event_id: int | None = Header(None, alias="Last-Event-ID", ge=0),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+) -> StreamingResponse:
+    """Server-Sent Events with the run's new metric points.
+
+    Without `since` only points logged after connecting are sent. `since=0`
+    replays the history first. Reconnecting clients resume from Last-Event-ID.
+    """
+    run = db.get(Run, run_id)
+    if not run:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Run not found")
+    experiment = db.get(Experiment, run.experiment_id)
+    if not experiment:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Experiment not found"
+        )
+    require_project_role(db, current_user.user_id, experiment.project_id, "viewer")
 
-    return db.scalars(query).all()
+    cursor = last_event_id if last_event_id is not None else since
+    return StreamingResponse(
+        metric_events(run_id, cursor),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 
-@router.post("/{run_id}/complete", response_model=RunRead)
+@router.post("/{run_id}/complete", response_model=RunRead, response_model_exclude_unset=True)
 def complete_run(
     run_id: uuid.UUID,
     payload: RunCompleteRequest,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ) -> Run:
@@ -308,5 +472,8 @@ def complete_run(
     else:
         db.commit()
 
+    if settings.metric_compaction_enabled and payload.status != "running":
+        background_tasks.add_task(compact_run_in_background, run_id)
+
     db.refresh(run)
     return run
@@ -1,4 +1,10 @@
-from app.schemas.artifacts import ArtifactCreate, ArtifactRead, ArtifactUpdate
+from app.schemas.artifacts import (
+    ArtifactCreate,
+    ArtifactRead,
+    ArtifactUpdate,
+    ArtifactUploadCreate,
+    ArtifactUploadRead,
+)
 from app.schemas.audit import AuditLogCreate, AuditLogRead, AuditLogUpdate
 from app.schemas.auth import AuthLogin, AuthRegister, AuthSession, Token
 from app.schemas.batch_import import (
@@ -59,6 +65,8 @@ __all__ = [
     "ArtifactCreate",
     "ArtifactRead",
     "ArtifactUpdate",
+    "ArtifactUploadCreate",
+    "ArtifactUploadRead",
     "AuditLogCreate",
     "AuditLogRead",
     "AuditLogUpdate",
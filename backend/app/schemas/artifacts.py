@@ -1,7 +1,7 @@
 import uuid
 from datetime import datetime
 
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, Field
 
 from app.schemas.base import ORMBase
 from app.schemas.enums import ArtifactType
@@ -43,6 +43,36 @@ class ArtifactUpdate(BaseModel):
     )
 
 
+class ArtifactUploadCreate(BaseModel):
+    project_id: uuid.UUID
+    artifact_type: ArtifactType
+    size_bytes: int | None = Field(None, ge=0)
+    checksum: str | None = Field(None, pattern=r"^sha256:[0-9a-f]{64}$")
+    model_config = ConfigDict(
+        json_schema_extra={
+            "example": {
+                "project_id": "b7c5f1b2-6f2c-4b58-9c19-2c8d9a7b3c11",
+                "artifact_type": "model",
+                "size_bytes": 12345678,
+                "checksum": "sha256:" + "ab" * 32,
+            }
+        }
+    )
+
+
+class ArtifactUploadRead(BaseModel):
+    upload_id: uuid.UUID
+    project_id: uuid.UUID
+    artifact_type: ArtifactType
+    size_bytes: int | None
+    checksum: str | None
+    offset: int
+    # True when the project already stores content with the declared checksum;
+    # the client can then complete the upload without sending any bytes.
+    blob_exists: bool
+    created_at: datetime
+
+
 class ArtifactRead(ORMBase):
     artifact_id: uuid.UUID
     project_id: uuid.UUID
@@ -12,6 +12,16 @@ MetricScope = Literal["train", "val", "test"]
 
 ArtifactType = Literal["model", "plot", "log", "report", "dataset-sample", "other"]
 
-BatchJobType = Literal["users", "datasets", "runs", "metrics", "artifacts"]
+BatchJobType = Literal[
+    "users",
+    "datasets",
+    "experiments",
+    "runs",
+    "run_configs",
+    "metrics",
+    "artifacts",
+    "dataset_profile",
+]
 BatchJobStatus = Literal["created", "running", "finished", "failed"]
-SourceFormat = Literal["csv", "json"]
+SourceFormat = Literal["csv", "json", "parquet"]
+ExportFormat = Literal["csv", "ndjson", "parquet"]
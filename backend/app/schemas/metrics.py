@@ -69,13 +69,16 @@ class RunMetricValueCreate(BaseModel):
 
 
 class RunMetricValueRead(ORMBase):
-    run_metric_value_id: uuid.UUID
+    # None for points served from compacted run_metric_chunks.
+    run_metric_value_id: uuid.UUID | None
     run_id: uuid.UUID
     metric_id: uuid.UUID
     scope: MetricScope
     step: int | None
     value: float
     recorded_at: datetime
+    # Ingestion order, the `since` cursor. NULL for points logged before it existed.
+    ingest_seq: int | None = None
 
 
 class RunCompleteRequest(BaseModel):
@@ -0,0 +1,47 @@
+from datetime import datetime
+
+from pydantic import BaseModel, computed_field
+
+from app.core.query_plans import plan_nodes
+from app.schemas.base import ORMBase
+
+
+class QueryPlanRead(ORMBase):
+    statement_hash: str
+    statement: str
+    calls: int
+    total_ms: float
+    max_ms: float
+    last_ms: float | None
+    plan_hash: str | None
+    first_seen_at: datetime
+    last_seen_at: datetime
+    plan_changed_at: datetime | None
+    baseline_plan_hash: str | None
+    baseline_mean_ms: float | None
+    baseline_at: datetime | None
+
+    @computed_field
+    @property
+    def mean_ms(self) -> float | None:
+        return self.total_ms / self.calls if self.calls else None
+
+
+class QueryPlanDetail(QueryPlanRead):
+    plan: dict | None
+    params: dict | list | None
+
+    @computed_field
+    @property
+    def nodes(self) -> list[str]:
+        return plan_nodes(self.plan["Plan"]) if self.plan else []
+
+
+class QueryPlanChange(QueryPlanRead):
+    reasons: list[str]
+    slowdown: float | None
+
+
+class QueryPlanBaseline(BaseModel):
+    statements: int
+    baseline_at: datetime
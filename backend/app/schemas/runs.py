@@ -95,3 +95,6 @@ class RunRead(ORMBase):
     created_by: uuid.UUID | None
     git_commit: str | None
     notes: str | None
+    # Only present when requested with `include=final_metrics` (null if the run
+    # has none). Endpoints returning RunRead use response_model_exclude_unset.
+    final_metrics: dict[str, float] | None = None
@@ -0,0 +1,31 @@
+"""hyperparameter search indexes on run_configs.params_json
+
+Revision ID: 0003_run_config_params
+Revises: 0002_perf_indexes
+Create Date: 2025-01-03 00:00:00.000000
+"""
+from pathlib import Path
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "0003_run_config_params"
+down_revision = "0002_perf_indexes"
+branch_labels = None
+depends_on = None
+
+
+SQL_DIR = Path(__file__).resolve().parents[2] / "sql"
+
+
+def upgrade() -> None:
+    op.execute((SQL_DIR / "run_config_params.sql").read_text(encoding="utf-8"))
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_run_configs_param_epochs")
+    op.execute("DROP INDEX IF EXISTS ix_run_configs_param_batch_size")
+    op.execute("DROP INDEX IF EXISTS ix_run_configs_param_lr")
+    op.execute("DROP INDEX IF EXISTS ix_run_configs_params_path")
+    op.execute("DROP FUNCTION IF EXISTS fn_jsonb_number(jsonb)")
@@ -0,0 +1,52 @@
+"""array-backed storage tier for compacted metric series
+
+Revision ID: 0004_run_metric_chunks
+Revises: 0003_run_config_params
+Create Date: 2025-01-04 00:00:00.000000
+"""
+from pathlib import Path
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = "0004_run_metric_chunks"
+down_revision = "0003_run_config_params"
+branch_labels = None
+depends_on = None
+
+
+SQL_DIR = Path(__file__).resolve().parents[2] / "sql"
+
+
+def upgrade() -> None:
+    op.create_table(
+        "run_metric_chunks",
+        sa.Column("chunk_id", sa.BigInteger(), primary_key=True, autoincrement=True),
+        sa.Column("run_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("runs.run_id", ondelete="CASCADE"), nullable=False),
+        sa.Column("metric_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("metric_definitions.metric_id", ondelete="CASCADE"), nullable=False),
+        sa.Column("scope", sa.Text(), nullable=False),
+        sa.Column("step_start", sa.Integer(), nullable=False),
+        sa.Column("step_end", sa.Integer(), nullable=False),
+        sa.Column("point_count", sa.Integer(), nullable=False),
+        sa.Column("steps", postgresql.ARRAY(sa.Integer()), nullable=False),
+        sa.Column("values", postgresql.ARRAY(sa.Float()), nullable=False),
+        sa.Column("recorded_at", postgresql.ARRAY(sa.DateTime(timezone=True)), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.CheckConstraint("scope IN ('train','val','test')", name="ck_rmc_scope"),
+        sa.CheckConstraint("step_start <= step_end", name="ck_rmc_step_range"),
+    )
+    op.create_index(
+        "ix_rmc_run_metric_scope_step",
+        "run_metric_chunks",
+        ["run_id", "metric_id", "scope", "step_start"],
+    )
+    op.execute((SQL_DIR / "run_metric_chunks.sql").read_text(encoding="utf-8"))
+
+
+def downgrade() -> None:
+    op.execute("DROP FUNCTION IF EXISTS fn_compact_run_metrics(uuid, integer)")
+    op.drop_index("ix_rmc_run_metric_scope_step", table_name="run_metric_chunks")
+    op.drop_table("run_metric_chunks")
@@ -0,0 +1,51 @@
+"""maintained final-metric pivot per run
+
+Revision ID: 0005_run_final_metrics
+Revises: 0004_run_metric_chunks
+Create Date: 2025-01-05 00:00:00.000000
+"""
+from pathlib import Path
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = "0005_run_final_metrics"
+down_revision = "0004_run_metric_chunks"
+branch_labels = None
+depends_on = None
+
+
+SQL_DIR = Path(__file__).resolve().parents[2] / "sql"
+
+
+def upgrade() -> None:
+    op.create_table(
+        "run_final_metrics",
+        sa.Column("run_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("runs.run_id", ondelete="CASCADE"), primary_key=True),
+        sa.Column("metrics", postgresql.JSONB(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+    )
+    op.execute((SQL_DIR / "run_final_metrics.sql").read_text(encoding="utf-8"))
+    op.execute(
+        """
+        SELECT fn_refresh_run_final_metrics(ARRAY(
+            SELECT DISTINCT run_id FROM run_metric_values WHERE step IS NULL
+        ))
+        """
+    )
+
+
+def downgrade() -> None:
+    # Restore the aggregating view before its source table goes away.
+    op.execute((SQL_DIR / "views.sql").read_text(encoding="utf-8"))
+    op.execute("DROP TRIGGER IF EXISTS trg_run_final_metrics_key_renamed ON metric_definitions")
+    op.execute("DROP TRIGGER IF EXISTS trg_run_final_metrics_delete ON run_metric_values")
+    op.execute("DROP TRIGGER IF EXISTS trg_run_final_metrics_update ON run_metric_values")
+    op.execute("DROP TRIGGER IF EXISTS trg_run_final_metrics_insert ON run_metric_values")
+    op.execute("DROP FUNCTION IF EXISTS fn_run_final_metrics_key_renamed()")
+    op.execute("DROP FUNCTION IF EXISTS fn_run_final_metrics_changed()")
+    op.execute("DROP FUNCTION IF EXISTS fn_refresh_run_final_metrics(uuid[])")
+    op.drop_table("run_final_metrics")
@@ -0,0 +1,62 @@
+"""per-experiment best run summary for any metric
+
+Revision ID: 0006_experiment_metric_summary
+Revises: 0005_run_final_metrics
+Create Date: 2025-01-06 00:00:00.000000
+"""
+from pathlib import Path
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = "0006_experiment_metric_summary"
+down_revision = "0005_run_final_metrics"
+branch_labels = None
+depends_on = None
+
+
+SQL_DIR = Path(__file__).resolve().parents[2] / "sql"
+
+
+def upgrade() -> None:
+    op.create_table(
+        "experiment_metric_summary",
+        sa.Column("experiment_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("experiments.experiment_id", ondelete="CASCADE"), primary_key=True),
+        sa.Column("metric_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("metric_definitions.metric_id", ondelete="CASCADE"), primary_key=True),
+        sa.Column("scope", sa.Text(), primary_key=True),
+        sa.Column("project_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("ml_projects.project_id", ondelete="CASCADE"), nullable=False),
+        sa.Column("best_value", sa.Float()),
+        sa.Column("best_run_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("runs.run_id", ondelete="SET NULL")),
+        sa.Column("best_recorded_at", sa.DateTime(timezone=True)),
+        sa.Column("sample_size", sa.Integer(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.CheckConstraint("scope IN ('train','val','test')", name="ck_ems_scope"),
+    )
+    op.create_index(
+        "ix_ems_project_metric_scope",
+        "experiment_metric_summary",
+        ["project_id", "metric_id", "scope"],
+    )
+    op.execute((SQL_DIR / "experiment_metric_summary.sql").read_text(encoding="utf-8"))
+    op.execute(
+        """
+        SELECT fn_refresh_experiment_metric_summary(g.experiment_id, g.metric_id, g.scope)
+        FROM (
+            SELECT DISTINCT r.experiment_id, rmv.metric_id, rmv.scope
+            FROM run_metric_values rmv
+            JOIN runs r ON r.run_id = rmv.run_id
+            WHERE rmv.step IS NULL
+        ) g
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS trg_experiment_metric_summary ON run_metric_values")
+    op.execute("DROP FUNCTION IF EXISTS fn_update_experiment_metric_summary()")
+    op.execute("DROP FUNCTION IF EXISTS fn_refresh_experiment_metric_summary(uuid, uuid, text)")
+    op.drop_index("ix_ems_project_metric_scope", table_name="experiment_metric_summary")
+    op.drop_table("experiment_metric_summary")
@@ -0,0 +1,64 @@
+"""per-project data version counter for report caching
+
+Revision ID: 0007_project_data_versions
+Revises: 0006_experiment_metric_summary
+Create Date: 2025-01-07 00:00:00.000000
+"""
+from pathlib import Path
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = "0007_project_data_versions"
+down_revision = "0006_experiment_metric_summary"
+branch_labels = None
+depends_on = None
+
+
+SQL_DIR = Path(__file__).resolve().parents[2] / "sql"
+
+TRIGGERS = {
+    "experiments": ["insert", "update", "delete"],
+    "runs": ["insert", "update", "delete"],
+    "run_metric_values": ["insert", "update", "delete"],
+    "run_configs": ["insert", "update"],
+}
+TRIGGER_PREFIXES = {
+    "experiments": "trg_experiments",
+    "runs": "trg_runs",
+    "run_metric_values": "trg_rmv",
+    "run_configs": "trg_run_configs",
+}
+
+
+def upgrade() -> None:
+    op.create_table(
+        "project_data_versions",
+        sa.Column("project_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("ml_projects.project_id", ondelete="CASCADE"), primary_key=True),
+        sa.Column("version", sa.BigInteger(), nullable=False, server_default=sa.text("1")),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+    )
+    op.execute((SQL_DIR / "project_data_versions.sql").read_text(encoding="utf-8"))
+
+
+def downgrade() -> None:
+    for table, events in TRIGGERS.items():
+        for event in events:
+            op.execute(
+                f"DROP TRIGGER IF EXISTS {TRIGGER_PREFIXES[table]}_data_version_{event} ON {table}"
+            )
+    # The current SQL file also installs the 0019 triggers on fresh databases.
+    op.execute(
+        "DROP TRIGGER IF EXISTS trg_metric_definitions_data_version_update ON metric_definitions"
+    )
+    op.execute("DROP TRIGGER IF EXISTS trg_ml_projects_data_version_update ON ml_projects")
+    op.execute("DROP FUNCTION IF EXISTS fn_metric_definitions_data_version()")
+    op.execute("DROP FUNCTION IF EXISTS fn_ml_projects_data_version()")
+    op.execute("DROP FUNCTION IF EXISTS fn_run_children_data_version()")
+    op.execute("DROP FUNCTION IF EXISTS fn_runs_data_version()")
+    op.execute("DROP FUNCTION IF EXISTS fn_experiments_data_version()")
+    op.execute("DROP FUNCTION IF EXISTS fn_bump_project_data_version(uuid[])")
+    op.drop_table("project_data_versions")
@@ -0,0 +1,45 @@
+"""dataset_profile batch job type and parquet sources
+
+Revision ID: 0008_dataset_profile_jobs
+Revises: 0007_project_data_versions
+Create Date: 2025-01-08 00:00:00.000000
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "0008_dataset_profile_jobs"
+down_revision = "0007_project_data_versions"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.drop_constraint("ck_jobs_type", "batch_import_jobs", type_="check")
+    op.create_check_constraint(
+        "ck_jobs_type",
+        "batch_import_jobs",
+        "job_type IN ('users','datasets','runs','metrics','artifacts','dataset_profile')",
+    )
+    op.drop_constraint("ck_jobs_format", "batch_import_jobs", type_="check")
+    op.create_check_constraint(
+        "ck_jobs_format",
+        "batch_import_jobs",
+        "source_format IN ('csv','json','parquet')",
+    )
+
+
+def downgrade() -> None:
+    op.execute("DELETE FROM batch_import_jobs WHERE job_type = 'dataset_profile'")
+    op.drop_constraint("ck_jobs_format", "batch_import_jobs", type_="check")
+    op.create_check_constraint(
+        "ck_jobs_format",
+        "batch_import_jobs",
+        "source_format IN ('csv','json')",
+    )
+    op.drop_constraint("ck_jobs_type", "batch_import_jobs", type_="check")
+    op.create_check_constraint(
+        "ck_jobs_type",
+        "batch_import_jobs",
+        "job_type IN ('users','datasets','runs','metrics','artifacts')",
+    )
@@ -0,0 +1,36 @@
+"""resumable uploads for the content-addressed artifact store
+
+Revision ID: 0009_artifact_uploads
+Revises: 0008_dataset_profile_jobs
+Create Date: 2025-01-09 00:00:00.000000
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = "0009_artifact_uploads"
+down_revision = "0008_dataset_profile_jobs"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "artifact_uploads",
+        sa.Column("upload_id", postgresql.UUID(as_uuid=True), primary_key=True, server_default=sa.text("gen_random_uuid()")),
+        sa.Column("project_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("ml_projects.project_id", ondelete="CASCADE"), nullable=False),
+        sa.Column("artifact_type", sa.Text(), nullable=False),
+        sa.Column("size_bytes", sa.BigInteger(), nullable=True),
+        sa.Column("checksum", sa.Text(), nullable=True),
+        sa.Column("created_by", postgresql.UUID(as_uuid=True), sa.ForeignKey("users.user_id"), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.CheckConstraint("size_bytes IS NULL OR size_bytes >= 0", name="ck_artifact_uploads_size"),
+    )
+    op.create_index("ix_artifacts_project_checksum", "artifacts", ["project_id", "checksum"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_artifacts_project_checksum", table_name="artifacts")
+    op.drop_table("artifact_uploads")
@@ -0,0 +1,48 @@
+"""materialized user -> project access table
+
+Revision ID: 0010_user_project_access
+Revises: 0009_artifact_uploads
+Create Date: 2025-01-10 00:00:00.000000
+"""
+from pathlib import Path
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = "0010_user_project_access"
+down_revision = "0009_artifact_uploads"
+branch_labels = None
+depends_on = None
+
+
+SQL_DIR = Path(__file__).resolve().parents[2] / "sql"
+
+
+def upgrade() -> None:
+    op.create_table(
+        "user_project_access",
+        sa.Column("user_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("users.user_id", ondelete="CASCADE"), primary_key=True),
+        sa.Column("project_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("ml_projects.project_id", ondelete="CASCADE"), primary_key=True),
+        sa.Column("role", sa.Text(), nullable=False),
+        sa.CheckConstraint("role IN ('admin','editor','viewer')", name="ck_upa_role"),
+    )
+    op.create_index("ix_upa_project_id", "user_project_access", ["project_id"])
+    op.execute((SQL_DIR / "user_project_access.sql").read_text(encoding="utf-8"))
+    op.execute("SELECT fn_rebuild_user_project_access()")
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS trg_ml_projects_access_update ON ml_projects")
+    op.execute("DROP TRIGGER IF EXISTS trg_ml_projects_access_insert ON ml_projects")
+    op.execute("DROP TRIGGER IF EXISTS trg_org_members_access ON org_members")
+    op.execute("DROP TRIGGER IF EXISTS trg_project_members_access ON project_members")
+    op.execute("DROP FUNCTION IF EXISTS fn_ml_projects_access()")
+    op.execute("DROP FUNCTION IF EXISTS fn_org_members_access()")
+    op.execute("DROP FUNCTION IF EXISTS fn_project_members_access()")
+    op.execute("DROP FUNCTION IF EXISTS fn_rebuild_user_project_access()")
+    op.execute("DROP FUNCTION IF EXISTS fn_refresh_user_project_access(uuid, uuid)")
+    op.drop_index("ix_upa_project_id", table_name="user_project_access")
+    op.drop_table("user_project_access")
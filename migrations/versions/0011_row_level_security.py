@@ -0,0 +1,54 @@
+"""optional row-level security policies
+
+Revision ID: 0011_row_level_security
+Revises: 0010_user_project_access
+Create Date: 2025-01-11 00:00:00.000000
+"""
+from pathlib import Path
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "0011_row_level_security"
+down_revision = "0010_user_project_access"
+branch_labels = None
+depends_on = None
+
+
+SQL_DIR = Path(__file__).resolve().parents[2] / "sql"
+
+# 0011 runs the current sql/row_level_security.sql, which also covers the
+# tables added to RLS in 0018. Their policies are dropped here as well.
+RLS_POLICIES = {
+    "dataset_versions": "rls_dataset_versions_access",
+    "project_metric_summary": "rls_project_metric_summary_access",
+    "experiment_metric_summary": "rls_experiment_metric_summary_access",
+    "run_artifacts": "rls_run_artifacts_access",
+    "run_configs": "rls_run_configs_access",
+    "run_final_metrics": "rls_run_final_metrics_access",
+    "run_metric_chunks": "rls_run_metric_chunks_access",
+    "run_metric_values": "rls_run_metric_values_access",
+    "runs": "rls_runs_access",
+    "artifacts": "rls_artifacts_access",
+    "datasets": "rls_datasets_access",
+    "experiments": "rls_experiments_access",
+    "ml_projects": "rls_ml_projects_access",
+}
+
+
+def upgrade() -> None:
+    op.execute((SQL_DIR / "row_level_security.sql").read_text(encoding="utf-8"))
+
+
+def downgrade() -> None:
+    for table, policy in RLS_POLICIES.items():
+        op.execute(f"DROP POLICY IF EXISTS {policy} ON {table}")
+        op.execute(f"ALTER TABLE {table} DISABLE ROW LEVEL SECURITY")
+    op.execute("ALTER FUNCTION fn_ml_projects_access() SECURITY INVOKER RESET search_path")
+    op.execute("ALTER FUNCTION fn_org_members_access() SECURITY INVOKER RESET search_path")
+    op.execute(
+        "ALTER FUNCTION fn_refresh_user_project_access(uuid, uuid) SECURITY INVOKER RESET search_path"
+    )
+    op.execute("DROP FUNCTION IF EXISTS fn_rls_bypass()")
+    op.execute("DROP FUNCTION IF EXISTS fn_rls_user_id()")
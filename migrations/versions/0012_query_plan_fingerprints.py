@@ -0,0 +1,41 @@
+"""slow query plan fingerprints
+
+Revision ID: 0012_query_plan_fingerprints
+Revises: 0011_row_level_security
+Create Date: 2025-01-12 00:00:00.000000
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = "0012_query_plan_fingerprints"
+down_revision = "0011_row_level_security"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "query_plan_fingerprints",
+        sa.Column("statement_hash", sa.Text(), primary_key=True),
+        sa.Column("statement", sa.Text(), nullable=False),
+        sa.Column("calls", sa.BigInteger(), nullable=False, server_default=sa.text("0")),
+        sa.Column("total_ms", sa.Float(), nullable=False, server_default=sa.text("0")),
+        sa.Column("max_ms", sa.Float(), nullable=False, server_default=sa.text("0")),
+        sa.Column("last_ms", sa.Float()),
+        sa.Column("plan_hash", sa.Text()),
+        sa.Column("plan", postgresql.JSONB()),
+        sa.Column("params", postgresql.JSONB()),
+        sa.Column("first_seen_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+        sa.Column("last_seen_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+        sa.Column("plan_changed_at", sa.DateTime(timezone=True)),
+        sa.Column("baseline_plan_hash", sa.Text()),
+        sa.Column("baseline_mean_ms", sa.Float()),
+        sa.Column("baseline_at", sa.DateTime(timezone=True)),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("query_plan_fingerprints")
@@ -0,0 +1,34 @@
+"""ingestion sequence and notifications for live metric streaming
+
+Revision ID: 0013_metric_ingest_seq
+Revises: 0012_query_plan_fingerprints
+Create Date: 2025-01-13 00:00:00.000000
+"""
+from pathlib import Path
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0013_metric_ingest_seq"
+down_revision = "0012_query_plan_fingerprints"
+branch_labels = None
+depends_on = None
+
+
+SQL_DIR = Path(__file__).resolve().parents[2] / "sql"
+
+
+def upgrade() -> None:
+    # Nullable without a default first, so existing rows are not rewritten.
+    op.add_column("run_metric_values", sa.Column("ingest_seq", sa.BigInteger()))
+    op.execute((SQL_DIR / "metric_stream.sql").read_text(encoding="utf-8"))
+    op.create_index("ix_rmv_run_ingest_seq", "run_metric_values", ["run_id", "ingest_seq"])
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS trg_run_metric_values_notify ON run_metric_values")
+    op.execute("DROP FUNCTION IF EXISTS fn_notify_run_metric_values()")
+    op.drop_index("ix_rmv_run_ingest_seq", table_name="run_metric_values")
+    op.drop_column("run_metric_values", "ingest_seq")
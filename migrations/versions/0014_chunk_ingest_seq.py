@@ -0,0 +1,102 @@
+"""ingest_seq range on compacted metric chunks
+
+Revision ID: 0014_chunk_ingest_seq
+Revises: 0013_metric_ingest_seq
+Create Date: 2025-01-14 00:00:00.000000
+"""
+from pathlib import Path
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0014_chunk_ingest_seq"
+down_revision = "0013_metric_ingest_seq"
+branch_labels = None
+depends_on = None
+
+
+SQL_DIR = Path(__file__).resolve().parents[2] / "sql"
+
+# fn_compact_run_metrics as of 0004, without max_ingest_seq.
+PREVIOUS_COMPACT_SQL = """
+CREATE OR REPLACE FUNCTION fn_compact_run_metrics(
+    p_run_id uuid,
+    p_chunk_size integer DEFAULT 1000
+) RETURNS integer AS $$
+DECLARE
+    v_points integer;
+BEGIN
+    IF NOT EXISTS (
+        SELECT 1
+        FROM runs
+        WHERE run_id = p_run_id
+          AND status IN ('finished','failed','killed')
+    ) THEN
+        RETURN 0;
+    END IF;
+
+    WITH moved AS (
+        DELETE FROM run_metric_values
+        WHERE run_id = p_run_id
+          AND step IS NOT NULL
+        RETURNING metric_id, scope, step, value, recorded_at
+    ),
+    numbered AS (
+        SELECT
+            metric_id,
+            scope,
+            step,
+            value,
+            recorded_at,
+            (ROW_NUMBER() OVER (
+                PARTITION BY metric_id, scope
+                ORDER BY step, recorded_at
+            ) - 1) / p_chunk_size AS chunk_no
+        FROM moved
+    ),
+    inserted AS (
+        INSERT INTO run_metric_chunks (
+            run_id,
+            metric_id,
+            scope,
+            step_start,
+            step_end,
+            point_count,
+            steps,
+            "values",
+            recorded_at
+        )
+        SELECT
+            p_run_id,
+            metric_id,
+            scope,
+            MIN(step),
+            MAX(step),
+            COUNT(*),
+            array_agg(step ORDER BY step, recorded_at),
+            array_agg(value ORDER BY step, recorded_at),
+            array_agg(recorded_at ORDER BY step, recorded_at)
+        FROM numbered
+        GROUP BY metric_id, scope, chunk_no
+        RETURNING point_count
+    )
+    SELECT COALESCE(SUM(point_count), 0)
+    INTO v_points
+    FROM inserted;
+
+    RETURN v_points;
+END;
+$$ LANGUAGE plpgsql;
+"""
+
+
+def upgrade() -> None:
+    op.add_column("run_metric_chunks", sa.Column("max_ingest_seq", sa.BigInteger()))
+    op.execute((SQL_DIR / "run_metric_chunks.sql").read_text(encoding="utf-8"))
+
+
+def downgrade() -> None:
+    op.execute(PREVIOUS_COMPACT_SQL)
+    op.drop_column("run_metric_chunks", "max_ingest_seq")
@@ -0,0 +1,34 @@
+"""experiments and run_configs batch job types
+
+Revision ID: 0015_entity_import_jobs
+Revises: 0014_chunk_ingest_seq
+Create Date: 2025-01-15 00:00:00.000000
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "0015_entity_import_jobs"
+down_revision = "0014_chunk_ingest_seq"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.drop_constraint("ck_jobs_type", "batch_import_jobs", type_="check")
+    op.create_check_constraint(
+        "ck_jobs_type",
+        "batch_import_jobs",
+        "job_type IN ('users','datasets','experiments','runs','run_configs','metrics',"
+        "'artifacts','dataset_profile')",
+    )
+
+
+def downgrade() -> None:
+    op.execute("DELETE FROM batch_import_jobs WHERE job_type IN ('experiments','run_configs')")
+    op.drop_constraint("ck_jobs_type", "batch_import_jobs", type_="check")
+    op.create_check_constraint(
+        "ck_jobs_type",
+        "batch_import_jobs",
+        "job_type IN ('users','datasets','runs','metrics','artifacts','dataset_profile')",
+    )
@@ -0,0 +1,32 @@
+"""assign ingest_seq under a per-run lock so it follows commit order
+
+Revision ID: 0016_ingest_seq_commit_order
+Revises: 0015_entity_import_jobs
+Create Date: 2025-01-16 00:00:00.000000
+"""
+from pathlib import Path
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "0016_ingest_seq_commit_order"
+down_revision = "0015_entity_import_jobs"
+branch_labels = None
+depends_on = None
+
+
+SQL_DIR = Path(__file__).resolve().parents[2] / "sql"
+
+
+def upgrade() -> None:
+    op.execute((SQL_DIR / "metric_stream.sql").read_text(encoding="utf-8"))
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS trg_run_metric_values_ingest_seq ON run_metric_values")
+    op.execute("DROP FUNCTION IF EXISTS fn_run_metric_values_ingest_seq()")
+    op.execute(
+        "ALTER TABLE run_metric_values "
+        "ALTER COLUMN ingest_seq SET DEFAULT nextval('run_metric_values_ingest_seq')"
+    )
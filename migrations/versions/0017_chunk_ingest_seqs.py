@@ -0,0 +1,109 @@
+"""per-point ingest_seq on compacted metric chunks
+
+Revision ID: 0017_chunk_ingest_seqs
+Revises: 0016_ingest_seq_commit_order
+Create Date: 2025-01-17 00:00:00.000000
+"""
+from pathlib import Path
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = "0017_chunk_ingest_seqs"
+down_revision = "0016_ingest_seq_commit_order"
+branch_labels = None
+depends_on = None
+
+
+SQL_DIR = Path(__file__).resolve().parents[2] / "sql"
+
+# fn_compact_run_metrics as of 0014, without ingest_seqs.
+PREVIOUS_COMPACT_SQL = """
+CREATE OR REPLACE FUNCTION fn_compact_run_metrics(
+    p_run_id uuid,
+    p_chunk_size integer DEFAULT 1000
+) RETURNS integer AS $$
+DECLARE
+    v_points integer;
+BEGIN
+    IF NOT EXISTS (
+        SELECT 1
+        FROM runs
+        WHERE run_id = p_run_id
+          AND status IN ('finished','failed','killed')
+    ) THEN
+        RETURN 0;
+    END IF;
+
+    WITH moved AS (
+        DELETE FROM run_metric_values
+        WHERE run_id = p_run_id
+          AND step IS NOT NULL
+        RETURNING metric_id, scope, step, value, recorded_at, ingest_seq
+    ),
+    numbered AS (
+        SELECT
+            metric_id,
+            scope,
+            step,
+            value,
+            recorded_at,
+            ingest_seq,
+            (ROW_NUMBER() OVER (
+                PARTITION BY metric_id, scope
+                ORDER BY step, recorded_at
+            ) - 1) / p_chunk_size AS chunk_no
+        FROM moved
+    ),
+    inserted AS (
+        INSERT INTO run_metric_chunks (
+            run_id,
+            metric_id,
+            scope,
+            step_start,
+            step_end,
+            point_count,
+            steps,
+            "values",
+            recorded_at,
+            max_ingest_seq
+        )
+        SELECT
+            p_run_id,
+            metric_id,
+            scope,
+            MIN(step),
+            MAX(step),
+            COUNT(*),
+            array_agg(step ORDER BY step, recorded_at),
+            array_agg(value ORDER BY step, recorded_at),
+            array_agg(recorded_at ORDER BY step, recorded_at),
+            MAX(ingest_seq)
+        FROM numbered
+        GROUP BY metric_id, scope, chunk_no
+        RETURNING point_count
+    )
+    SELECT COALESCE(SUM(point_count), 0)
+    INTO v_points
+    FROM inserted;
+
+    RETURN v_points;
+END;
+$$ LANGUAGE plpgsql;
+"""
+
+
+def upgrade() -> None:
+    # Chunks compacted before this revision keep NULL and fall back to max_ingest_seq.
+    op.add_column(
+        "run_metric_chunks", sa.Column("ingest_seqs", postgresql.ARRAY(sa.BigInteger()))
+    )
+    op.execute((SQL_DIR / "run_metric_chunks.sql").read_text(encoding="utf-8"))
+
+
+def downgrade() -> None:
+    op.execute(PREVIOUS_COMPACT_SQL)
+    op.drop_column("run_metric_chunks", "ingest_seqs")
@@ -0,0 +1,56 @@
+"""row-level security for run-keyed and derived tables
+
+Revision ID: 0018_rls_derived_tables
+Revises: 0017_chunk_ingest_seqs
+Create Date: 2025-01-18 00:00:00.000000
+"""
+from pathlib import Path
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "0018_rls_derived_tables"
+down_revision = "0017_chunk_ingest_seqs"
+branch_labels = None
+depends_on = None
+
+
+SQL_DIR = Path(__file__).resolve().parents[2] / "sql"
+
+NEW_POLICIES = {
+    "run_metric_chunks": "rls_run_metric_chunks_access",
+    "run_final_metrics": "rls_run_final_metrics_access",
+    "run_configs": "rls_run_configs_access",
+    "run_artifacts": "rls_run_artifacts_access",
+    "experiment_metric_summary": "rls_experiment_metric_summary_access",
+    "project_metric_summary": "rls_project_metric_summary_access",
+    "dataset_versions": "rls_dataset_versions_access",
+}
+
+# run_metric_values policy as of 0011.
+PREVIOUS_RUN_METRIC_VALUES_POLICY = """
+DROP POLICY IF EXISTS rls_run_metric_values_access ON run_metric_values;
+CREATE POLICY rls_run_metric_values_access ON run_metric_values
+    USING (
+        fn_rls_bypass()
+        OR run_id IN (
+            SELECT r.run_id
+            FROM runs r
+            JOIN experiments e ON e.experiment_id = r.experiment_id
+            JOIN user_project_access upa ON upa.project_id = e.project_id
+            WHERE upa.user_id = fn_rls_user_id()
+        )
+    );
+"""
+
+
+def upgrade() -> None:
+    op.execute((SQL_DIR / "row_level_security.sql").read_text(encoding="utf-8"))
+
+
+def downgrade() -> None:
+    for table, policy in NEW_POLICIES.items():
+        op.execute(f"DROP POLICY IF EXISTS {policy} ON {table}")
+        op.execute(f"ALTER TABLE {table} DISABLE ROW LEVEL SECURITY")
+    op.execute(PREVIOUS_RUN_METRIC_VALUES_POLICY)
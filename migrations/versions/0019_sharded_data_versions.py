@@ -0,0 +1,82 @@
+"""shard project_data_versions and bump it on project and metric edits
+
+Revision ID: 0019_sharded_data_versions
+Revises: 0018_rls_derived_tables
+Create Date: 2025-01-19 00:00:00.000000
+"""
+from pathlib import Path
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0019_sharded_data_versions"
+down_revision = "0018_rls_derived_tables"
+branch_labels = None
+depends_on = None
+
+
+SQL_DIR = Path(__file__).resolve().parents[2] / "sql"
+
+# fn_bump_project_data_version as of 0007, one row per project.
+PREVIOUS_BUMP_SQL = """
+CREATE OR REPLACE FUNCTION fn_bump_project_data_version(p_project_ids uuid[]) RETURNS void AS $$
+    INSERT INTO project_data_versions (project_id, version, updated_at)
+    SELECT DISTINCT p.project_id, 1, now()
+    FROM unnest(p_project_ids) AS changed(project_id)
+    JOIN ml_projects p ON p.project_id = changed.project_id
+    ORDER BY p.project_id
+    ON CONFLICT (project_id) DO UPDATE SET
+        version = project_data_versions.version + 1,
+        updated_at = EXCLUDED.updated_at;
+$$ LANGUAGE sql;
+"""
+
+
+def upgrade() -> None:
+    op.add_column(
+        "project_data_versions",
+        sa.Column("shard", sa.SmallInteger(), nullable=False, server_default=sa.text("0")),
+    )
+    op.drop_constraint("project_data_versions_pkey", "project_data_versions", type_="primary")
+    op.create_primary_key(
+        "project_data_versions_pkey", "project_data_versions", ["project_id", "shard"]
+    )
+    op.execute((SQL_DIR / "project_data_versions.sql").read_text(encoding="utf-8"))
+
+
+def downgrade() -> None:
+    op.execute(
+        "DROP TRIGGER IF EXISTS trg_metric_definitions_data_version_update ON metric_definitions"
+    )
+    op.execute("DROP TRIGGER IF EXISTS trg_ml_projects_data_version_update ON ml_projects")
+    op.execute("DROP FUNCTION IF EXISTS fn_metric_definitions_data_version()")
+    op.execute("DROP FUNCTION IF EXISTS fn_ml_projects_data_version()")
+    # Fold the shards back into one row per project, keeping the sum.
+    op.execute(
+        """
+        UPDATE project_data_versions v
+        SET version = totals.version
+        FROM (
+            SELECT project_id, SUM(version)::bigint AS version
+            FROM project_data_versions
+            GROUP BY project_id
+        ) totals
+        WHERE v.project_id = totals.project_id AND v.shard = 0
+        """
+    )
+    op.execute(
+        """
+        INSERT INTO project_data_versions (project_id, shard, version, updated_at)
+        SELECT project_id, 0, SUM(version)::bigint, MAX(updated_at)
+        FROM project_data_versions
+        GROUP BY project_id
+        HAVING bool_and(shard <> 0)
+        """
+    )
+    op.execute("DELETE FROM project_data_versions WHERE shard <> 0")
+    op.drop_constraint("project_data_versions_pkey", "project_data_versions", type_="primary")
+    op.drop_column("project_data_versions", "shard")
+    op.create_primary_key("project_data_versions_pkey", "project_data_versions", ["project_id"])
+    op.execute(PREVIOUS_BUMP_SQL)
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""CPU cost of the ORM + Pydantic read path vs the Core-row + orjson path.
+
+Run it against a seeded database (see scripts/seed.py):
+
+    docker compose exec backend python scripts/bench_read_path.py --rows 10000
+
+The "orm" path copies what FastAPI does for `response_model=list[...]` when a
+handler returns ORM instances. The "core" path is what `list_runs` and
+`get_run_metrics` do now. Both paths read the same rows, and their decoded
+JSON is checked for equality before any timing.
+"""
+import argparse
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from pydantic import TypeAdapter
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.core.serialization import model_columns, rows_response
+from app.db.session import engine
+from app.models.models import Run, RunMetricValue
+from app.schemas.metrics import RunMetricValueRead
+from app.schemas.runs import RunRead
+
+SCENARIOS = {
+    "list_runs": (Run, RunRead, Run.run_id),
+    "get_run_metrics": (RunMetricValue, RunMetricValueRead, RunMetricValue.run_metric_value_id),
+}
+
+
+def orm_path(entity, model, order_by, rows: int) -> bytes:
+    with Session(engine) as db:
+        objects = db.scalars(select(entity).order_by(order_by).limit(rows)).all()
+        adapter = TypeAdapter(list[model])
+        payload = adapter.dump_python(
+            adapter.validate_python(objects, from_attributes=True), mode="json"
+        )
+    return json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def core_path(entity, model, order_by, rows: int) -> bytes:
+    with Session(engine) as db:
+        result = db.execute(
+            select(*model_columns(model, entity.__table__)).order_by(order_by).limit(rows)
+        ).mappings()
+        return rows_response(result).body
+
+
+def measure(func, args, iterations: int) -> dict:
+    cpu_samples = []
+    wall_samples = []
+    body = b""
+    for _ in range(iterations):
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        body = func(*args)
+        cpu_samples.append(time.process_time() - cpu_start)
+        wall_samples.append(time.perf_counter() - wall_start)
+    return {
+        "rows": len(json.loads(body)),
+        "cpu_ms": statistics.median(cpu_samples) * 1000,
+        "wall_ms": statistics.median(wall_samples) * 1000,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--iterations", type=int, default=5)
+    parser.add_argument("--scenario", choices=sorted(SCENARIOS), action="append")
+    args = parser.parse_args()
+
+    results = {}
+    for name in args.scenario or sorted(SCENARIOS):
+        entity, model, order_by = SCENARIOS[name]
+        call_args = (entity, model, order_by, args.rows)
+        if json.loads(orm_path(*call_args)) != json.loads(core_path(*call_args)):
+            raise SystemExit(f"{name}: core path output differs from the ORM path")
+        orm = measure(orm_path, call_args, args.iterations)
+        core = measure(core_path, call_args, args.iterations)
+        rows = max(orm["rows"], 1)
+        results[name] = {
+            "rows": orm["rows"],
+            "orm_cpu_ms_per_10k": round(orm["cpu_ms"] / rows * 10_000, 2),
+            "core_cpu_ms_per_10k": round(core["cpu_ms"] / rows * 10_000, 2),
+            "orm_wall_ms": round(orm["wall_ms"], 2),
+            "core_wall_ms": round(core["wall_ms"], 2),
+            "cpu_speedup": round(orm["cpu_ms"] / core["cpu_ms"], 2) if core["cpu_ms"] else None,
+        }
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,304 @@
+#!/usr/bin/env python3
+"""Repeatable query benchmarks with plan capture and baseline comparison.
+
+Run against a seeded database (see scripts/generate_synthetic.py):
+
+    docker compose exec backend python scripts/bench_suite.py --output bench.json
+    docker compose exec backend python scripts/bench_suite.py --baseline bench.json --threshold 0.2
+
+Each scenario is the statement the matching endpoint runs. It gets warmup
+iterations, then `--iterations` timed ones, and one
+EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) for planner and buffer stats plus a
+plan-shape hash. `--without-index NAME` drops indexes inside the benchmark
+transaction, which is rolled back at the end. This reproduces the
+before/after comparison of sql/perf_demo.sql without changing the schema.
+With `--baseline`, a scenario regresses when its p50 is slower than
+the baseline by more than `--threshold` and `--min-delta-ms`. The exit status is 1 if
+anything regressed.
+"""
+import argparse
+import json
+import statistics
+import sys
+import time
+import uuid
+from datetime import datetime, timezone
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from sqlalchemy import insert, select, text
+from sqlalchemy.engine import Connection
+
+from app.core.metric_chunks import ordered_metric_points
+from app.core.permissions import project_visible
+from app.core.query_plans import plan_hash, plan_nodes
+from app.core.serialization import model_columns
+from app.db.session import engine
+from app.models.models import Experiment, Run, RunMetricValue
+from app.schemas.runs import RunRead
+
+BATCH_ROWS = 1_000
+
+DATASET_TREND_SQL = text(
+    """
+    SELECT
+        e.project_id,
+        dv.dataset_version_id,
+        dv.version_label,
+        COUNT(*) AS run_count,
+        AVG(rmv.value) AS avg_value
+    FROM dataset_versions dv
+    JOIN runs r ON r.dataset_version_id = dv.dataset_version_id
+    JOIN experiments e ON e.experiment_id = r.experiment_id
+    JOIN run_metric_values rmv ON rmv.run_id = r.run_id AND rmv.step IS NULL
+    WHERE rmv.metric_id = (SELECT metric_id FROM metric_definitions WHERE key = :metric_key)
+      AND rmv.scope = 'val'
+    GROUP BY e.project_id, dv.dataset_version_id, dv.version_label
+    ORDER BY avg_value DESC
+    LIMIT 20
+    """
+)
+
+
+def leaderboard(fixture: dict):
+    return (
+        text("SELECT * FROM fn_experiment_leaderboard(:experiment_id, :metric_key, 'val', 10)"),
+        {"experiment_id": fixture["experiment_id"], "metric_key": fixture["metric_key"]},
+    )
+
+
+def dataset_trend(fixture: dict):
+    return DATASET_TREND_SQL, {"metric_key": fixture["metric_key"]}
+
+
+def dashboard(fixture: dict):
+    return (
+        text("SELECT * FROM v_project_quality_dashboard WHERE project_id = :project_id"),
+        {"project_id": fixture["project_id"]},
+    )
+
+
+def metric_fetch(fixture: dict):
+    return ordered_metric_points(run_id=fixture["run_id"]), {}
+
+
+def list_runs(fixture: dict):
+    query = (
+        select(*model_columns(RunRead, Run.__table__))
+        .join(Experiment, Experiment.experiment_id == Run.experiment_id)
+        .where(project_visible(Experiment.project_id, fixture["user_id"]))
+        .limit(100)
+    )
+    return query, {}
+
+
+def list_experiments(fixture: dict):
+    query = (
+        select(Experiment.__table__)
+        .where(project_visible(Experiment.project_id, fixture["user_id"]))
+        .limit(100)
+    )
+    return query, {}
+
+
+def batch_import(fixture: dict):
+    # The multi-row insert at the end of /batch-import for a metrics file.
+    # Steps start far past real data, and every iteration is rolled back.
+    rows = [
+        {
+            "run_metric_value_id": uuid.uuid4(),
+            "run_id": fixture["run_id"],
+            "metric_id": fixture["metric_id"],
+            "scope": "train",
+            "step": 10_000_000 + index,
+            "value": index / BATCH_ROWS,
+        }
+        for index in range(BATCH_ROWS)
+    ]
+    return insert(RunMetricValue), rows
+
+
+SCENARIOS = {
+    "leaderboard": leaderboard,
+    "dataset_trend": dataset_trend,
+    "dashboard": dashboard,
+    "metric_fetch": metric_fetch,
+    "batch_import": batch_import,
+    "list_runs": list_runs,
+    "list_experiments": list_experiments,
+}
+WRITE_SCENARIOS = {"batch_import"}
+
+
+def load_fixture(conn: Connection, metric_key: str) -> dict:
+    """Pick deterministic, heavy targets: the experiment with the most runs, and so on."""
+    experiment_id = conn.scalar(
+        text(
+            "SELECT experiment_id FROM runs GROUP BY experiment_id "
+            "ORDER BY count(*) DESC, experiment_id LIMIT 1"
+        )
+    )
+    if experiment_id is None:
+        raise SystemExit("No runs found, seed the database first")
+    return {
+        "metric_key": metric_key,
+        "metric_id": conn.scalar(
+            text("SELECT metric_id FROM metric_definitions WHERE key = :key"), {"key": metric_key}
+        ),
+        "experiment_id": experiment_id,
+        "project_id": conn.scalar(
+            text("SELECT project_id FROM experiments WHERE experiment_id = :id"),
+            {"id": experiment_id},
+        ),
+        "run_id": conn.scalar(
+            text("SELECT run_id FROM runs WHERE experiment_id = :id ORDER BY run_id LIMIT 1"),
+            {"id": experiment_id},
+        ),
+        "user_id": conn.scalar(
+            text(
+                "SELECT user_id FROM user_project_access GROUP BY user_id "
+                "ORDER BY count(*) DESC, user_id LIMIT 1"
+            )
+        ),
+    }
+
+
+def explain(conn: Connection, statement, params: dict) -> dict:
+    compiled = statement.compile(dialect=conn.dialect)
+    bound = {**compiled.params, **params}
+    raw = conn.exec_driver_sql(
+        f"EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {compiled.string}", bound
+    ).scalar()
+    document = (json.loads(raw) if isinstance(raw, str) else raw)[0]
+    plan = document["Plan"]
+    nodes = plan_nodes(plan)
+    return {
+        "planning_ms": round(document.get("Planning Time", 0.0), 3),
+        "execution_ms": round(document.get("Execution Time", 0.0), 3),
+        "rows": plan.get("Actual Rows"),
+        "shared_hit_blocks": plan.get("Shared Hit Blocks"),
+        "shared_read_blocks": plan.get("Shared Read Blocks"),
+        "nodes": nodes,
+        "plan_hash": plan_hash(nodes),
+    }
+
+
+def run_scenario(conn: Connection, name: str, fixture: dict, warmup: int, iterations: int) -> dict:
+    statement, params = SCENARIOS[name](fixture)
+    samples = []
+    for iteration in range(warmup + iterations):
+        savepoint = conn.begin_nested()
+        started = time.perf_counter()
+        cursor = conn.execute(statement, params)
+        if name not in WRITE_SCENARIOS:
+            cursor.all()
+        elapsed = (time.perf_counter() - started) * 1000
+        savepoint.rollback()
+        if iteration >= warmup:
+            samples.append(elapsed)
+
+    samples.sort()
+    result = {
+        "iterations": iterations,
+        "min_ms": round(samples[0], 3),
+        "p50_ms": round(statistics.median(samples), 3),
+        "p95_ms": round(samples[min(len(samples) - 1, int(len(samples) * 0.95))], 3),
+        "mean_ms": round(statistics.fmean(samples), 3),
+    }
+    if name in WRITE_SCENARIOS:
+        result["rows"] = len(params)
+    else:
+        savepoint = conn.begin_nested()
+        result["plan"] = explain(conn, statement, params)
+        savepoint.rollback()
+    return result
+
+
+def compare(current: dict, baseline: dict, threshold: float, min_delta_ms: float) -> list[str]:
+    regressions = []
+    print(f"{'scenario':<18} {'p50 ms':>10} {'baseline':>10} {'change':>8}  note")
+    for name, result in current["scenarios"].items():
+        previous = baseline.get("scenarios", {}).get(name)
+        if not previous:
+            print(f"{name:<18} {result['p50_ms']:>10.2f} {'-':>10} {'-':>8}  new")
+            continue
+        delta = result["p50_ms"] - previous["p50_ms"]
+        ratio = delta / previous["p50_ms"] if previous["p50_ms"] else 0.0
+        notes = []
+        if ratio > threshold and delta > min_delta_ms:
+            notes.append("REGRESSION")
+            regressions.append(name)
+        elif ratio < -threshold and -delta > min_delta_ms:
+            notes.append("improved")
+        old_hash = previous.get("plan", {}).get("plan_hash")
+        new_hash = result.get("plan", {}).get("plan_hash")
+        if old_hash and new_hash and old_hash != new_hash:
+            notes.append("plan changed")
+        print(
+            f"{name:<18} {result['p50_ms']:>10.2f} {previous['p50_ms']:>10.2f} "
+            f"{ratio:>+8.1%}  {', '.join(notes)}"
+        )
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scenario", choices=sorted(SCENARIOS), action="append")
+    parser.add_argument("--iterations", type=int, default=10)
+    parser.add_argument("--warmup", type=int, default=2)
+    parser.add_argument("--metric-key", default="accuracy")
+    parser.add_argument(
+        "--without-index", action="append", default=[], help="drop for this run only"
+    )
+    parser.add_argument("--output", type=Path, help="write results JSON here")
+    parser.add_argument("--baseline", type=Path, help="results JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=0.2, help="allowed p50 slowdown")
+    parser.add_argument("--min-delta-ms", type=float, default=1.0, help="ignore smaller changes")
+    args = parser.parse_args()
+
+    with engine.connect() as conn:
+        transaction = conn.begin()
+        try:
+            conn.execute(text("SET LOCAL jit = off"))
+            for index_name in args.without_index:
+                conn.execute(text(f'DROP INDEX IF EXISTS "{index_name}"'))
+            fixture = load_fixture(conn, args.metric_key)
+            results = {
+                "meta": {
+                    "created_at": datetime.now(timezone.utc).isoformat(),
+                    "server_version": conn.scalar(text("SHOW server_version")),
+                    "run_metric_values_estimate": conn.scalar(
+                        text(
+                            "SELECT reltuples::bigint FROM pg_class "
+                            "WHERE oid = 'run_metric_values'::regclass"
+                        )
+                    ),
+                    "without_index": args.without_index,
+                    "fixture": {key: str(value) for key, value in fixture.items()},
+                },
+                "scenarios": {},
+            }
+            for name in args.scenario or list(SCENARIOS):
+                results["scenarios"][name] = run_scenario(
+                    conn, name, fixture, args.warmup, args.iterations
+                )
+                print(f"{name}: p50={results['scenarios'][name]['p50_ms']} ms", file=sys.stderr)
+        finally:
+            transaction.rollback()
+
+    payload = json.dumps(results, indent=2)
+    if args.output:
+        args.output.write_text(payload + "\n", encoding="utf-8")
+    elif not args.baseline:
+        print(payload)
+
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+        regressions = compare(results, baseline, args.threshold, args.min_delta_ms)
+        if regressions:
+            raise SystemExit(f"Regressions: {', '.join(regressions)}")
+
+
+if __name__ == "__main__":
+    main()
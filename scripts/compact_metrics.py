@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""Compact step metrics of closed runs into run_metric_chunks.
+
+    docker compose exec backend python scripts/compact_metrics.py --older-than-hours 1
+"""
+import argparse
+import sys
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from sqlalchemy import exists, select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.metric_chunks import compact_run
+from app.db.session import engine
+from app.models.models import Run, RunMetricValue
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--older-than-hours", type=float, default=1.0)
+    parser.add_argument("--chunk-size", type=int, default=settings.metric_chunk_size)
+    parser.add_argument("--limit", type=int, default=None, help="max runs to compact")
+    args = parser.parse_args()
+
+    cutoff = datetime.now(timezone.utc) - timedelta(hours=args.older_than_hours)
+    with Session(engine) as db:
+        run_ids = db.scalars(
+            select(Run.run_id)
+            .where(
+                Run.status.in_(["finished", "failed", "killed"]),
+                Run.finished_at.is_(None) | (Run.finished_at < cutoff),
+                exists().where(
+                    RunMetricValue.run_id == Run.run_id,
+                    RunMetricValue.step.is_not(None),
+                ),
+            )
+            .limit(args.limit)
+        ).all()
+
+        total_points = 0
+        for run_id in run_ids:
+            total_points += compact_run(db, run_id, args.chunk_size)
+
+    print(f"Compacted runs={len(run_ids)}, points={total_points}")
+
+
+if __name__ == "__main__":
+    main()
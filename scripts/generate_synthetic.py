@@ -0,0 +1,628 @@
+#!/usr/bin/env python3
+"""Generate a synthetic tenant tree at benchmark scale with COPY.
+
+    docker compose exec backend python scripts/generate_synthetic.py --profile large --workers 8
+
+Dimension rows (users, orgs, projects, datasets, experiments, runs, configs)
+are loaded with one text COPY each, with triggers on, so the access and
+summary tables are maintained as usual. The step series of
+run_metric_values, which is nearly all of the volume, is built as binary COPY
+buffers with NumPy and loaded by a process pool. Each worker has its own
+connection. Secondary indexes are dropped during that phase and rebuilt
+afterwards. As superuser, the step COPY also runs with
+session_replication_role=replica, which skips the per-row ingest_seq
+trigger. The step rows therefore carry ingest_seq themselves, from one range
+of the sequence reserved up front and split between the shards.
+Final values go in last, with triggers on, so run_final_metrics and the
+metric summaries match the data.
+
+Run sizes and runs per experiment follow a truncated Zipf distribution: a few
+experiments and runs hold most of the points, as in real tracking data.
+`--profile large` is about 100M run_metric_values rows. Individual flags
+override the profile.
+"""
+import argparse
+import heapq
+import multiprocessing
+import os
+import struct
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+import numpy as np
+import psycopg
+from psycopg.types.json import Jsonb
+from sqlalchemy.engine import make_url
+
+from app.core.config import settings
+from app.core.security import hash_password
+
+PROFILES = {
+    "small": {
+        "users": 100,
+        "orgs": 2,
+        "projects_per_org": 3,
+        "experiments_per_project": 5,
+        "runs": 500,
+        "mean_steps": 500,
+        "max_steps": 5_000,
+    },
+    "medium": {
+        "users": 500,
+        "orgs": 5,
+        "projects_per_org": 4,
+        "experiments_per_project": 10,
+        "runs": 5_000,
+        "mean_steps": 500,
+        "max_steps": 20_000,
+    },
+    "large": {
+        "users": 2_000,
+        "orgs": 10,
+        "projects_per_org": 5,
+        "experiments_per_project": 20,
+        "runs": 20_000,
+        "mean_steps": 1_250,
+        "max_steps": 100_000,
+    },
+}
+
+METRICS = [
+    ("loss", "Loss", "loss", "min"),
+    ("accuracy", "Accuracy", "ratio", "max"),
+    ("f1", "F1", "ratio", "max"),
+    ("auc", "AUC", "ratio", "max"),
+    ("val_loss", "Validation Loss", "loss", "min"),
+    ("precision", "Precision", "ratio", "max"),
+    ("recall", "Recall", "ratio", "max"),
+    ("learning_rate", "Learning Rate", None, "last"),
+]
+TASK_TYPES = ["classification", "regression", "ranking", "segmentation", "nlp", "other"]
+STEP_COLUMNS = "run_metric_value_id, run_id, metric_id, scope, step, value, recorded_at"
+COPY_STEP_COLUMNS = f"{STEP_COLUMNS}, ingest_seq"
+
+PG_EPOCH = datetime(2000, 1, 1, tzinfo=timezone.utc)
+PG_EPOCH_UNIX_US = int(PG_EPOCH.timestamp()) * 1_000_000
+COPY_SIGNATURE = b"PGCOPY\n\xff\r\n\x00" + struct.pack(">ii", 0, 0)
+COPY_TRAILER = struct.pack(">h", -1)
+COPY_FLUSH_BYTES = 8 * 1024 * 1024
+UUID_VARIANT = np.uint64(0x8000000000000000)
+_ROW_DTYPES: dict[int, np.dtype] = {}
+
+
+def _row_dtype(scope_len: int) -> np.dtype:
+    # One binary COPY tuple: field count, then (length, value) per column.
+    if scope_len not in _ROW_DTYPES:
+        _ROW_DTYPES[scope_len] = np.dtype(
+            [
+                ("fields", ">i2"),
+                ("id_len", ">i4"), ("id_hi", ">u8"), ("id_lo", ">u8"),
+                ("run_len", ">i4"), ("run_hi", ">u8"), ("run_lo", ">u8"),
+                ("metric_len", ">i4"), ("metric_hi", ">u8"), ("metric_lo", ">u8"),
+                ("scope_len", ">i4"), ("scope", f"S{scope_len}"),
+                ("step_len", ">i4"), ("step", ">i4"),
+                ("value_len", ">i4"), ("value", ">f8"),
+                ("recorded_len", ">i4"), ("recorded_at", ">i8"),
+                ("seq_len", ">i4"), ("ingest_seq", ">i8"),
+            ]
+        )
+    return _ROW_DTYPES[scope_len]
+
+
+def _uuid_words(value: uuid.UUID) -> tuple[int, int]:
+    return value.int >> 64, value.int & 0xFFFFFFFFFFFFFFFF
+
+
+def _pg_micros(moment: datetime) -> int:
+    return int((moment - PG_EPOCH).total_seconds() * 1_000_000)
+
+
+def _curve(rng: np.random.Generator, goal: str, steps: np.ndarray) -> np.ndarray:
+    tau = rng.uniform(0.05, 0.5) * max(len(steps), 1)
+    decay = np.exp(-steps / tau)
+    noise = rng.normal(0.0, 0.01, len(steps))
+    if goal == "max":
+        floor = rng.uniform(0.4, 0.6)
+        ceiling = rng.uniform(0.75, 0.99)
+        return np.clip(ceiling - (ceiling - floor) * decay + noise, 0.0, 1.0)
+    start = rng.uniform(1.0, 3.0)
+    end = rng.uniform(0.01, 0.3)
+    return np.abs(end + (start - end) * decay + noise)
+
+
+def series_block(
+    run_id: uuid.UUID,
+    metric_id: uuid.UUID,
+    scope: str,
+    goal: str,
+    step_count: int,
+    started_us: int,
+    interval_us: int,
+    first_seq: int,
+    rng: np.random.Generator,
+) -> bytes:
+    """Binary COPY tuples for one (run, metric, scope) step series."""
+    encoded_scope = scope.encode()
+    block = np.empty(step_count, dtype=_row_dtype(len(encoded_scope)))
+    steps = np.arange(step_count, dtype=np.int64)
+    recorded_at = started_us + steps * interval_us
+    # UUIDv7 layout: the unix-ms prefix keeps primary-key inserts near the
+    # right edge of the btree instead of touching random leaf pages.
+    unix_ms = ((recorded_at + PG_EPOCH_UNIX_US) // 1000).astype(np.uint64)
+    sequence = (steps & 0xFFF).astype(np.uint64)
+
+    block["fields"] = 8
+    block["id_len"] = 16
+    block["id_hi"] = (unix_ms << np.uint64(16)) | np.uint64(0x7000) | sequence
+    block["id_lo"] = UUID_VARIANT | rng.integers(0, 1 << 62, step_count, dtype=np.uint64)
+    block["run_len"] = 16
+    block["run_hi"], block["run_lo"] = _uuid_words(run_id)
+    block["metric_len"] = 16
+    block["metric_hi"], block["metric_lo"] = _uuid_words(metric_id)
+    block["scope_len"] = len(encoded_scope)
+    block["scope"] = encoded_scope
+    block["step_len"] = 4
+    block["step"] = steps
+    block["value_len"] = 8
+    block["value"] = _curve(rng, goal, steps)
+    block["recorded_len"] = 8
+    block["recorded_at"] = recorded_at
+    block["seq_len"] = 8
+    block["ingest_seq"] = first_seq + steps
+    return block.tobytes()
+
+
+def copy_step_shard(task: dict) -> int:
+    """Worker: COPY the step series of a shard of runs in one transaction."""
+    rows = 0
+    seq = task["first_seq"]
+    with psycopg.connect(task["conninfo"]) as conn:
+        if task["replica"]:
+            conn.execute("SET session_replication_role = replica")
+        with conn.cursor().copy(
+            f"COPY run_metric_values ({COPY_STEP_COLUMNS}) FROM STDIN (FORMAT BINARY)"
+        ) as copy:
+            copy.write(COPY_SIGNATURE)
+            pending: list[bytes] = []
+            pending_bytes = 0
+            for run_id, step_count, started_us, interval_us, seed in task["runs"]:
+                rng = np.random.default_rng(seed)
+                for metric_id, scope, goal in task["metrics"]:
+                    block = series_block(
+                        run_id, metric_id, scope, goal, step_count, started_us, interval_us, seq,
+                        rng,
+                    )
+                    pending.append(block)
+                    pending_bytes += len(block)
+                    rows += step_count
+                    seq += step_count
+                    if pending_bytes >= COPY_FLUSH_BYTES:
+                        copy.write(b"".join(pending))
+                        pending, pending_bytes = [], 0
+            if pending:
+                copy.write(b"".join(pending))
+            copy.write(COPY_TRAILER)
+    return rows
+
+
+def zipf_choice(rng: np.random.Generator, options: int, size: int, s: float) -> np.ndarray:
+    """Indexes into `options` items, item k drawn with probability proportional to (k + 1) ** -s."""
+    weights = np.arange(1, options + 1, dtype=np.float64) ** -s
+    return rng.choice(options, size=size, p=weights / weights.sum())
+
+
+def zipf_run_sizes(
+    rng: np.random.Generator, runs: int, mean_steps: int, max_steps: int, s: float
+) -> np.ndarray:
+    sizes = zipf_choice(rng, max_steps, runs, s).astype(np.float64) + 1
+    # Rescale to the requested mean and keep the long tail.
+    sizes = np.rint(sizes * mean_steps / sizes.mean())
+    return np.clip(sizes, 1, max_steps).astype(np.int64)
+
+
+def balanced_shards(sizes: np.ndarray, shards: int) -> list[list[int]]:
+    """Longest-first greedy packing, so one huge run does not leave the rest of the pool idle."""
+    heap = [(0, shard) for shard in range(shards)]
+    members: list[list[int]] = [[] for _ in range(shards)]
+    for index in np.argsort(sizes)[::-1]:
+        load, shard = heapq.heappop(heap)
+        members[shard].append(int(index))
+        heapq.heappush(heap, (load + int(sizes[index]), shard))
+    return [shard for shard in members if shard]
+
+
+def _copy_rows(conn: psycopg.Connection, table: str, columns: str, rows) -> int:
+    count = 0
+    with conn.cursor().copy(f"COPY {table} ({columns}) FROM STDIN") as copy:
+        for row in rows:
+            copy.write_row(row)
+            count += 1
+    return count
+
+
+def _secondary_indexes(conn: psycopg.Connection) -> list[tuple[str, str]]:
+    return conn.execute(
+        """
+        SELECT i.relname, pg_get_indexdef(i.oid)
+        FROM pg_index x
+        JOIN pg_class i ON i.oid = x.indexrelid
+        WHERE x.indrelid = 'run_metric_values'::regclass
+          AND NOT EXISTS (SELECT 1 FROM pg_constraint c WHERE c.conindid = x.indexrelid)
+        """
+    ).fetchall()
+
+
+def _metric_ids(conn: psycopg.Connection, count: int) -> list[tuple[uuid.UUID, str, str]]:
+    definitions = list(METRICS[:count])
+    definitions += [
+        (f"metric_{index}", f"Metric {index}", None, "max")
+        for index in range(len(definitions), count)
+    ]
+    for key, display_name, unit, goal in definitions:
+        conn.execute(
+            "INSERT INTO metric_definitions (key, display_name, unit, goal) "
+            "VALUES (%s, %s, %s, %s) ON CONFLICT (key) DO NOTHING",
+            (key, display_name, unit, goal),
+        )
+    rows = conn.execute(
+        "SELECT key, metric_id, goal FROM metric_definitions WHERE key = ANY(%s)",
+        ([key for key, *_ in definitions],),
+    ).fetchall()
+    by_key = {key: (metric_id, goal) for key, metric_id, goal in rows}
+    return [(by_key[key][0], key, by_key[key][1]) for key, *_ in definitions]
+
+
+def conninfo() -> str:
+    url = make_url(settings.migration_database_url or settings.database_url)
+    return url.set(drivername="postgresql").render_as_string(hide_password=False)
+
+
+def generate(args: argparse.Namespace) -> None:
+    rng = np.random.default_rng(args.seed)
+    prefix = args.prefix or f"synth-{uuid.uuid4().hex[:6]}"
+    run_sizes = zipf_run_sizes(rng, args.runs, args.mean_steps, args.max_steps, args.zipf_s)
+    step_rows = int(run_sizes.sum()) * args.metrics
+    print(
+        f"Plan {prefix}: runs={args.runs}, steps p50={int(np.median(run_sizes))} "
+        f"max={int(run_sizes.max())}, run_metric_values={step_rows + args.runs * args.metrics:,}"
+    )
+    if args.dry_run:
+        return
+
+    dsn = conninfo()
+    now = datetime.now(timezone.utc)
+    started = time.perf_counter()
+    with psycopg.connect(dsn) as conn:
+        replica = conn.execute(
+            "SELECT rolsuper FROM pg_roles WHERE rolname = current_user"
+        ).fetchone()[0]
+        if not replica:
+            print("Not a superuser: step rows are loaded with triggers enabled")
+        metrics = _metric_ids(conn, args.metrics)
+
+        password_hash = hash_password(os.getenv("SEED_DEFAULT_PASSWORD", "change-me"))
+        user_ids = [uuid.uuid4() for _ in range(args.users)]
+        _copy_rows(
+            conn,
+            "users",
+            "user_id, email, full_name, password_hash, is_active",
+            (
+                (user_id, f"{prefix}-user{index}@example.com", f"User {index}", password_hash, True)
+                for index, user_id in enumerate(user_ids)
+            ),
+        )
+
+        org_ids = [uuid.uuid4() for _ in range(args.orgs)]
+        org_users = [rng.choice(args.users, min(args.users, 50), replace=False) for _ in org_ids]
+        _copy_rows(
+            conn,
+            "organizations",
+            "org_id, name, description, created_by",
+            (
+                (org_id, f"{prefix}-org-{index}", "Synthetic organization", user_ids[members[0]])
+                for index, (org_id, members) in enumerate(zip(org_ids, org_users))
+            ),
+        )
+        _copy_rows(
+            conn,
+            "org_members",
+            "org_member_id, org_id, user_id, role, is_active",
+            (
+                (
+                    uuid.uuid4(),
+                    org_id,
+                    user_ids[member],
+                    "owner" if position == 0 else ("admin" if position < 3 else "member"),
+                    True,
+                )
+                for org_id, members in zip(org_ids, org_users)
+                for position, member in enumerate(members)
+            ),
+        )
+
+        projects = [
+            (uuid.uuid4(), org_index)
+            for org_index in range(args.orgs)
+            for _ in range(args.projects_per_org)
+        ]
+        _copy_rows(
+            conn,
+            "ml_projects",
+            "project_id, org_id, name, description, status",
+            (
+                (
+                    project_id,
+                    org_ids[org_index],
+                    f"{prefix}-project-{index}",
+                    "Synthetic project",
+                    "active",
+                )
+                for index, (project_id, org_index) in enumerate(projects)
+            ),
+        )
+        _copy_rows(
+            conn,
+            "project_members",
+            "project_member_id, project_id, user_id, role, is_active",
+            (
+                (uuid.uuid4(), project_id, user_ids[member], str(role), True)
+                for project_id, org_index in projects
+                for member, role in zip(
+                    rng.choice(
+                        org_users[org_index], min(len(org_users[org_index]), 15), replace=False
+                    ),
+                    rng.choice(["admin", "editor", "viewer"], 15, p=[0.1, 0.5, 0.4]),
+                )
+            ),
+        )
+
+        dataset_versions: dict[uuid.UUID, list[uuid.UUID]] = {}
+        dataset_rows, version_rows = [], []
+        for project_id, _ in projects:
+            for index in range(3):
+                dataset_id = uuid.uuid4()
+                dataset_rows.append(
+                    (dataset_id, project_id, f"dataset-{index}", str(rng.choice(TASK_TYPES)), None)
+                )
+                for version in range(2):
+                    version_id = uuid.uuid4()
+                    dataset_versions.setdefault(project_id, []).append(version_id)
+                    version_rows.append(
+                        (
+                            version_id,
+                            dataset_id,
+                            f"v{version + 1}",
+                            f"s3://synthetic/{dataset_id}/v{version + 1}",
+                            f"sha256:{uuid.uuid4().hex}{uuid.uuid4().hex}",
+                            int(rng.integers(10_000, 10_000_000)),
+                            int(rng.integers(1_000_000, 5_000_000_000)),
+                        )
+                    )
+        _copy_rows(
+            conn, "datasets", "dataset_id, project_id, name, task_type, description", dataset_rows
+        )
+        _copy_rows(
+            conn,
+            "dataset_versions",
+            "dataset_version_id, dataset_id, version_label, storage_uri, content_hash, "
+            "row_count, size_bytes",
+            version_rows,
+        )
+
+        experiments = [
+            (uuid.uuid4(), project_id, org_index)
+            for project_id, org_index in projects
+            for _ in range(args.experiments_per_project)
+        ]
+        _copy_rows(
+            conn,
+            "experiments",
+            "experiment_id, project_id, name, objective, created_by",
+            (
+                (
+                    experiment_id,
+                    project_id,
+                    f"exp-{index}",
+                    "Synthetic experiment",
+                    user_ids[int(rng.choice(org_users[org_index]))],
+                )
+                for index, (experiment_id, project_id, org_index) in enumerate(experiments)
+            ),
+        )
+
+        # Shuffle before the Zipf draw so the heavy experiments are spread over projects.
+        experiment_order = rng.permutation(len(experiments))
+        run_experiments = experiment_order[
+            zipf_choice(rng, len(experiments), args.runs, args.zipf_s)
+        ]
+        window_us = 90 * 24 * 3600 * 1_000_000
+        runs = []
+        for index in range(args.runs):
+            experiment_id, project_id, org_index = experiments[run_experiments[index]]
+            interval_us = int(rng.integers(1, 30)) * 1_000_000
+            started_us = _pg_micros(now) - int(rng.integers(0, window_us))
+            runs.append(
+                {
+                    "run_id": uuid.uuid4(),
+                    "experiment_id": experiment_id,
+                    "dataset_version_id": dataset_versions[project_id][
+                        int(rng.integers(len(dataset_versions[project_id])))
+                    ],
+                    "created_by": user_ids[int(rng.choice(org_users[org_index]))],
+                    "status": str(
+                        rng.choice(["finished", "failed", "killed"], p=[0.85, 0.1, 0.05])
+                    ),
+                    "started_us": started_us,
+                    "interval_us": interval_us,
+                    "steps": int(run_sizes[index]),
+                }
+            )
+        _copy_rows(
+            conn,
+            "runs",
+            "run_id, experiment_id, dataset_version_id, run_name, status, started_at, "
+            "finished_at, created_by",
+            (
+                (
+                    run["run_id"],
+                    run["experiment_id"],
+                    run["dataset_version_id"],
+                    f"run-{index}",
+                    run["status"],
+                    PG_EPOCH + timedelta(microseconds=run["started_us"]),
+                    PG_EPOCH
+                    + timedelta(microseconds=run["started_us"] + run["steps"] * run["interval_us"]),
+                    run["created_by"],
+                )
+                for index, run in enumerate(runs)
+            ),
+        )
+        _copy_rows(
+            conn,
+            "run_configs",
+            "run_id, params_json, env_json, command_line, seed",
+            (
+                (
+                    run["run_id"],
+                    Jsonb(
+                        {
+                            "lr": float(rng.choice([0.1, 0.03, 0.01, 0.003, 0.001])),
+                            "batch_size": int(rng.choice([32, 64, 128, 256])),
+                            "optimizer": str(rng.choice(["adam", "sgd", "adamw"])),
+                            "dropout": round(float(rng.uniform(0.0, 0.5)), 2),
+                        }
+                    ),
+                    Jsonb({"python": "3.12", "cuda": "12.1"}),
+                    "python train.py",
+                    int(rng.integers(1, 100_000)),
+                )
+                for run in runs
+            ),
+        )
+        conn.commit()
+        print(f"Dimensions loaded in {time.perf_counter() - started:.1f}s")
+
+        indexes = [] if args.keep_indexes else _secondary_indexes(conn)
+        for name, _ in indexes:
+            conn.execute(f'DROP INDEX "{name}"')
+        conn.commit()
+
+        phase = time.perf_counter()
+        scopes = ["train", "val"]
+        step_metrics = [
+            (metric_id, scopes[index % len(scopes)], goal)
+            for index, (metric_id, _, goal) in enumerate(metrics)
+        ]
+        shards = balanced_shards(run_sizes, args.workers * 4)
+        seeds = rng.integers(0, 2**63, args.runs)
+        # Reserve one ingest_seq range for all step rows. Run this on an idle
+        # database: a concurrent nextval between the two calls lands inside it.
+        last_seq = conn.execute(
+            "SELECT setval('run_metric_values_ingest_seq',"
+            " nextval('run_metric_values_ingest_seq') + %s - 1)",
+            (step_rows,),
+        ).fetchone()[0]
+        conn.commit()
+        shard_rows = [int(run_sizes[shard].sum()) * len(step_metrics) for shard in shards]
+        shard_seqs = last_seq - step_rows + 1 + np.concatenate(([0], np.cumsum(shard_rows)[:-1]))
+        tasks = [
+            {
+                "conninfo": dsn,
+                "replica": replica,
+                "first_seq": int(first_seq),
+                "metrics": step_metrics,
+                "runs": [
+                    (
+                        runs[index]["run_id"],
+                        runs[index]["steps"],
+                        runs[index]["started_us"],
+                        runs[index]["interval_us"],
+                        int(seeds[index]),
+                    )
+                    for index in shard
+                ],
+            }
+            for shard, first_seq in zip(shards, shard_seqs)
+        ]
+        loaded = 0
+        with multiprocessing.Pool(args.workers) as pool:
+            for rows in pool.imap_unordered(copy_step_shard, tasks):
+                loaded += rows
+                elapsed = time.perf_counter() - phase
+                print(f"  step rows {loaded:,}/{step_rows:,} ({loaded / elapsed:,.0f} rows/s)")
+
+        phase = time.perf_counter()
+        conn.execute(f"SET maintenance_work_mem = '{args.maintenance_work_mem}'")
+        for name, definition in indexes:
+            conn.execute(definition)
+            conn.commit()
+            print(f"  rebuilt {name}")
+        if indexes:
+            print(f"Indexes rebuilt in {time.perf_counter() - phase:.1f}s")
+
+        finals = _copy_rows(
+            conn,
+            "run_metric_values",
+            STEP_COLUMNS,
+            (
+                (
+                    uuid.uuid4(),
+                    run["run_id"],
+                    metric_id,
+                    "val",
+                    None,
+                    float(rng.uniform(0.6, 0.99) if goal == "max" else rng.uniform(0.01, 0.5)),
+                    PG_EPOCH
+                    + timedelta(microseconds=run["started_us"] + run["steps"] * run["interval_us"]),
+                )
+                for run in runs
+                for metric_id, _, goal in metrics
+            ),
+        )
+        conn.commit()
+        conn.execute("ANALYZE runs")
+        conn.execute("ANALYZE run_metric_values")
+        conn.commit()
+
+    print(
+        f"Generated {prefix}: runs={args.runs}, run_metric_values={loaded + finals:,} "
+        f"in {time.perf_counter() - started:.1f}s"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--profile", choices=sorted(PROFILES), default="small")
+    parser.add_argument("--users", type=int)
+    parser.add_argument("--orgs", type=int)
+    parser.add_argument("--projects-per-org", type=int)
+    parser.add_argument("--experiments-per-project", type=int)
+    parser.add_argument("--runs", type=int)
+    parser.add_argument("--mean-steps", type=int)
+    parser.add_argument("--max-steps", type=int)
+    parser.add_argument("--metrics", type=int, default=4, help="step series per run")
+    parser.add_argument(
+        "--zipf-s", type=float, default=1.0, help="skew of run sizes and runs per experiment"
+    )
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--prefix", help="name prefix, unique per load (default: random)")
+    parser.add_argument(
+        "--keep-indexes", action="store_true", help="load step rows without dropping indexes"
+    )
+    parser.add_argument("--maintenance-work-mem", default="1GB")
+    parser.add_argument("--dry-run", action="store_true", help="print the plan only")
+    args = parser.parse_args()
+    for key, value in PROFILES[args.profile].items():
+        if getattr(args, key) is None:
+            setattr(args, key, value)
+    generate(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,399 @@
+#!/usr/bin/env python3
+"""Replay a traffic mix against the API and report latency per endpoint.
+
+    python scripts/load_test.py --mix default --concurrency 50 --duration 60
+    python scripts/load_test.py --mix ingest --soak --duration 3600 --sample-interval 30
+
+API_EMAIL and API_PASSWORD come from the environment or .env. Setup goes
+through the synchronous `TrackingClient`. It creates a throwaway org,
+project, dataset version, experiment and `--runs` running runs. The load
+phase is a pool of asyncio virtual users on one `httpx.AsyncClient`. Each user
+picks an actor by the mix weights and waits `--think-ms` between requests:
+
+- trainer: POST /api/runs/{id}/metrics with a batch of step points
+- dashboard: GET /api/reports/* (half the requests revalidate with If-None-Match)
+- importer: POST /api/batch-import with a small metrics CSV
+
+At the end it prints p50/p95/p99 latency, requests per second and errors
+per endpoint. Soak mode also prints a line per `--sample-interval`. It reads
+the backend container's memory with `docker stats` and reports the growth
+rate, so a leak shows up as a steady upward slope.
+"""
+import argparse
+import asyncio
+import csv
+import hashlib
+import io
+import itertools
+import json
+import os
+import random
+import re
+import subprocess
+import time
+from collections import defaultdict
+from datetime import datetime, timezone
+from pathlib import Path
+
+try:
+    import httpx
+except ImportError as exc:
+    raise SystemExit("Missing dependency: httpx. Install with 'pip install httpx'.") from exc
+
+from tracking_client import TrackingClient, load_env_file, require_env
+
+MIXES = {
+    "default": {"trainer": 0.70, "dashboard": 0.25, "importer": 0.05},
+    "ingest": {"trainer": 0.90, "dashboard": 0.05, "importer": 0.05},
+    "read": {"trainer": 0.10, "dashboard": 0.90, "importer": 0.00},
+    "import": {"trainer": 0.20, "dashboard": 0.20, "importer": 0.60},
+}
+METRIC_SPECS = [
+    {"key": "accuracy", "display_name": "Accuracy", "unit": "ratio", "goal": "max"},
+    {"key": "val_loss", "display_name": "Validation Loss", "unit": "loss", "goal": "min"},
+]
+MEMORY_UNITS = {
+    "B": 1,
+    "KiB": 1024,
+    "MiB": 1024**2,
+    "GiB": 1024**3,
+    "kB": 1000,
+    "MB": 1000**2,
+    "GB": 1000**3,
+}
+
+
+def percentile(samples: list[float], fraction: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+class Stats:
+    def __init__(self) -> None:
+        self.latencies: dict[str, list[float]] = defaultdict(list)
+        self.errors: dict[str, int] = defaultdict(int)
+        self.window: list[float] = []
+
+    def record(self, endpoint: str, elapsed_ms: float, ok: bool) -> None:
+        self.latencies[endpoint].append(elapsed_ms)
+        self.window.append(elapsed_ms)
+        if not ok:
+            self.errors[endpoint] += 1
+
+    def take_window(self) -> list[float]:
+        window, self.window = self.window, []
+        return window
+
+    def report(self, elapsed_s: float) -> list[dict]:
+        rows = []
+        for endpoint, samples in sorted(self.latencies.items()):
+            rows.append(
+                {
+                    "endpoint": endpoint,
+                    "requests": len(samples),
+                    "rps": round(len(samples) / elapsed_s, 1),
+                    "p50_ms": round(percentile(samples, 0.50), 1),
+                    "p95_ms": round(percentile(samples, 0.95), 1),
+                    "p99_ms": round(percentile(samples, 0.99), 1),
+                    "errors": self.errors[endpoint],
+                }
+            )
+        return rows
+
+
+class Target:
+    """IDs created during setup, shared by every virtual user."""
+
+    def __init__(self, project_id: str, experiment_id: str, run_ids: list[str]) -> None:
+        self.project_id = project_id
+        self.experiment_id = experiment_id
+        self.run_ids = run_ids
+        self.steps = itertools.count()
+        self.etags: dict[str, str] = {}
+
+
+def setup(client: TrackingClient, runs: int) -> Target:
+    suffix = datetime.now(timezone.utc).strftime("%Y%m%d%H%M%S")
+    known = {metric["key"] for metric in client.get("/api/metric-definitions")}
+    for spec in METRIC_SPECS:
+        if spec["key"] not in known:
+            client.post("/api/metric-definitions", json=spec)
+    org = client.post("/api/orgs", json={"name": f"load-org-{suffix}", "description": "Load test"})
+    project = client.post(
+        "/api/projects",
+        json={"org_id": org["org_id"], "name": f"load-project-{suffix}", "status": "active"},
+    )
+    dataset = client.post(
+        "/api/datasets",
+        json={
+            "project_id": project["project_id"],
+            "name": f"load-dataset-{suffix}",
+            "task_type": "classification",
+        },
+    )
+    version = client.post(
+        "/api/dataset-versions/register",
+        json={
+            "dataset_id": dataset["dataset_id"],
+            "version_label": "v1",
+            "storage_uri": f"s3://load-test/{suffix}",
+            "content_hash": f"sha256:{hashlib.sha256(suffix.encode()).hexdigest()}",
+        },
+    )
+    experiment = client.post(
+        "/api/experiments",
+        json={"project_id": project["project_id"], "name": f"load-experiment-{suffix}"},
+    )
+    run_ids = [
+        client.post(
+            "/api/runs",
+            json={
+                "experiment_id": experiment["experiment_id"],
+                "dataset_version_id": version["dataset_version_id"],
+                "run_name": f"load-run-{index}",
+                "status": "running",
+                "config": {"params_json": {"lr": random.choice([0.1, 0.01, 0.001])}},
+            },
+        )["run_id"]
+        for index in range(runs)
+    ]
+    # Final values so the report endpoints have something to rank.
+    for run_id in run_ids:
+        client.post(
+            f"/api/runs/{run_id}/metrics",
+            json=[
+                {"metric_key": "accuracy", "scope": "val", "value": random.uniform(0.5, 0.99)},
+                {"metric_key": "val_loss", "scope": "val", "value": random.uniform(0.05, 1.0)},
+            ],
+        )
+    return Target(project["project_id"], experiment["experiment_id"], run_ids)
+
+
+async def trainer(http: httpx.AsyncClient, target: Target, batch: int):
+    run_id = random.choice(target.run_ids)
+    first = next(target.steps) * batch
+    points = [
+        {
+            "metric_key": "accuracy",
+            "scope": "train",
+            "step": first + offset,
+            "value": random.random(),
+        }
+        for offset in range(batch)
+    ]
+    return "POST /runs/{id}/metrics", await http.post(f"/api/runs/{run_id}/metrics", json=points)
+
+
+async def dashboard(http: httpx.AsyncClient, target: Target, batch: int):
+    experiment, project = target.experiment_id, target.project_id
+    endpoint, path = random.choice(
+        [
+            (
+                "GET /reports/experiments/{id}/leaderboard",
+                f"/api/reports/experiments/{experiment}/leaderboard?metric_key=accuracy&scope=val",
+            ),
+            (
+                "GET /reports/experiments/{id}/best-run",
+                f"/api/reports/experiments/{experiment}/best-run?metric_key=accuracy&scope=val",
+            ),
+            (
+                "GET /reports/projects/{id}/dashboard",
+                f"/api/reports/projects/{project}/dashboard",
+            ),
+            (
+                "GET /reports/experiments/{id}/param-importance",
+                f"/api/reports/experiments/{experiment}/param-importance?metric_key=accuracy",
+            ),
+        ]
+    )
+    headers = {}
+    if path in target.etags and random.random() < 0.5:
+        headers["If-None-Match"] = target.etags[path]
+    response = await http.get(path, headers=headers)
+    if "etag" in response.headers:
+        target.etags[path] = response.headers["etag"]
+    return endpoint, response
+
+
+async def importer(http: httpx.AsyncClient, target: Target, batch: int):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(["run_id", "metric_key", "scope", "step", "value"])
+    run_id = random.choice(target.run_ids)
+    first = next(target.steps) * batch
+    for offset in range(batch):
+        writer.writerow([run_id, "val_loss", "val", first + offset, random.random()])
+    return "POST /batch-import", await http.post(
+        "/api/batch-import",
+        data={"job_type": "metrics", "format": "csv"},
+        files={"file": ("metrics.csv", buffer.getvalue().encode(), "text/csv")},
+    )
+
+
+ACTORS = {"trainer": trainer, "dashboard": dashboard, "importer": importer}
+
+
+async def virtual_user(
+    http: httpx.AsyncClient, target: Target, stats: Stats, args, deadline: float
+) -> None:
+    names = [name for name, weight in MIXES[args.mix].items() if weight > 0]
+    weights = [MIXES[args.mix][name] for name in names]
+    while time.monotonic() < deadline:
+        actor = ACTORS[random.choices(names, weights)[0]]
+        started = time.perf_counter()
+        try:
+            endpoint, response = await actor(http, target, args.batch)
+            ok = response.status_code < 400
+        except httpx.HTTPError:
+            endpoint, ok = f"{actor.__name__} (transport error)", False
+        stats.record(endpoint, (time.perf_counter() - started) * 1000, ok)
+        if args.think_ms:
+            await asyncio.sleep(random.expovariate(1000 / args.think_ms))
+
+
+def container_memory_bytes(container: str) -> int | None:
+    try:
+        output = subprocess.run(
+            ["docker", "stats", "--no-stream", "--format", "{{.MemUsage}}", container],
+            capture_output=True,
+            text=True,
+            check=True,
+            timeout=30,
+        ).stdout
+    except (OSError, subprocess.SubprocessError):
+        return None
+    match = re.match(r"\s*([\d.]+)\s*([A-Za-z]+)", output)
+    if not match or match.group(2) not in MEMORY_UNITS:
+        return None
+    return int(float(match.group(1)) * MEMORY_UNITS[match.group(2)])
+
+
+def backend_container() -> str | None:
+    try:
+        output = subprocess.run(
+            ["docker", "compose", "ps", "-q", "backend"],
+            capture_output=True,
+            text=True,
+            check=True,
+            timeout=30,
+        ).stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return output or None
+
+
+def growth_mb_per_hour(samples: list[tuple[float, int]]) -> float | None:
+    """Least-squares slope of memory over time."""
+    if len(samples) < 2:
+        return None
+    mean_t = sum(t for t, _ in samples) / len(samples)
+    mean_m = sum(m for _, m in samples) / len(samples)
+    variance = sum((t - mean_t) ** 2 for t, _ in samples)
+    if not variance:
+        return None
+    slope = sum((t - mean_t) * (m - mean_m) for t, m in samples) / variance
+    return slope * 3600 / 1024**2
+
+
+async def monitor(stats: Stats, args, container: str | None, deadline: float, memory: list) -> None:
+    started = time.monotonic()
+    while time.monotonic() < deadline:
+        await asyncio.sleep(args.sample_interval)
+        window = stats.take_window()
+        used = await asyncio.to_thread(container_memory_bytes, container) if container else None
+        elapsed = time.monotonic() - started
+        if used is not None:
+            memory.append((elapsed, used))
+        print(
+            f"[{elapsed:7.0f}s] rps={len(window) / args.sample_interval:8.1f} "
+            f"p95={percentile(window, 0.95):7.1f}ms"
+            + (f" backend_mem={used / 1024**2:8.1f}MiB" if used is not None else "")
+        )
+
+
+async def run_load(args, token: str, target: Target) -> dict:
+    stats = Stats()
+    memory: list[tuple[float, int]] = []
+    limits = httpx.Limits(
+        max_connections=args.concurrency, max_keepalive_connections=args.concurrency
+    )
+    async with httpx.AsyncClient(
+        base_url=args.base_url,
+        headers={"Authorization": f"Bearer {token}"},
+        limits=limits,
+        timeout=args.timeout,
+    ) as http:
+        started = time.monotonic()
+        deadline = started + args.duration
+        tasks = [virtual_user(http, target, stats, args, deadline) for _ in range(args.concurrency)]
+        if args.soak:
+            container = args.container or backend_container()
+            if not container:
+                print("Backend container not found, memory will not be sampled")
+            tasks.append(monitor(stats, args, container, deadline, memory))
+        await asyncio.gather(*tasks)
+        elapsed = time.monotonic() - started
+
+    result = {"mix": args.mix, "concurrency": args.concurrency, "duration_s": round(elapsed, 1)}
+    result["endpoints"] = stats.report(elapsed)
+    if args.soak and memory:
+        result["memory"] = {
+            "start_mib": round(memory[0][1] / 1024**2, 1),
+            "end_mib": round(memory[-1][1] / 1024**2, 1),
+            "growth_mib_per_hour": round(growth_mb_per_hour(memory) or 0.0, 1),
+        }
+    return result
+
+
+def print_report(result: dict) -> None:
+    print(
+        f"\nmix={result['mix']} concurrency={result['concurrency']} "
+        f"duration={result['duration_s']}s"
+    )
+    print(f"{'endpoint':<48} {'reqs':>7} {'rps':>7} {'p50':>7} {'p95':>7} {'p99':>7} {'err':>5}")
+    for row in result["endpoints"]:
+        print(
+            f"{row['endpoint']:<48} {row['requests']:>7} {row['rps']:>7} {row['p50_ms']:>7} "
+            f"{row['p95_ms']:>7} {row['p99_ms']:>7} {row['errors']:>5}"
+        )
+    if "memory" in result:
+        memory = result["memory"]
+        print(
+            f"backend memory {memory['start_mib']} -> {memory['end_mib']} MiB, "
+            f"trend {memory['growth_mib_per_hour']:+} MiB/h"
+        )
+
+
+def main() -> None:
+    root = Path(__file__).resolve().parents[1]
+    load_env_file(root / ".env")
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--base-url", default=os.getenv("API_URL", "http://localhost:8000"))
+    parser.add_argument("--mix", choices=sorted(MIXES), default="default")
+    parser.add_argument("--concurrency", type=int, default=20, help="virtual users")
+    parser.add_argument("--duration", type=float, default=60, help="seconds")
+    parser.add_argument("--think-ms", type=float, default=0, help="mean pause between requests")
+    parser.add_argument("--batch", type=int, default=50, help="points per metrics post or CSV")
+    parser.add_argument("--runs", type=int, default=20, help="runs created for trainers")
+    parser.add_argument("--timeout", type=float, default=30)
+    parser.add_argument("--soak", action="store_true", help="sample backend memory over time")
+    parser.add_argument("--sample-interval", type=float, default=10)
+    parser.add_argument("--container", help="backend container (default: docker compose ps)")
+    parser.add_argument("--output", type=Path, help="write the report JSON here")
+    args = parser.parse_args()
+
+    with TrackingClient(args.base_url) as client:
+        token = client.login(require_env("API_EMAIL"), require_env("API_PASSWORD"))
+        target = setup(client, args.runs)
+
+    result = asyncio.run(run_load(args, token, target))
+    print_report(result)
+    if args.output:
+        args.output.write_text(json.dumps(result, indent=2) + "\n", encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
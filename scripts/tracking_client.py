@@ -0,0 +1,272 @@
+"""Reusable HTTP client for the ml-experiments API.
+
+`TrackingClient` keeps one pooled `requests.Session` for every call and retries
+transient failures. The server has no idempotency keys, so POST and PATCH are
+only retried when the request provably never reached it.
+`MetricLogger` buffers metric points in memory and posts them to
+`/api/runs/{run_id}/metrics` in batches from a background thread. The
+training loop therefore never waits on the tracking server.
+"""
+import atexit
+import logging
+import os
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+try:
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.exceptions import MaxRetryError, NewConnectionError
+except ImportError as exc:
+    raise SystemExit("Missing dependency: requests. Install with 'pip install requests'.") from exc
+
+logger = logging.getLogger("tracking_client")
+
+RETRY_STATUSES = {429, 502, 503, 504}
+# 429 and 503 are returned before the request is processed, so they are safe
+# to retry for any method. 502/504 may come after the backend committed.
+UNPROCESSED_STATUSES = {429, 503}
+IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS", "PUT", "DELETE"}
+
+
+class ApiError(RuntimeError):
+    def __init__(self, method: str, path: str, status_code: int, detail) -> None:
+        super().__init__(f"{method} {path} failed: {status_code} {detail}")
+        self.status_code = status_code
+        self.detail = detail
+
+
+def load_env_file(path: Path) -> None:
+    if not path.exists():
+        return
+    for line in path.read_text(encoding="utf-8").splitlines():
+        raw = line.strip()
+        if not raw or raw.startswith("#") or "=" not in raw:
+            continue
+        key, value = raw.split("=", 1)
+        if key and key not in os.environ:
+            os.environ[key] = value
+
+
+def require_env(name: str) -> str:
+    value = os.getenv(name)
+    if not value:
+        raise SystemExit(f"Missing required env var: {name}")
+    return value
+
+
+def _never_sent(exc: requests.RequestException) -> bool:
+    """True when the connection failed before any request bytes were sent."""
+    if isinstance(exc, requests.ConnectTimeout):
+        return True
+    reason = exc.args[0] if exc.args else None
+    return isinstance(reason, MaxRetryError) and isinstance(reason.reason, NewConnectionError)
+
+
+class TrackingClient:
+    def __init__(
+        self,
+        base_url: str,
+        token: str | None = None,
+        timeout: float = 30,
+        max_retries: int = 3,
+        backoff_seconds: float = 0.5,
+        pool_size: int = 10,
+    ) -> None:
+        self.base_url = base_url.rstrip("/")
+        self.token = token
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_seconds = backoff_seconds
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def __enter__(self) -> "TrackingClient":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self.session.close()
+
+    def login(self, email: str, password: str) -> str:
+        response = self.session.post(
+            self.base_url + "/api/auth/token",
+            data={"username": email, "password": password},
+            headers={"Content-Type": "application/x-www-form-urlencoded"},
+            timeout=self.timeout,
+        )
+        if response.status_code >= 400:
+            raise ApiError("POST", "/api/auth/token", response.status_code, response.text)
+        self.token = response.json()["access_token"]
+        return self.token
+
+    def request(self, method: str, path: str, **kwargs):
+        """Send a request, retrying connection errors and 429/502/503/504.
+
+        Idempotent methods are retried on any of these. POST and PATCH are
+        retried only on connect failures and 429/503. A timeout or a 502/504
+        may arrive after the server committed, and re-posting would duplicate
+        the rows (run_metric_values has no natural key to dedupe on).
+        """
+        headers = dict(kwargs.pop("headers", {}) or {})
+        if self.token:
+            headers["Authorization"] = f"Bearer {self.token}"
+        idempotent = method.upper() in IDEMPOTENT_METHODS
+
+        attempt = 0
+        while True:
+            try:
+                response = self.session.request(
+                    method,
+                    self.base_url + path,
+                    headers=headers,
+                    timeout=self.timeout,
+                    **kwargs,
+                )
+            except (requests.ConnectionError, requests.Timeout) as exc:
+                if attempt >= self.max_retries or not (idempotent or _never_sent(exc)):
+                    raise
+            else:
+                retry_statuses = RETRY_STATUSES if idempotent else UNPROCESSED_STATUSES
+                if response.status_code not in retry_statuses or attempt >= self.max_retries:
+                    break
+            attempt += 1
+            time.sleep(self.backoff_seconds * 2 ** (attempt - 1))
+
+        if response.status_code >= 400:
+            try:
+                detail = response.json()
+            except ValueError:
+                detail = response.text
+            raise ApiError(method, path, response.status_code, detail)
+        if response.status_code == 204 or not response.content:
+            return None
+        return response.json()
+
+    def get(self, path: str, **kwargs):
+        return self.request("GET", path, **kwargs)
+
+    def post(self, path: str, **kwargs):
+        return self.request("POST", path, **kwargs)
+
+
+class MetricLogger:
+    """Buffer metric points and flush them from a background thread.
+
+    A flush starts when `batch_size` points are pending or every
+    `flush_interval` seconds, whichever comes first. `close()` is registered
+    with `atexit`, so points still in the buffer are sent when the process ends.
+    """
+
+    def __init__(
+        self,
+        client: TrackingClient,
+        run_id: str,
+        batch_size: int = 500,
+        flush_interval: float = 2.0,
+    ) -> None:
+        self.client = client
+        self.run_id = run_id
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.sent = 0
+        self.failed = 0
+        self._buffer: list[dict] = []
+        self._in_flight = 0
+        self._lock = threading.Lock()
+        self._wakeup = threading.Condition(self._lock)
+        self._drained = threading.Condition(self._lock)
+        self._closed = False
+        self._thread = threading.Thread(
+            target=self._worker, name=f"metric-logger-{run_id}", daemon=True
+        )
+        self._thread.start()
+        atexit.register(self.close)
+
+    def __enter__(self) -> "MetricLogger":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def log(
+        self,
+        metric_key: str,
+        value: float,
+        step: int | None = None,
+        scope: str = "train",
+        recorded_at: datetime | None = None,
+    ) -> None:
+        point = {
+            "metric_key": metric_key,
+            "scope": scope,
+            "step": step,
+            "value": float(value),
+            "recorded_at": (recorded_at or datetime.now(timezone.utc)).isoformat(),
+        }
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("MetricLogger is closed")
+            self._buffer.append(point)
+            if len(self._buffer) >= self.batch_size:
+                self._wakeup.notify()
+
+    def log_many(
+        self, values: dict[str, float], step: int | None = None, scope: str = "train"
+    ) -> None:
+        recorded_at = datetime.now(timezone.utc)
+        for metric_key, value in values.items():
+            self.log(metric_key, value, step=step, scope=scope, recorded_at=recorded_at)
+
+    def flush(self, timeout: float | None = None) -> bool:
+        """Block until everything logged so far has been sent or has failed."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._lock:
+            self._wakeup.notify()
+            while self._buffer or self._in_flight:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._drained.wait(remaining)
+        return True
+
+    def close(self) -> None:
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._wakeup.notify()
+        self._thread.join()
+        atexit.unregister(self.close)
+
+    def _worker(self) -> None:
+        while True:
+            with self._lock:
+                if not self._closed and len(self._buffer) < self.batch_size:
+                    self._wakeup.wait(self.flush_interval)
+                batch = self._buffer
+                self._buffer = []
+                self._in_flight = len(batch)
+                closed = self._closed
+            for start in range(0, len(batch), self.batch_size):
+                self._send(batch[start : start + self.batch_size])
+            with self._lock:
+                self._in_flight = 0
+                self._drained.notify_all()
+                if closed and not self._buffer:
+                    return
+
+    def _send(self, points: list[dict]) -> None:
+        try:
+            self.client.post(f"/api/runs/{self.run_id}/metrics", json=points)
+        except Exception:
+            self.failed += len(points)
+            logger.exception("Failed to send %d metric points", len(points))
+        else:
+            self.sent += len(points)
@@ -0,0 +1,186 @@
+-- Best run per (experiment, metric, scope) over final (step IS NULL) values.
+-- Inserts update the summary in place; updates and deletes recompute only the
+-- affected (experiment, metric, scope) group.
+CREATE OR REPLACE FUNCTION fn_refresh_experiment_metric_summary(
+    p_experiment_id uuid,
+    p_metric_id uuid,
+    p_scope text
+) RETURNS void AS $$
+DECLARE
+    v_project_id uuid;
+    v_goal text;
+    v_best_run_id uuid;
+    v_best_value double precision;
+    v_best_recorded_at timestamptz;
+    v_sample_size integer;
+BEGIN
+    SELECT project_id
+    INTO v_project_id
+    FROM experiments
+    WHERE experiment_id = p_experiment_id;
+
+    SELECT goal
+    INTO v_goal
+    FROM metric_definitions
+    WHERE metric_id = p_metric_id;
+
+    IF v_project_id IS NULL OR v_goal IS NULL THEN
+        RETURN;
+    END IF;
+
+    SELECT COUNT(*)
+    INTO v_sample_size
+    FROM run_metric_values rmv
+    JOIN runs r ON r.run_id = rmv.run_id
+    WHERE r.experiment_id = p_experiment_id
+      AND rmv.metric_id = p_metric_id
+      AND rmv.scope = p_scope
+      AND rmv.step IS NULL;
+
+    IF v_sample_size = 0 THEN
+        DELETE FROM experiment_metric_summary
+        WHERE experiment_id = p_experiment_id
+          AND metric_id = p_metric_id
+          AND scope = p_scope;
+        RETURN;
+    END IF;
+
+    SELECT rmv.run_id, rmv.value, rmv.recorded_at
+    INTO v_best_run_id, v_best_value, v_best_recorded_at
+    FROM run_metric_values rmv
+    JOIN runs r ON r.run_id = rmv.run_id
+    WHERE r.experiment_id = p_experiment_id
+      AND rmv.metric_id = p_metric_id
+      AND rmv.scope = p_scope
+      AND rmv.step IS NULL
+    ORDER BY
+      CASE WHEN v_goal = 'min' THEN rmv.value END ASC,
+      CASE WHEN v_goal = 'max' THEN rmv.value END DESC,
+      CASE WHEN v_goal = 'last' THEN rmv.recorded_at END DESC
+    LIMIT 1;
+
+    INSERT INTO experiment_metric_summary (
+        experiment_id,
+        metric_id,
+        scope,
+        project_id,
+        best_value,
+        best_run_id,
+        best_recorded_at,
+        sample_size,
+        updated_at
+    ) VALUES (
+        p_experiment_id,
+        p_metric_id,
+        p_scope,
+        v_project_id,
+        v_best_value,
+        v_best_run_id,
+        v_best_recorded_at,
+        v_sample_size,
+        now()
+    )
+    ON CONFLICT (experiment_id, metric_id, scope) DO UPDATE SET
+        project_id = EXCLUDED.project_id,
+        best_value = EXCLUDED.best_value,
+        best_run_id = EXCLUDED.best_run_id,
+        best_recorded_at = EXCLUDED.best_recorded_at,
+        sample_size = EXCLUDED.sample_size,
+        updated_at = EXCLUDED.updated_at;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION fn_update_experiment_metric_summary() RETURNS trigger AS $$
+DECLARE
+    v_experiment_id uuid;
+    v_project_id uuid;
+    v_goal text;
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') AND OLD.step IS NULL THEN
+        SELECT experiment_id
+        INTO v_experiment_id
+        FROM runs
+        WHERE run_id = OLD.run_id;
+
+        IF v_experiment_id IS NOT NULL THEN
+            PERFORM fn_refresh_experiment_metric_summary(v_experiment_id, OLD.metric_id, OLD.scope);
+        END IF;
+    END IF;
+
+    IF TG_OP = 'DELETE' OR NEW.step IS NOT NULL THEN
+        RETURN NULL;
+    END IF;
+
+    SELECT r.experiment_id, e.project_id
+    INTO v_experiment_id, v_project_id
+    FROM runs r
+    JOIN experiments e ON e.experiment_id = r.experiment_id
+    WHERE r.run_id = NEW.run_id;
+
+    IF v_experiment_id IS NULL THEN
+        RETURN NULL;
+    END IF;
+
+    IF TG_OP = 'UPDATE' THEN
+        PERFORM fn_refresh_experiment_metric_summary(v_experiment_id, NEW.metric_id, NEW.scope);
+        RETURN NULL;
+    END IF;
+
+    SELECT goal
+    INTO v_goal
+    FROM metric_definitions
+    WHERE metric_id = NEW.metric_id;
+
+    IF v_goal IS NULL THEN
+        RETURN NULL;
+    END IF;
+
+    -- The upsert locks the summary row, so the conditional update below sees
+    -- the current best even under concurrent inserts for the same group.
+    INSERT INTO experiment_metric_summary (
+        experiment_id,
+        metric_id,
+        scope,
+        project_id,
+        best_value,
+        best_run_id,
+        best_recorded_at,
+        sample_size,
+        updated_at
+    ) VALUES (
+        v_experiment_id,
+        NEW.metric_id,
+        NEW.scope,
+        v_project_id,
+        NEW.value,
+        NEW.run_id,
+        NEW.recorded_at,
+        1,
+        now()
+    )
+    ON CONFLICT (experiment_id, metric_id, scope) DO UPDATE SET
+        sample_size = experiment_metric_summary.sample_size + 1,
+        updated_at = EXCLUDED.updated_at;
+
+    UPDATE experiment_metric_summary
+    SET best_value = NEW.value,
+        best_run_id = NEW.run_id,
+        best_recorded_at = NEW.recorded_at
+    WHERE experiment_id = v_experiment_id
+      AND metric_id = NEW.metric_id
+      AND scope = NEW.scope
+      AND (
+          best_run_id IS NULL
+          OR (v_goal = 'min' AND NEW.value < best_value)
+          OR (v_goal = 'max' AND NEW.value > best_value)
+          OR (v_goal = 'last' AND NEW.recorded_at > best_recorded_at)
+      );
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_experiment_metric_summary ON run_metric_values;
+CREATE TRIGGER trg_experiment_metric_summary
+AFTER INSERT OR UPDATE OR DELETE ON run_metric_values
+FOR EACH ROW EXECUTE FUNCTION fn_update_experiment_metric_summary();
@@ -0,0 +1,45 @@
+-- Live metric streaming. Every inserted point takes the next ingest_seq, which is
+-- the resume cursor of GET /runs/{id}/metrics/stream. Rows from before migration
+-- 0013 keep NULL and are only returned by the full history endpoints.
+CREATE SEQUENCE IF NOT EXISTS run_metric_values_ingest_seq AS bigint;
+
+ALTER SEQUENCE run_metric_values_ingest_seq OWNED BY run_metric_values.ingest_seq;
+
+-- nextval follows assignment order, not commit order: with a column default, a
+-- writer holding 100 can commit after one holding 101, and a reader that already
+-- moved its cursor to 101 never sees 100. The trigger takes a per-run advisory
+-- lock, held until commit, before numbering the row. Writers to one run therefore
+-- commit in ingest_seq order, and every cursor is safe. Writers to different runs
+-- do not wait for each other.
+ALTER TABLE run_metric_values ALTER COLUMN ingest_seq DROP DEFAULT;
+
+CREATE OR REPLACE FUNCTION fn_run_metric_values_ingest_seq() RETURNS trigger AS $$
+BEGIN
+    PERFORM pg_advisory_xact_lock(
+        'run_metric_values'::regclass::oid::integer, hashtext(NEW.run_id::text)
+    );
+    NEW.ingest_seq := nextval('run_metric_values_ingest_seq');
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_run_metric_values_ingest_seq ON run_metric_values;
+CREATE TRIGGER trg_run_metric_values_ingest_seq
+BEFORE INSERT ON run_metric_values
+FOR EACH ROW EXECUTE FUNCTION fn_run_metric_values_ingest_seq();
+
+-- Statement-level, one notification per run and insert. Postgres collapses
+-- identical payloads within a transaction, so row-at-a-time imports send one.
+CREATE OR REPLACE FUNCTION fn_notify_run_metric_values() RETURNS trigger AS $$
+BEGIN
+    PERFORM pg_notify('run_metric_values', changed.run_id::text)
+    FROM (SELECT DISTINCT run_id FROM new_rows) changed;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_run_metric_values_notify ON run_metric_values;
+CREATE TRIGGER trg_run_metric_values_notify
+AFTER INSERT ON run_metric_values
+REFERENCING NEW TABLE AS new_rows
+FOR EACH STATEMENT EXECUTE FUNCTION fn_notify_run_metric_values();
@@ -0,0 +1,186 @@
+-- Per-project change counter. Report caches key their entries on it, so any
+-- write that can change a report bumps the version of the projects it touches.
+--
+-- The counter is split into 16 rows per project, and a writer bumps the shard
+-- of its backend. Concurrent trainers in one project then rarely wait on the
+-- same row lock until commit. Readers use the sum of the shards: every
+-- committed bump adds one, whatever the commit order, so the sum changes
+-- whenever the visible data does.
+--
+-- plpgsql rather than sql so the body is only checked when called; 0007
+-- installs it before migration 0019 adds the shard column. SECURITY DEFINER
+-- lets the join see every project under row-level security.
+CREATE OR REPLACE FUNCTION fn_bump_project_data_version(p_project_ids uuid[]) RETURNS void AS $$
+BEGIN
+    INSERT INTO project_data_versions (project_id, shard, version, updated_at)
+    -- The join skips projects removed by the statement being tracked, e.g. when
+    -- deleting a project cascades into its experiments and runs.
+    SELECT DISTINCT p.project_id, (pg_backend_pid() % 16)::smallint, 1, now()
+    FROM unnest(p_project_ids) AS changed(project_id)
+    JOIN ml_projects p ON p.project_id = changed.project_id
+    ORDER BY p.project_id
+    ON CONFLICT (project_id, shard) DO UPDATE SET
+        version = project_data_versions.version + 1,
+        updated_at = EXCLUDED.updated_at;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER SET search_path = public;
+
+-- Statement-level triggers: a bulk metrics insert bumps each project once.
+-- Transition tables are only referenced in the branches of the firing event.
+CREATE OR REPLACE FUNCTION fn_experiments_data_version() RETURNS trigger AS $$
+DECLARE
+    v_project_ids uuid[] := '{}';
+BEGIN
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        v_project_ids := v_project_ids || ARRAY(SELECT project_id FROM new_rows);
+    END IF;
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        v_project_ids := v_project_ids || ARRAY(SELECT project_id FROM old_rows);
+    END IF;
+    PERFORM fn_bump_project_data_version(v_project_ids);
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION fn_runs_data_version() RETURNS trigger AS $$
+DECLARE
+    v_project_ids uuid[] := '{}';
+BEGIN
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        v_project_ids := v_project_ids || ARRAY(
+            SELECT DISTINCT e.project_id
+            FROM new_rows n
+            JOIN experiments e ON e.experiment_id = n.experiment_id
+        );
+    END IF;
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        v_project_ids := v_project_ids || ARRAY(
+            SELECT DISTINCT e.project_id
+            FROM old_rows o
+            JOIN experiments e ON e.experiment_id = o.experiment_id
+        );
+    END IF;
+    PERFORM fn_bump_project_data_version(v_project_ids);
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Shared by run_metric_values and run_configs: both reference runs by run_id.
+CREATE OR REPLACE FUNCTION fn_run_children_data_version() RETURNS trigger AS $$
+DECLARE
+    v_project_ids uuid[] := '{}';
+BEGIN
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        v_project_ids := v_project_ids || ARRAY(
+            SELECT DISTINCT e.project_id
+            FROM (SELECT DISTINCT run_id FROM new_rows) n
+            JOIN runs r ON r.run_id = n.run_id
+            JOIN experiments e ON e.experiment_id = r.experiment_id
+        );
+    END IF;
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        v_project_ids := v_project_ids || ARRAY(
+            SELECT DISTINCT e.project_id
+            FROM (SELECT DISTINCT run_id FROM old_rows) o
+            JOIN runs r ON r.run_id = o.run_id
+            JOIN experiments e ON e.experiment_id = r.experiment_id
+        );
+    END IF;
+    PERFORM fn_bump_project_data_version(v_project_ids);
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Renaming a project or changing its goal shows up in dashboards.
+CREATE OR REPLACE FUNCTION fn_ml_projects_data_version() RETURNS trigger AS $$
+BEGIN
+    PERFORM fn_bump_project_data_version(ARRAY(SELECT project_id FROM new_rows));
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Metric names and goals (which direction is "best") appear in every project's
+-- leaderboards and dashboards. Edits are rare, so they bump all projects.
+CREATE OR REPLACE FUNCTION fn_metric_definitions_data_version() RETURNS trigger AS $$
+BEGIN
+    PERFORM fn_bump_project_data_version(ARRAY(SELECT project_id FROM ml_projects));
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER SET search_path = public;
+
+DROP TRIGGER IF EXISTS trg_experiments_data_version_insert ON experiments;
+CREATE TRIGGER trg_experiments_data_version_insert
+AFTER INSERT ON experiments
+REFERENCING NEW TABLE AS new_rows
+FOR EACH STATEMENT EXECUTE FUNCTION fn_experiments_data_version();
+
+DROP TRIGGER IF EXISTS trg_experiments_data_version_update ON experiments;
+CREATE TRIGGER trg_experiments_data_version_update
+AFTER UPDATE ON experiments
+REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+FOR EACH STATEMENT EXECUTE FUNCTION fn_experiments_data_version();
+
+DROP TRIGGER IF EXISTS trg_experiments_data_version_delete ON experiments;
+CREATE TRIGGER trg_experiments_data_version_delete
+AFTER DELETE ON experiments
+REFERENCING OLD TABLE AS old_rows
+FOR EACH STATEMENT EXECUTE FUNCTION fn_experiments_data_version();
+
+DROP TRIGGER IF EXISTS trg_runs_data_version_insert ON runs;
+CREATE TRIGGER trg_runs_data_version_insert
+AFTER INSERT ON runs
+REFERENCING NEW TABLE AS new_rows
+FOR EACH STATEMENT EXECUTE FUNCTION fn_runs_data_version();
+
+DROP TRIGGER IF EXISTS trg_runs_data_version_update ON runs;
+CREATE TRIGGER trg_runs_data_version_update
+AFTER UPDATE ON runs
+REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+FOR EACH STATEMENT EXECUTE FUNCTION fn_runs_data_version();
+
+DROP TRIGGER IF EXISTS trg_runs_data_version_delete ON runs;
+CREATE TRIGGER trg_runs_data_version_delete
+AFTER DELETE ON runs
+REFERENCING OLD TABLE AS old_rows
+FOR EACH STATEMENT EXECUTE FUNCTION fn_runs_data_version();
+
+DROP TRIGGER IF EXISTS trg_rmv_data_version_insert ON run_metric_values;
+CREATE TRIGGER trg_rmv_data_version_insert
+AFTER INSERT ON run_metric_values
+REFERENCING NEW TABLE AS new_rows
+FOR EACH STATEMENT EXECUTE FUNCTION fn_run_children_data_version();
+
+DROP TRIGGER IF EXISTS trg_rmv_data_version_update ON run_metric_values;
+CREATE TRIGGER trg_rmv_data_version_update
+AFTER UPDATE ON run_metric_values
+REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+FOR EACH STATEMENT EXECUTE FUNCTION fn_run_children_data_version();
+
+DROP TRIGGER IF EXISTS trg_rmv_data_version_delete ON run_metric_values;
+CREATE TRIGGER trg_rmv_data_version_delete
+AFTER DELETE ON run_metric_values
+REFERENCING OLD TABLE AS old_rows
+FOR EACH STATEMENT EXECUTE FUNCTION fn_run_children_data_version();
+
+DROP TRIGGER IF EXISTS trg_run_configs_data_version_insert ON run_configs;
+CREATE TRIGGER trg_run_configs_data_version_insert
+AFTER INSERT ON run_configs
+REFERENCING NEW TABLE AS new_rows
+FOR EACH STATEMENT EXECUTE FUNCTION fn_run_children_data_version();
+
+DROP TRIGGER IF EXISTS trg_run_configs_data_version_update ON run_configs;
+CREATE TRIGGER trg_run_configs_data_version_update
+AFTER UPDATE ON run_configs
+REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+FOR EACH STATEMENT EXECUTE FUNCTION fn_run_children_data_version();
+
+DROP TRIGGER IF EXISTS trg_ml_projects_data_version_update ON ml_projects;
+CREATE TRIGGER trg_ml_projects_data_version_update
+AFTER UPDATE ON ml_projects
+REFERENCING NEW TABLE AS new_rows
+FOR EACH STATEMENT EXECUTE FUNCTION fn_ml_projects_data_version();
+
+DROP TRIGGER IF EXISTS trg_metric_definitions_data_version_update ON metric_definitions;
+CREATE TRIGGER trg_metric_definitions_data_version_update
+AFTER UPDATE ON metric_definitions
+FOR EACH STATEMENT EXECUTE FUNCTION fn_metric_definitions_data_version();
@@ -0,0 +1,198 @@
+-- Optional row-level security keyed off the per-transaction `app.user_id`
+-- setting (see app.db.session). Table owners and superusers bypass RLS, so the
+-- default deployment, which connects as the owner, is unaffected. RLS mode means
+-- connecting the API as a non-owner role with ROW_LEVEL_SECURITY=true.
+--
+-- Project-keyed tables use an uncorrelated IN over user_project_access. The
+-- planner runs it once per statement as a hashed subplan, which is cheap because
+-- a user sees few projects. Run-keyed tables can hold millions of rows per user,
+-- so they use a correlated EXISTS instead: one primary-key probe per row
+-- through runs -> experiments -> user_project_access, with no set of every
+-- visible run built up front.
+CREATE OR REPLACE FUNCTION fn_rls_user_id() RETURNS uuid AS $$
+    SELECT NULLIF(current_setting('app.user_id', true), '')::uuid;
+$$ LANGUAGE sql STABLE;
+
+-- Background jobs that act for the system rather than a user (metric
+-- compaction) set app.rls_bypass for their own transaction.
+CREATE OR REPLACE FUNCTION fn_rls_bypass() RETURNS boolean AS $$
+    SELECT COALESCE(current_setting('app.rls_bypass', true), '') = 'on';
+$$ LANGUAGE sql STABLE;
+
+-- Access bookkeeping must see every project, whatever the caller can see.
+ALTER FUNCTION fn_refresh_user_project_access(uuid, uuid) SECURITY DEFINER SET search_path = public;
+ALTER FUNCTION fn_org_members_access() SECURITY DEFINER SET search_path = public;
+ALTER FUNCTION fn_ml_projects_access() SECURITY DEFINER SET search_path = public;
+
+ALTER TABLE ml_projects ENABLE ROW LEVEL SECURITY;
+DROP POLICY IF EXISTS rls_ml_projects_access ON ml_projects;
+-- Org owners/admins also match through org_members, so a newly created project
+-- passes the INSERT ... RETURNING check before its access rows exist.
+CREATE POLICY rls_ml_projects_access ON ml_projects
+    USING (
+        fn_rls_bypass()
+        OR project_id IN (
+            SELECT upa.project_id FROM user_project_access upa WHERE upa.user_id = fn_rls_user_id()
+        )
+        OR org_id IN (
+            SELECT om.org_id
+            FROM org_members om
+            WHERE om.user_id = fn_rls_user_id()
+              AND om.is_active
+              AND om.role IN ('owner', 'admin')
+        )
+    );
+
+ALTER TABLE experiments ENABLE ROW LEVEL SECURITY;
+DROP POLICY IF EXISTS rls_experiments_access ON experiments;
+CREATE POLICY rls_experiments_access ON experiments
+    USING (
+        fn_rls_bypass()
+        OR project_id IN (
+            SELECT upa.project_id FROM user_project_access upa WHERE upa.user_id = fn_rls_user_id()
+        )
+    );
+
+ALTER TABLE datasets ENABLE ROW LEVEL SECURITY;
+DROP POLICY IF EXISTS rls_datasets_access ON datasets;
+CREATE POLICY rls_datasets_access ON datasets
+    USING (
+        fn_rls_bypass()
+        OR project_id IN (
+            SELECT upa.project_id FROM user_project_access upa WHERE upa.user_id = fn_rls_user_id()
+        )
+    );
+
+ALTER TABLE artifacts ENABLE ROW LEVEL SECURITY;
+DROP POLICY IF EXISTS rls_artifacts_access ON artifacts;
+CREATE POLICY rls_artifacts_access ON artifacts
+    USING (
+        fn_rls_bypass()
+        OR project_id IN (
+            SELECT upa.project_id FROM user_project_access upa WHERE upa.user_id = fn_rls_user_id()
+        )
+    );
+
+ALTER TABLE runs ENABLE ROW LEVEL SECURITY;
+DROP POLICY IF EXISTS rls_runs_access ON runs;
+CREATE POLICY rls_runs_access ON runs
+    USING (
+        fn_rls_bypass()
+        OR experiment_id IN (
+            SELECT e.experiment_id
+            FROM experiments e
+            JOIN user_project_access upa ON upa.project_id = e.project_id
+            WHERE upa.user_id = fn_rls_user_id()
+        )
+    );
+
+ALTER TABLE run_metric_values ENABLE ROW LEVEL SECURITY;
+DROP POLICY IF EXISTS rls_run_metric_values_access ON run_metric_values;
+CREATE POLICY rls_run_metric_values_access ON run_metric_values
+    USING (
+        fn_rls_bypass()
+        OR EXISTS (
+            SELECT 1
+            FROM runs r
+            JOIN experiments e ON e.experiment_id = r.experiment_id
+            JOIN user_project_access upa
+                ON upa.project_id = e.project_id AND upa.user_id = fn_rls_user_id()
+            WHERE r.run_id = run_metric_values.run_id
+        )
+    );
+
+ALTER TABLE run_metric_chunks ENABLE ROW LEVEL SECURITY;
+DROP POLICY IF EXISTS rls_run_metric_chunks_access ON run_metric_chunks;
+CREATE POLICY rls_run_metric_chunks_access ON run_metric_chunks
+    USING (
+        fn_rls_bypass()
+        OR EXISTS (
+            SELECT 1
+            FROM runs r
+            JOIN experiments e ON e.experiment_id = r.experiment_id
+            JOIN user_project_access upa
+                ON upa.project_id = e.project_id AND upa.user_id = fn_rls_user_id()
+            WHERE r.run_id = run_metric_chunks.run_id
+        )
+    );
+
+ALTER TABLE run_final_metrics ENABLE ROW LEVEL SECURITY;
+DROP POLICY IF EXISTS rls_run_final_metrics_access ON run_final_metrics;
+CREATE POLICY rls_run_final_metrics_access ON run_final_metrics
+    USING (
+        fn_rls_bypass()
+        OR EXISTS (
+            SELECT 1
+            FROM runs r
+            JOIN experiments e ON e.experiment_id = r.experiment_id
+            JOIN user_project_access upa
+                ON upa.project_id = e.project_id AND upa.user_id = fn_rls_user_id()
+            WHERE r.run_id = run_final_metrics.run_id
+        )
+    );
+
+ALTER TABLE run_configs ENABLE ROW LEVEL SECURITY;
+DROP POLICY IF EXISTS rls_run_configs_access ON run_configs;
+CREATE POLICY rls_run_configs_access ON run_configs
+    USING (
+        fn_rls_bypass()
+        OR EXISTS (
+            SELECT 1
+            FROM runs r
+            JOIN experiments e ON e.experiment_id = r.experiment_id
+            JOIN user_project_access upa
+                ON upa.project_id = e.project_id AND upa.user_id = fn_rls_user_id()
+            WHERE r.run_id = run_configs.run_id
+        )
+    );
+
+ALTER TABLE run_artifacts ENABLE ROW LEVEL SECURITY;
+DROP POLICY IF EXISTS rls_run_artifacts_access ON run_artifacts;
+CREATE POLICY rls_run_artifacts_access ON run_artifacts
+    USING (
+        fn_rls_bypass()
+        OR EXISTS (
+            SELECT 1
+            FROM runs r
+            JOIN experiments e ON e.experiment_id = r.experiment_id
+            JOIN user_project_access upa
+                ON upa.project_id = e.project_id AND upa.user_id = fn_rls_user_id()
+            WHERE r.run_id = run_artifacts.run_id
+        )
+    );
+
+ALTER TABLE experiment_metric_summary ENABLE ROW LEVEL SECURITY;
+DROP POLICY IF EXISTS rls_experiment_metric_summary_access ON experiment_metric_summary;
+CREATE POLICY rls_experiment_metric_summary_access ON experiment_metric_summary
+    USING (
+        fn_rls_bypass()
+        OR experiment_id IN (
+            SELECT e.experiment_id
+            FROM experiments e
+            JOIN user_project_access upa ON upa.project_id = e.project_id
+            WHERE upa.user_id = fn_rls_user_id()
+        )
+    );
+
+ALTER TABLE project_metric_summary ENABLE ROW LEVEL SECURITY;
+DROP POLICY IF EXISTS rls_project_metric_summary_access ON project_metric_summary;
+CREATE POLICY rls_project_metric_summary_access ON project_metric_summary
+    USING (
+        fn_rls_bypass()
+        OR project_id IN (
+            SELECT upa.project_id FROM user_project_access upa WHERE upa.user_id = fn_rls_user_id()
+        )
+    );
+
+ALTER TABLE dataset_versions ENABLE ROW LEVEL SECURITY;
+DROP POLICY IF EXISTS rls_dataset_versions_access ON dataset_versions;
+CREATE POLICY rls_dataset_versions_access ON dataset_versions
+    USING (
+        fn_rls_bypass()
+        OR dataset_id IN (
+            SELECT d.dataset_id
+            FROM datasets d
+            JOIN user_project_access upa ON upa.project_id = d.project_id
+            WHERE upa.user_id = fn_rls_user_id()
+        )
+    );
@@ -0,0 +1,20 @@
+-- Numeric value of a params_json entry, NULL when it is missing or not a number.
+-- IMMUTABLE so it can back expression indexes on run_configs.
+CREATE OR REPLACE FUNCTION fn_jsonb_number(p_value jsonb)
+RETURNS double precision AS $$
+    SELECT CASE
+        WHEN jsonb_typeof(p_value) = 'number' THEN (p_value #>> '{}')::double precision
+    END;
+$$ LANGUAGE sql IMMUTABLE PARALLEL SAFE;
+
+-- Equality filters (param.<key>=<value>) are rewritten to params_json @> ...
+CREATE INDEX IF NOT EXISTS ix_run_configs_params_path
+    ON run_configs USING gin (params_json jsonb_path_ops);
+
+-- Range filters on frequently tuned numeric params.
+CREATE INDEX IF NOT EXISTS ix_run_configs_param_lr
+    ON run_configs (fn_jsonb_number(params_json -> 'lr'));
+CREATE INDEX IF NOT EXISTS ix_run_configs_param_batch_size
+    ON run_configs (fn_jsonb_number(params_json -> 'batch_size'));
+CREATE INDEX IF NOT EXISTS ix_run_configs_param_epochs
+    ON run_configs (fn_jsonb_number(params_json -> 'epochs'));
@@ -0,0 +1,113 @@
+-- One row per run holding its final (step IS NULL) metrics as {metric_key: value}.
+-- When a key is logged for several scopes, the most recently recorded value wins.
+CREATE OR REPLACE FUNCTION fn_refresh_run_final_metrics(p_run_ids uuid[]) RETURNS void AS $$
+    DELETE FROM run_final_metrics rfm
+    WHERE rfm.run_id = ANY(p_run_ids)
+      AND NOT EXISTS (
+          SELECT 1
+          FROM run_metric_values rmv
+          WHERE rmv.run_id = rfm.run_id
+            AND rmv.step IS NULL
+      );
+
+    INSERT INTO run_final_metrics (run_id, metrics, updated_at)
+    SELECT latest.run_id, jsonb_object_agg(latest.key, latest.value), now()
+    FROM (
+        SELECT DISTINCT ON (rmv.run_id, md.key)
+            rmv.run_id,
+            md.key,
+            rmv.value
+        FROM run_metric_values rmv
+        JOIN metric_definitions md ON md.metric_id = rmv.metric_id
+        WHERE rmv.run_id = ANY(p_run_ids)
+          AND rmv.step IS NULL
+        ORDER BY rmv.run_id, md.key, rmv.recorded_at DESC
+    ) latest
+    GROUP BY latest.run_id
+    ON CONFLICT (run_id) DO UPDATE SET
+        metrics = EXCLUDED.metrics,
+        updated_at = EXCLUDED.updated_at;
+$$ LANGUAGE sql;
+
+-- Statement-level so a multi-row metrics insert refreshes each run once.
+CREATE OR REPLACE FUNCTION fn_run_final_metrics_changed() RETURNS trigger AS $$
+DECLARE
+    v_run_ids uuid[];
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        SELECT array_agg(DISTINCT run_id) INTO v_run_ids
+        FROM new_rows WHERE step IS NULL;
+    ELSIF TG_OP = 'DELETE' THEN
+        SELECT array_agg(DISTINCT run_id) INTO v_run_ids
+        FROM old_rows WHERE step IS NULL;
+    ELSE
+        SELECT array_agg(DISTINCT run_id) INTO v_run_ids
+        FROM (
+            SELECT run_id FROM new_rows WHERE step IS NULL
+            UNION
+            SELECT run_id FROM old_rows WHERE step IS NULL
+        ) changed;
+    END IF;
+
+    IF v_run_ids IS NOT NULL THEN
+        PERFORM fn_refresh_run_final_metrics(v_run_ids);
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_run_final_metrics_insert ON run_metric_values;
+CREATE TRIGGER trg_run_final_metrics_insert
+AFTER INSERT ON run_metric_values
+REFERENCING NEW TABLE AS new_rows
+FOR EACH STATEMENT EXECUTE FUNCTION fn_run_final_metrics_changed();
+
+DROP TRIGGER IF EXISTS trg_run_final_metrics_update ON run_metric_values;
+CREATE TRIGGER trg_run_final_metrics_update
+AFTER UPDATE ON run_metric_values
+REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+FOR EACH STATEMENT EXECUTE FUNCTION fn_run_final_metrics_changed();
+
+DROP TRIGGER IF EXISTS trg_run_final_metrics_delete ON run_metric_values;
+CREATE TRIGGER trg_run_final_metrics_delete
+AFTER DELETE ON run_metric_values
+REFERENCING OLD TABLE AS old_rows
+FOR EACH STATEMENT EXECUTE FUNCTION fn_run_final_metrics_changed();
+
+-- Renaming a metric key changes the pivot of every run that logged it.
+CREATE OR REPLACE FUNCTION fn_run_final_metrics_key_renamed() RETURNS trigger AS $$
+BEGIN
+    PERFORM fn_refresh_run_final_metrics(ARRAY(
+        SELECT DISTINCT run_id
+        FROM run_metric_values
+        WHERE metric_id = NEW.metric_id
+          AND step IS NULL
+    ));
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_run_final_metrics_key_renamed ON metric_definitions;
+CREATE TRIGGER trg_run_final_metrics_key_renamed
+AFTER UPDATE OF key ON metric_definitions
+FOR EACH ROW
+WHEN (OLD.key IS DISTINCT FROM NEW.key)
+EXECUTE FUNCTION fn_run_final_metrics_key_renamed();
+
+-- The view keeps its columns but reads the maintained pivot instead of
+-- aggregating every final metric on each query.
+CREATE OR REPLACE VIEW v_runs_with_final_metrics AS
+SELECT
+    r.run_id,
+    r.experiment_id,
+    r.dataset_version_id,
+    r.run_name,
+    r.status,
+    r.started_at,
+    r.finished_at,
+    r.created_by,
+    r.git_commit,
+    r.notes,
+    rfm.metrics AS final_metrics
+FROM runs r
+LEFT JOIN run_final_metrics rfm ON rfm.run_id = r.run_id;
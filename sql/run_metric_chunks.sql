@@ -0,0 +1,79 @@
+-- Move the step points of a closed run from run_metric_values into
+-- run_metric_chunks, p_chunk_size points per (metric, scope) chunk.
+-- Final metrics (step IS NULL) stay row-based: summaries and leaderboards
+-- read them from run_metric_values. ingest_seqs keeps each point's ingest_seq
+-- and max_ingest_seq the newest, so `since` cursors still see compacted data
+-- exactly once.
+CREATE OR REPLACE FUNCTION fn_compact_run_metrics(
+    p_run_id uuid,
+    p_chunk_size integer DEFAULT 1000
+) RETURNS integer AS $$
+DECLARE
+    v_points integer;
+BEGIN
+    IF NOT EXISTS (
+        SELECT 1
+        FROM runs
+        WHERE run_id = p_run_id
+          AND status IN ('finished','failed','killed')
+    ) THEN
+        RETURN 0;
+    END IF;
+
+    WITH moved AS (
+        DELETE FROM run_metric_values
+        WHERE run_id = p_run_id
+          AND step IS NOT NULL
+        RETURNING metric_id, scope, step, value, recorded_at, ingest_seq
+    ),
+    numbered AS (
+        SELECT
+            metric_id,
+            scope,
+            step,
+            value,
+            recorded_at,
+            ingest_seq,
+            (ROW_NUMBER() OVER (
+                PARTITION BY metric_id, scope
+                ORDER BY step, recorded_at
+            ) - 1) / p_chunk_size AS chunk_no
+        FROM moved
+    ),
+    inserted AS (
+        INSERT INTO run_metric_chunks (
+            run_id,
+            metric_id,
+            scope,
+            step_start,
+            step_end,
+            point_count,
+            steps,
+            "values",
+            recorded_at,
+            ingest_seqs,
+            max_ingest_seq
+        )
+        SELECT
+            p_run_id,
+            metric_id,
+            scope,
+            MIN(step),
+            MAX(step),
+            COUNT(*),
+            array_agg(step ORDER BY step, recorded_at),
+            array_agg(value ORDER BY step, recorded_at),
+            array_agg(recorded_at ORDER BY step, recorded_at),
+            array_agg(ingest_seq ORDER BY step, recorded_at),
+            MAX(ingest_seq)
+        FROM numbered
+        GROUP BY metric_id, scope, chunk_no
+        RETURNING point_count
+    )
+    SELECT COALESCE(SUM(point_count), 0)
+    INTO v_points
+    FROM inserted;
+
+    RETURN v_points;
+END;
+$$ LANGUAGE plpgsql;
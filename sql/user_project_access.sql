@@ -0,0 +1,137 @@
+-- Effective project role per user, maintained from project_members, org_members
+-- and ml_projects. Active org owners/admins get 'admin' on every project of the org,
+-- the same rule as require_project_role. List endpoints join this table instead
+-- of OR-ing two IN subqueries.
+CREATE OR REPLACE FUNCTION fn_refresh_user_project_access(p_user_id uuid, p_project_id uuid)
+RETURNS void AS $$
+DECLARE
+    v_role text;
+BEGIN
+    SELECT 'admin'
+    INTO v_role
+    FROM ml_projects p
+    JOIN org_members om ON om.org_id = p.org_id
+    WHERE p.project_id = p_project_id
+      AND om.user_id = p_user_id
+      AND om.is_active
+      AND om.role IN ('owner', 'admin');
+
+    IF v_role IS NULL THEN
+        SELECT pm.role
+        INTO v_role
+        FROM project_members pm
+        JOIN ml_projects p ON p.project_id = pm.project_id
+        WHERE pm.project_id = p_project_id
+          AND pm.user_id = p_user_id
+          AND pm.is_active;
+    END IF;
+
+    IF v_role IS NULL THEN
+        DELETE FROM user_project_access
+        WHERE user_id = p_user_id
+          AND project_id = p_project_id;
+    ELSE
+        INSERT INTO user_project_access (user_id, project_id, role)
+        VALUES (p_user_id, p_project_id, v_role)
+        ON CONFLICT (user_id, project_id) DO UPDATE SET role = EXCLUDED.role;
+    END IF;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION fn_rebuild_user_project_access() RETURNS void AS $$
+    DELETE FROM user_project_access;
+
+    INSERT INTO user_project_access (user_id, project_id, role)
+    SELECT
+        access.user_id,
+        access.project_id,
+        CASE MAX(access.rank) WHEN 2 THEN 'admin' WHEN 1 THEN 'editor' ELSE 'viewer' END
+    FROM (
+        SELECT
+            pm.user_id,
+            pm.project_id,
+            CASE pm.role WHEN 'admin' THEN 2 WHEN 'editor' THEN 1 ELSE 0 END AS rank
+        FROM project_members pm
+        WHERE pm.is_active
+        UNION ALL
+        SELECT om.user_id, p.project_id, 2
+        FROM org_members om
+        JOIN ml_projects p ON p.org_id = om.org_id
+        WHERE om.is_active
+          AND om.role IN ('owner', 'admin')
+    ) access
+    GROUP BY access.user_id, access.project_id;
+$$ LANGUAGE sql;
+
+CREATE OR REPLACE FUNCTION fn_project_members_access() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        PERFORM fn_refresh_user_project_access(OLD.user_id, OLD.project_id);
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        PERFORM fn_refresh_user_project_access(NEW.user_id, NEW.project_id);
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION fn_org_members_access() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        PERFORM fn_refresh_user_project_access(OLD.user_id, p.project_id)
+        FROM ml_projects p
+        WHERE p.org_id = OLD.org_id;
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        PERFORM fn_refresh_user_project_access(NEW.user_id, p.project_id)
+        FROM ml_projects p
+        WHERE p.org_id = NEW.org_id;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Deleting a project cascades through the foreign key; inserts and org moves
+-- recompute every user who may have access through either org or membership.
+CREATE OR REPLACE FUNCTION fn_ml_projects_access() RETURNS trigger AS $$
+BEGIN
+    PERFORM fn_refresh_user_project_access(candidates.user_id, NEW.project_id)
+    FROM (
+        SELECT om.user_id
+        FROM org_members om
+        WHERE om.org_id = NEW.org_id
+           OR (TG_OP = 'UPDATE' AND om.org_id = OLD.org_id)
+        UNION
+        SELECT pm.user_id
+        FROM project_members pm
+        WHERE pm.project_id = NEW.project_id
+        UNION
+        SELECT upa.user_id
+        FROM user_project_access upa
+        WHERE upa.project_id = NEW.project_id
+    ) candidates;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_project_members_access ON project_members;
+CREATE TRIGGER trg_project_members_access
+AFTER INSERT OR UPDATE OR DELETE ON project_members
+FOR EACH ROW EXECUTE FUNCTION fn_project_members_access();
+
+DROP TRIGGER IF EXISTS trg_org_members_access ON org_members;
+CREATE TRIGGER trg_org_members_access
+AFTER INSERT OR UPDATE OR DELETE ON org_members
+FOR EACH ROW EXECUTE FUNCTION fn_org_members_access();
+
+DROP TRIGGER IF EXISTS trg_ml_projects_access_insert ON ml_projects;
+CREATE TRIGGER trg_ml_projects_access_insert
+AFTER INSERT ON ml_projects
+FOR EACH ROW EXECUTE FUNCTION fn_ml_projects_access();
+
+DROP TRIGGER IF EXISTS trg_ml_projects_access_update ON ml_projects;
+CREATE TRIGGER trg_ml_projects_access_update
+AFTER UPDATE OF org_id ON ml_projects
+FOR EACH ROW
+WHEN (OLD.org_id IS DISTINCT FROM NEW.org_id)
+EXECUTE FUNCTION fn_ml_projects_access();